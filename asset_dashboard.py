@@ -1,10 +1,61 @@
 import streamlit as st
 import pandas as pd
-import re
-from io import BytesIO
 import plotly.express as px
 import plotly.graph_objects as go
 
+from itam import (
+    AGE_BANDS,
+    AggregateCube,
+    CUBE_FIELDS,
+    ColumnarCache,
+    DEFAULT_PAGE_SIZE,
+    ExportCache,
+    FILTER_FIELDS,
+    FilterIndex,
+    HASH_COLUMN,
+    KEY_COLUMN,
+    PAGE_SIZES,
+    Profiler,
+    SearchIndex,
+    SnapshotStore,
+    TREND_PERIODS,
+    TablePager,
+    WorkbookCache,
+    WARRANTY_TIERS,
+    asset_summary,
+    create_sample_mobile_file,
+    create_sample_workstation_file,
+    diff_snapshots,
+    enable_copy_on_write,
+    enrich_inventory,
+    filter_rows,
+    hash_file_bytes,
+    ingest_workbooks,
+    inventory_rollups,
+    make_filter_key,
+    marked_rows,
+    model_table,
+    page_count,
+    profile_stage,
+    profiled,
+    record_cache_miss,
+    region_table,
+    resolve_schema,
+    rollup_trend,
+    snapshot_frame,
+    summary_counts,
+    transfer_size,
+    validate_data,
+    warranty_columns,
+)
+
+enable_copy_on_write()
+
+# Stage timings of this rerun, only when ITAM_PROFILE is set
+profiler = Profiler.from_env("rerun")
+if profiler is not None:
+    profiler.activate()
+
 # ============================================================================
 # PAGE CONFIGURATION
 # ============================================================================
@@ -14,12 +65,6 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# ============================================================================
-# CONSTANTS
-# ============================================================================
-WORKSTATION_IDENTIFIERS = ["workstation", "model", "warranty", "place"]
-MOBILE_IDENTIFIERS = ["product", "programme", "program"]
-
 # ============================================================================
 # AIR SELANGOR THEME CSS
 # ============================================================================
@@ -216,187 +261,178 @@ def inject_professional_css():
     """, unsafe_allow_html=True)
 
 # ============================================================================
-# UTILITY FUNCTIONS
-# ============================================================================
-
-@st.cache_data
-def normalize_text(text):
-    """Normalize text for column matching"""
-    return re.sub(r'[^a-z0-9]', '', str(text).lower())
-
-def find_column(df, search_terms):
-    """Find column by multiple search terms"""
-    if isinstance(search_terms, str):
-        search_terms = [search_terms]
-    
-    normalized_cols = {normalize_text(col): col for col in df.columns}
-    
-    for term in search_terms:
-        normalized_term = normalize_text(term)
-        for norm_col, orig_col in normalized_cols.items():
-            if normalized_term in norm_col:
-                return orig_col
-    return None
-
-# ============================================================================
-# ASSET TYPE DETECTION
+# CACHED PIPELINE
 # ============================================================================
 
-def detect_asset_type(df_columns):
-    """Auto-detect asset type from column names"""
-    normalized = [normalize_text(col) for col in df_columns]
-    
-    workstation_score = sum(1 for identifier in WORKSTATION_IDENTIFIERS 
-                           if any(identifier in norm for norm in normalized))
-    mobile_score = sum(1 for identifier in MOBILE_IDENTIFIERS 
-                      if any(identifier in norm for norm in normalized))
-    
-    return "Workstation" if workstation_score > mobile_score else "Mobile"
-
-def get_model_column(df, asset_type):
-    """Get model column based on asset type"""
-    return find_column(df, ["model"] if asset_type == "Workstation" else ["product"])
-
-def get_type_column(df, asset_type):
-    """Get type column based on asset type"""
-    if asset_type == "Workstation":
-        return find_column(df, ["workstation type", "workstationtype"])
-    return find_column(df, ["product type", "producttype"])
-
-def detect_header_row(excel_file, sheet_name):
-    """Auto-detect header row in Excel file"""
-    try:
-        preview = pd.read_excel(excel_file, sheet_name=sheet_name, header=None, nrows=15, engine='openpyxl')
-        
-        keywords = ["model", "serial", "user", "department", "asset", "workstation", 
-                   "location", "site", "computer", "employee", "email", "product", 
-                   "mobile", "programme", "program"]
-        
-        for i, row in preview.iterrows():
-            values = row.astype(str).str.lower().str.strip()
-            matches = sum(1 for v in values if any(keyword in v for keyword in keywords))
-            if matches >= 3:
-                return i
-        return 0
-    except:
-        return 0
+@st.cache_resource
+def get_workbook_cache():
+    """Workbook cache shared by all sessions of this server"""
+    return WorkbookCache(columnar=ColumnarCache.from_env())
+
+@st.cache_resource
+def get_export_cache():
+    """Export bytes shared by all sessions, built only when downloaded"""
+    return ExportCache()
+
+def deferred_export(dataset_key, filter_key, kind, df):
+    """Callable for st.download_button that builds the export on click"""
+    export_cache = get_export_cache()
+    return profiled("export", lambda: export_cache.get(dataset_key, filter_key, kind, df), kind=kind)
+
+def deferred_workbook_export(dataset_key, filter_key, kind, segments):
+    """Callable for st.download_button that builds a multi-sheet export on click"""
+    export_cache = get_export_cache()
+    return profiled("export", lambda: export_cache.get_workbook(dataset_key, filter_key, kind, segments), kind=kind)
+
+@st.cache_resource(max_entries=8)
+def get_search_index(dataset_key, _df):
+    """Search index shared by every rerun showing the same dataset"""
+    record_cache_miss("get_search_index")
+    return SearchIndex(_df)
+
+@st.cache_resource(max_entries=8)
+def get_filter_index(dataset_key, _df, columns):
+    """Sidebar filter postings shared by every rerun showing the same dataset"""
+    record_cache_miss("get_filter_index")
+    return FilterIndex(_df, columns)
+
+@st.cache_resource(max_entries=8)
+def get_aggregate_cube(dataset_key, _df, columns):
+    """Group counts for charts and breakdowns shared by every rerun showing the same dataset"""
+    record_cache_miss("get_aggregate_cube")
+    return AggregateCube(_df, columns)
+
+@st.cache_resource(max_entries=8)
+def get_table_pager(dataset_key, _df):
+    """Table pages and sort orders shared by every rerun showing the same dataset"""
+    record_cache_miss("get_table_pager")
+    return TablePager(_df)
+
+@st.cache_resource(max_entries=8)
+def get_validation_report(dataset_key, _df, asset_type, model_col, _schema):
+    """Validation issues computed once per dataset"""
+    record_cache_miss("get_validation_report")
+    return validate_data(_df, asset_type, model_col, schema=_schema)
+
+@st.cache_resource(max_entries=8)
+def process_inventory(dataset_key, _df, asset_type=None):
+    """Enriched inventory built once per dataset and shared read-only by every rerun"""
+    record_cache_miss("process_inventory")
+    return enrich_inventory(_df, asset_type)
+
+@st.cache_resource
+def get_snapshot_store():
+    """Snapshot store shared by all sessions, or None unless ITAM_SNAPSHOT_DIR is set"""
+    return SnapshotStore.from_env()
+
+@st.cache_resource(max_entries=8)
+def record_snapshot(dataset_key, _df, _schema, series, source):
+    """Snapshot frame of a dataset and its store entry, saved with its trend rollups the first time"""
+    record_cache_miss("record_snapshot")
+    frame = snapshot_frame(_df, _schema)
+    if frame is None:
+        return None, None
+    return frame, get_snapshot_store().save(series, frame, dataset_key[0], source,
+                                            rollups=inventory_rollups(_df, _schema))
+
+@st.cache_resource(max_entries=8)
+def get_snapshot_rollups(series, latest_id):
+    """Trend rollups of a series, read again only when a snapshot is added"""
+    return get_snapshot_store().rollups(series)
+
+@st.cache_resource(max_entries=8)
+def get_snapshot_diff(series, baseline_id, snapshot_id, _frame):
+    """Changes from a stored snapshot to the current one"""
+    record_cache_miss("get_snapshot_diff")
+    return diff_snapshots(get_snapshot_store().load(series, baseline_id), _frame)
+
+@st.cache_resource(max_entries=8)
+def get_change_issues(dataset_key, baseline_id, _df, _rows, asset_type, model_col, _schema):
+    """Validation issues of the new and changed rows, their tags and serials checked against the whole dataset"""
+    record_cache_miss("get_change_issues")
+    return validate_data(_df, asset_type, model_col, schema=_schema, rows=_rows)
+
+@st.cache_resource(max_entries=4)
+def get_combined_inventory(sources_key, _sources):
+    """Selected sheets of several workbooks, parsed in parallel and combined per asset type"""
+    record_cache_miss("get_combined_inventory")
+    return ingest_workbooks(_sources)
+
+def warranty_tier_labels(tiers=WARRANTY_TIERS):
+    """Card label, expander label and card style for each warranty tier"""
+    labels = []
+    for idx, (status, bound) in enumerate(tiers):
+        if idx == 0:
+            card_class = "card-danger"
+        elif idx == len(tiers) - 1:
+            card_class = "card-success"
+        else:
+            card_class = "card-warning"
+        if idx in (0, len(tiers) - 1):
+            labels.append((status, f"{status.upper()} WARRANTY", f"{status} Warranty Assets", card_class))
+        else:
+            labels.append((status, f"{status.upper()} ({bound} DAYS)", f"{status} Assets", card_class))
+    return labels
+
+def age_band_labels(bands=AGE_BANDS):
+    """Band label, card label and card style for each lifecycle band"""
+    labels = []
+    for idx, (band, _) in enumerate(bands):
+        if idx == 0:
+            card_class = "card-success"
+        elif idx == len(bands) - 1:
+            card_class = "card-danger"
+        else:
+            card_class = "card-primary" if idx < len(bands) / 2 else "card-warning"
+        card_label = band.upper().replace(" YEARS", "YR").replace(" YEAR", "YR")
+        labels.append((band, card_label, card_class))
+    return labels
 
 # ============================================================================
-# DATA PROCESSING FUNCTIONS
+# TABLES
 # ============================================================================
 
-@st.cache_data
-def calculate_asset_age(df):
-    """Calculate asset age from purchase year"""
-    year_col = find_column(df, ["year of purchase", "yearofpurchase"])
-    if year_col:
-        current_year = pd.Timestamp.now().year
-        df["Asset Age"] = current_year - pd.to_numeric(df[year_col], errors='coerce')
-        df["Asset Age"] = df["Asset Age"].fillna(0).astype(int)
-    else:
-        df["Asset Age"] = 0
-    return df
+def show_paged_table(key, pager, rows=None, columns=None):
+    """Display one page of a table with sort, page size and column controls"""
+    columns = list(pager.df.columns if columns is None else columns)
+    total = len(pager.df) if rows is None else len(rows)
+    if not total:
+        st.info("No rows to display")
+        return
 
-@st.cache_data
-def get_warranty_status(df):
-    """Calculate warranty status"""
-    warranty_col = find_column(df, ["warranty expiry", "warrantyexpiry"])
-    if not warranty_col:
-        return df, None
-
-    df_temp = df.copy()
-    df_temp["Warranty Expiry Date"] = pd.to_datetime(df_temp[warranty_col], errors='coerce')
-    today = pd.Timestamp.now()
-    df_temp["Days to Expiry"] = (df_temp["Warranty Expiry Date"] - today).dt.days
-    
-    conditions = [
-        df_temp["Days to Expiry"] < 0,
-        (df_temp["Days to Expiry"] >= 0) & (df_temp["Days to Expiry"] <= 90),
-        df_temp["Days to Expiry"] > 90
-    ]
-    choices = ["Expired", "Expiring Soon", "Active"]
-    df_temp["Warranty Status"] = pd.Series(pd.NA, dtype="object")
-    df_temp["Warranty Status"] = df_temp["Warranty Status"].where(
-        ~df_temp["Days to Expiry"].notna(), 
-        pd.Series([choices[i] for i in [next((j for j, c in enumerate(conditions) if c.iloc[idx]), -1) 
-                   for idx in range(len(df_temp))]], dtype="object")
-    )
-    df_temp["Warranty Status"] = df_temp["Warranty Status"].fillna("Unknown")
-    
-    expired_warranty_df = df_temp[df_temp["Warranty Status"] == "Expired"].copy()
-    return df_temp, expired_warranty_df
+    col_sort, col_order, col_size, col_page = st.columns([3, 2, 2, 2])
+    with col_sort:
+        sort_by = st.selectbox("Sort by", [None] + columns, key=f"{key}_sort",
+                               format_func=lambda col: "Original order" if col is None else str(col))
+    with col_order:
+        ascending = st.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Ascending"
+    with col_size:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                 key=f"{key}_page_size")
+    pages = page_count(total, page_size)
+    with col_page:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, value=1, step=1, key=f"{key}_page")
+    page = min(int(page), pages)
+
+    with st.popover("Columns"):
+        visible = st.multiselect("Columns to show", columns, default=columns, key=f"{key}_columns")
+
+    page_df, total = pager.page(rows, page - 1, page_size, sort_by, ascending, visible or columns)
+    payload_bytes = transfer_size(page_df)
+    with profile_stage(f"dataframe:{key}") as timing:
+        st.dataframe(page_df, use_container_width=True, hide_index=True)
+        timing["payload_bytes"] = payload_bytes
+    start = (page - 1) * page_size
+    st.caption(f"Rows {start + 1:,}-{start + len(page_df):,} of {total:,} · "
+               f"{len(page_df.columns)} of {len(columns)} columns · "
+               f"{payload_bytes / 1024:,.1f} KB sent to the browser")
 
 # ============================================================================
 # DATA VALIDATION
 # ============================================================================
 
-def validate_data(df, asset_type, model_col):
-    """Validate data and return list of issues"""
-    issues = []
-
-    asset_tag_col = find_column(df, ["asset tag", "assettag"])
-    serial_col = find_column(df, ["serial number", "serialnumber"])
-    user_col = find_column(df, ["user"])
-    email_col = find_column(df, ["email"])
-    dept_col = find_column(df, ["department", "user department"])
-    location_col = find_column(df, ["location"])
-
-    # Check duplicates
-    if asset_tag_col:
-        duplicates = df[df[asset_tag_col].duplicated(keep=False) & df[asset_tag_col].notna()]
-        if not duplicates.empty:
-            display_cols = [c for c in [asset_tag_col, model_col, serial_col, user_col] if c]
-            issues.append({
-                "type": "Duplicate Asset Tags",
-                "count": len(duplicates[asset_tag_col].unique()),
-                "details": f"Found {len(duplicates[asset_tag_col].unique())} duplicate asset tags",
-                "severity": "high",
-                "data": duplicates[display_cols].sort_values(asset_tag_col)
-            })
-
-    if serial_col:
-        duplicates = df[df[serial_col].duplicated(keep=False) & df[serial_col].notna()]
-        if not duplicates.empty:
-            display_cols = [c for c in [serial_col, model_col, asset_tag_col, user_col] if c]
-            issues.append({
-                "type": "Duplicate Serial Numbers",
-                "count": len(duplicates[serial_col].unique()),
-                "details": f"Found {len(duplicates[serial_col].unique())} duplicate serial numbers",
-                "severity": "high",
-                "data": duplicates[display_cols].sort_values(serial_col)
-            })
-
-    # Check missing data
-    if user_col:
-        missing_users = df[df[user_col].isna() | (df[user_col] == "")]
-        if not missing_users.empty:
-            display_cols = [c for c in [asset_tag_col, model_col, serial_col, dept_col] if c]
-            issues.append({
-                "type": "Missing User Assignment",
-                "count": len(missing_users),
-                "details": f"{len(missing_users)} assets without assigned users",
-                "severity": "medium",
-                "data": missing_users[display_cols]
-            })
-
-    # Check invalid emails
-    if email_col:
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        invalid_emails = df[df[email_col].notna() & ~df[email_col].astype(str).str.match(email_pattern)]
-        if not invalid_emails.empty:
-            display_cols = [c for c in [user_col, email_col, asset_tag_col, model_col] if c]
-            issues.append({
-                "type": "Invalid Email Format",
-                "count": len(invalid_emails),
-                "details": f"{len(invalid_emails)} invalid email addresses",
-                "severity": "low",
-                "data": invalid_emails[display_cols]
-            })
-
-    return issues
-
-def show_validation_issues(issues):
-    """Display validation issues"""
+def show_validation_issues(issues, pager, key_prefix="issue"):
+    """Display validation issues; an issue's rows are paged in only while it is open"""
     if not issues:
         st.success("No data validation issues found")
         return
@@ -407,11 +443,149 @@ def show_validation_issues(issues):
         severity_class = f"severity-{issue['severity']}"
         severity_label = issue['severity'].upper()
         
-        with st.expander(f"{issue['type']} ({issue['count']})", expanded=False):
+        expander = st.expander(f"{issue['type']} ({issue['count']})", expanded=False,
+                               key=f"{key_prefix}_{issue['type']}", on_change="rerun")
+        with expander:
             st.markdown(f'<span class="severity-badge {severity_class}">{severity_label}</span> {issue["details"]}', 
                        unsafe_allow_html=True)
-            if "data" in issue and not issue["data"].empty:
-                st.dataframe(issue["data"], use_container_width=True, hide_index=True)
+            if expander.open and len(issue["rows"]):
+                show_paged_table(f"{key_prefix}_{issue['type']}", pager, issue["rows"], issue["columns"])
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+def snapshot_label(entry):
+    """Selectbox label of a stored snapshot"""
+    return f"{entry['taken'].replace('T', ' ')} - {entry['source']} ({entry['rows']:,} assets)"
+
+def show_snapshot_changes(dataset_key, series, frame, entry, pager, asset_type, model_col, schema):
+    """Assets added, removed and changed since an earlier snapshot of the series"""
+    earlier = {e["id"]: e for e in reversed(get_snapshot_store().snapshots(series)) if e["id"] != entry["id"]}
+    if not earlier:
+        st.info(f"Snapshot saved. Changes are listed from the next {series} upload on.")
+        return
+
+    baseline_id = st.selectbox("Compare with", list(earlier), key="snapshot_baseline",
+                               format_func=lambda snapshot_id: snapshot_label(earlier[snapshot_id]))
+    with profile_stage("get_snapshot_diff", cached=True):
+        diff = get_snapshot_diff(series, baseline_id, entry["id"], frame)
+
+    for col, label, value in zip(st.columns(4), ["ADDED", "REMOVED", "CHANGED", "UNCHANGED"],
+                                 [len(diff.added), len(diff.removed), diff.changed, diff.unchanged]):
+        with col:
+            st.metric(label, f"{value:,}")
+    if diff.kinds:
+        st.caption(" · ".join(f"{kind}: {count:,}" for kind, count in diff.kinds.items()))
+
+    tab_changes, tab_added, tab_removed, tab_issues = st.tabs(
+        ["Changed Fields", "Added", "Removed", "Issues in New or Changed Rows"])
+    with tab_changes:
+        show_paged_table("snapshot_changes", TablePager(diff.changes))
+    with tab_added:
+        show_paged_table("snapshot_added", pager, diff.added.index.to_numpy())
+    with tab_removed:
+        removed = diff.removed.drop(columns=[HASH_COLUMN]).rename(columns={KEY_COLUMN: "Asset"})
+        show_paged_table("snapshot_removed", TablePager(removed))
+    with tab_issues:
+        # Only the new and changed rows are validated again
+        with profile_stage("get_change_issues", cached=True):
+            issues = get_change_issues(dataset_key, baseline_id, pager.df, diff.changed_rows, asset_type, model_col,
+                                       schema)
+        show_validation_issues(issues, pager, key_prefix="change_issue")
+
+# Groups drawn per trend chart; the rest of the models are summed as "Other"
+TREND_TOP_GROUPS = 8
+
+def create_trend_chart(table, title, y_label, area=False):
+    """Line (or stacked share) chart of a snapshot date x group trend table"""
+    if table.empty:
+        return None
+    data = table.rename_axis(index="Taken", columns="Group").stack().rename(y_label).reset_index()
+    plot = px.area if area else px.line
+    options = {"groupnorm": "percent"} if area else {"markers": True}
+    fig = plot(
+        data,
+        x="Taken",
+        y=y_label,
+        color="Group",
+        title=title,
+        color_discrete_sequence=['#0066B3', '#28A745', '#FFC107', '#DC3545', '#00A3E0', '#6F42C1',
+                                 '#0080C9', '#FD7E14', '#6C757D'],
+        **options
+    )
+
+    fig.update_layout(
+        height=400,
+        margin=dict(t=50, b=50, l=0, r=0),
+        xaxis_title=None,
+        yaxis_title="Share (%)" if area else y_label,
+        legend_title_text=None,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Poppins, sans-serif", color="#2C3E50")
+    )
+    return fig
+
+def show_snapshot_trends(series, entry, schema):
+    """Warranty, fleet age and model mix over the stored snapshots of a series"""
+    rollups = get_snapshot_rollups(series, entry["id"])
+    if rollups["Snapshot"].nunique() < 2:
+        st.info(f"Trends are drawn once two {series} snapshots have been recorded.")
+        return
+
+    period = TREND_PERIODS[st.radio("Points per", list(TREND_PERIODS), horizontal=True, key="trend_period")]
+    charts = [
+        (rollup_trend(rollups, "warranty", period=period), "Warranty Status Over Time", "Assets", False),
+        (rollup_trend(rollups, "department", "Average Age", period=period, top=TREND_TOP_GROUPS),
+         f"Average Fleet Age by {schema['department'] or 'Department'}", "Average Age (years)", False),
+        (rollup_trend(rollups, "model", period=period, top=TREND_TOP_GROUPS),
+         f"{schema['model'] or 'Model'} Mix Over Time", "Assets", True),
+    ]
+    for chart in charts:
+        fig = create_trend_chart(*chart)
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+# Reruns kept in the profiling panel's history chart
+PROFILE_HISTORY = 30
+
+def profile_table(stages):
+    """Stage timings of a profiled run as a display table, nested stages indented"""
+    table = pd.DataFrame({
+        "Stage": ["\u2003" * stage["depth"] + stage["stage"] for stage in stages],
+        "ms": [round(stage["seconds"] * 1000, 1) for stage in stages],
+        "Cache": [stage.get("cache", "") for stage in stages],
+    })
+    for field, label, unit in [("peak_bytes", "Peak MB", 1024 * 1024), ("payload_bytes", "Payload KB", 1024)]:
+        if any(field in stage for stage in stages):
+            table[label] = (pd.Series([stage.get(field) for stage in stages], dtype="float64") / unit).round(2)
+    return table
+
+def show_profile_panel(record):
+    """Debug sidebar panel with a rerun's stage timings, cache use and recent rerun times"""
+    history = st.session_state.setdefault("profile_history", [])
+    history.append(round(record["seconds"] * 1000, 1))
+    del history[:-PROFILE_HISTORY]
+
+    st.sidebar.markdown("---")
+    st.sidebar.markdown('<div class="sidebar-section">Profiling</div>', unsafe_allow_html=True)
+    st.sidebar.caption(f"Rerun took {record['seconds'] * 1000:,.0f} ms")
+    with st.sidebar.expander("Stage Timings", expanded=True):
+        if record["stages"]:
+            st.dataframe(profile_table(record["stages"]), use_container_width=True, hide_index=True)
+        for name, stats in record["caches"].items():
+            st.caption(f"{name}: {stats['hits']} hits / {stats['misses']} misses")
+        if "traced_bytes" in record:
+            st.caption(f"Traced memory: {record['traced_bytes'] / 1024 / 1024:,.1f} MB "
+                       f"(peak {record['traced_peak_bytes'] / 1024 / 1024:,.1f} MB)")
+    if len(history) > 1:
+        st.sidebar.caption("Recent reruns (ms)")
+        st.sidebar.line_chart(history, height=120)
 
 # ============================================================================
 # DISPLAY FUNCTIONS
@@ -419,18 +593,17 @@ def show_validation_issues(issues):
 
 def show_summary_cards(df, df_expired=None):
     """Display summary metric cards"""
-    total_assets = len(df)
-    expired_assets = len(df_expired) if df_expired is not None else 0
-    active_assets = total_assets - expired_assets
-    replacement_rate = (expired_assets / total_assets * 100) if total_assets > 0 else 0
+    show_summary_metrics(asset_summary(df, df_expired))
 
+def show_summary_metrics(summary):
+    """Display summary metric cards from precomputed counts"""
     col1, col2, col3, col4 = st.columns(4)
 
     cards = [
-        (col1, "TOTAL ASSETS", total_assets, "card-primary"),
-        (col2, "ACTIVE ASSETS", active_assets, "card-success"),
-        (col3, "EXPIRED ASSETS", expired_assets, "card-warning"),
-        (col4, "REPLACEMENT RATE", f"{replacement_rate:.1f}%", "card-info")
+        (col1, "TOTAL ASSETS", summary["total"], "card-primary"),
+        (col2, "ACTIVE ASSETS", summary["active"], "card-success"),
+        (col3, "EXPIRED ASSETS", summary["expired"], "card-warning"),
+        (col4, "REPLACEMENT RATE", f"{summary['replacement_rate']:.1f}%", "card-info")
     ]
 
     for col, label, value, card_class in cards:
@@ -442,14 +615,40 @@ def show_summary_cards(df, df_expired=None):
                 </div>
             """, unsafe_allow_html=True)
 
-def show_type_cards(df, type_col, asset_type):
+# Seconds between redraws of the summary cards while a sheet streams in
+LOAD_POLL_SECONDS = 0.5
+
+def show_loading_progress(load, sheet_name):
+    """Summary cards over the rows streamed so far, until the sheet is loaded"""
+    placeholder = st.empty()
+    schema = None
+    seen = total = expired = 0
+    # Each chunk is counted once; the cards are redrawn as chunks arrive
+    while not load.wait(LOAD_POLL_SECONDS):
+        chunks = load.chunks(seen)
+        if not chunks:
+            continue
+        for chunk in chunks:
+            schema = schema or resolve_schema(chunk.columns)
+            status = warranty_columns(chunk, WARRANTY_TIERS, schema).get("Warranty Status")
+            total += len(chunk)
+            expired += int((status == WARRANTY_TIERS[0][0]).sum()) if status is not None else 0
+        seen += len(chunks)
+        with placeholder.container():
+            st.caption(f"Loading '{sheet_name}': {total:,} rows read so far...")
+            show_summary_metrics(summary_counts(total, expired))
+    placeholder.empty()
+
+def show_type_cards(type_counts, type_col):
     """Display asset type cards"""
     if not type_col:
         return
 
     st.markdown(f'<div class="section-header">{type_col} Statistics</div>', unsafe_allow_html=True)
 
-    type_counts = df[type_col].value_counts().sort_values(ascending=False)
+    if type_counts.empty:
+        st.info("No assets match the current filters")
+        return
     cols_per_row = min(4, len(type_counts))
     cols = st.columns(cols_per_row)
 
@@ -465,21 +664,17 @@ def show_type_cards(df, type_col, asset_type):
         if (idx + 1) % cols_per_row == 0 and (idx + 1) < len(type_counts):
             cols = st.columns(cols_per_row)
 
-def show_warranty_summary(df, model_col):
+def show_warranty_summary(cube, rows, pager, model_col, schema):
     """Display warranty status summary"""
-    if "Warranty Status" not in df.columns:
+    if "Warranty Status" not in cube:
         return
 
-    status_counts = df["Warranty Status"].value_counts()
-    col1, col2, col3 = st.columns(3)
-
-    statuses = [
-        (col1, "EXPIRED WARRANTY", status_counts.get("Expired", 0), "card-danger"),
-        (col2, "EXPIRING SOON (90 DAYS)", status_counts.get("Expiring Soon", 0), "card-warning"),
-        (col3, "ACTIVE WARRANTY", status_counts.get("Active", 0), "card-success")
-    ]
+    status_counts = cube.counts("Warranty Status", rows)
+    tier_labels = warranty_tier_labels()
+    columns = st.columns(len(tier_labels))
 
-    for col, label, count, card_class in statuses:
+    for col, (status, label, _, card_class) in zip(columns, tier_labels):
+        count = status_counts.get(status, 0)
         with col:
             st.markdown(f"""
                 <div class="metric-card {card_class}">
@@ -490,50 +685,37 @@ def show_warranty_summary(df, model_col):
 
     st.markdown("<br>", unsafe_allow_html=True)
 
-    serial_col = find_column(df, ["serial number", "serialnumber"])
-    user_col = find_column(df, ["user"])
-    dept_col = find_column(df, ["department", "user department"])
-    location_col = find_column(df, ["location"])
-    warranty_col = find_column(df, ["warranty expiry", "warrantyexpiry"])
-
-    for status, label in [("Expired", "Expired Warranty Assets"), 
-                          ("Expiring Soon", "Expiring Soon Assets"), 
-                          ("Active", "Active Warranty Assets")]:
-        status_df = df[df["Warranty Status"] == status]
-        if not status_df.empty:
-            with st.expander(f"{label} ({len(status_df)})", expanded=False):
-                display_cols = [c for c in [model_col, serial_col, user_col, dept_col, location_col, warranty_col] if c]
-                st.dataframe(status_df[display_cols], use_container_width=True, hide_index=True)
-
-def show_asset_age_summary(df):
+    serial_col = schema["serial"]
+    user_col = schema["user"]
+    dept_col = schema["department"]
+    location_col = schema["location"]
+    warranty_col = schema["warranty_expiry"]
+
+    for status, _, label, _ in tier_labels:
+        count = status_counts.get(status, 0)
+        if count:
+            expander = st.expander(f"{label} ({count})", expanded=False,
+                                   key=f"warranty_{status}", on_change="rerun")
+            with expander:
+                if expander.open:
+                    display_cols = [c for c in [model_col, serial_col, user_col, dept_col, location_col, warranty_col] if c]
+                    show_paged_table(f"warranty_{status}", pager, cube.value_rows("Warranty Status", status, rows),
+                                     display_cols)
+
+def show_asset_age_summary(summary):
     """Display asset age analysis"""
-    if "Asset Age" not in df.columns or df["Asset Age"].sum() == 0:
+    if summary is None:
         return
 
-    df_temp = df.copy()
-    conditions = [
-        df_temp["Asset Age"] <= 1,
-        (df_temp["Asset Age"] > 1) & (df_temp["Asset Age"] <= 3),
-        (df_temp["Asset Age"] > 3) & (df_temp["Asset Age"] <= 5),
-        df_temp["Asset Age"] > 5
-    ]
-    choices = ["New (0-1 year)", "Active (1-3 years)", "Aging (3-5 years)", "Old (5+ years)"]
-    df_temp["Age Category"] = pd.Series(pd.NA, dtype="object")
-    for condition, choice in zip(conditions, choices):
-        df_temp.loc[condition, "Age Category"] = choice
-
-    age_counts = df_temp["Age Category"].value_counts()
-    avg_age = df_temp[df_temp["Asset Age"] > 0]["Asset Age"].mean()
-
-    col1, col2, col3, col4, col5 = st.columns(5)
-
-    metrics = [
-        (col1, "AVERAGE AGE", f"{avg_age:.1f}", "YEARS", "card-info"),
-        (col2, "NEW (0-1YR)", age_counts.get("New (0-1 year)", 0), "", "card-success"),
-        (col3, "ACTIVE (1-3YR)", age_counts.get("Active (1-3 years)", 0), "", "card-primary"),
-        (col4, "AGING (3-5YR)", age_counts.get("Aging (3-5 years)", 0), "", "card-warning"),
-        (col5, "OLD (5+YR)", age_counts.get("Old (5+ years)", 0), "", "card-danger")
-    ]
+    age_counts = summary["counts"]
+    avg_age = summary["average_age"]
+
+    band_labels = age_band_labels()
+    columns = st.columns(len(band_labels) + 1)
+
+    metrics = [(columns[0], "AVERAGE AGE", f"{avg_age:.1f}", "YEARS", "card-info")]
+    for col, (band, label, card_class) in zip(columns[1:], band_labels):
+        metrics.append((col, label, age_counts.get(band, 0), "", card_class))
 
     for col, label, value, extra, card_class in metrics:
         with col:
@@ -546,36 +728,29 @@ def show_asset_age_summary(df):
                 </div>
             """, unsafe_allow_html=True)
 
-def show_category_metrics_with_region(df, model_col, asset_type):
+def show_category_metrics_with_region(cube, rows, model_col, asset_type, schema):
     """Display unit breakdown and regional analysis"""
     if not model_col:
         st.warning("Model column not found")
         return
 
-    region_col = find_column(df, ["place"] if asset_type == "Workstation" else ["site", "user site", "usersite"])
+    region_col = schema.region
     region_label = "Place" if asset_type == "Workstation" else "Site"
     
     col_left, col_right = st.columns([1, 1])
     
     with col_left:
-        model_counts = df[model_col].value_counts().sort_values(ascending=False)
         st.markdown(f'<div class="section-header">Unit Breakdown by {model_col}</div>', unsafe_allow_html=True)
         
-        model_df = pd.DataFrame({
-            model_col: model_counts.index,
-            "Total Units": model_counts.values
-        })
+        model_df = model_table(cube.counts(model_col, rows), model_col)
         
         st.dataframe(model_df, use_container_width=True, hide_index=True)
     
     with col_right:
-        if region_col and region_col in df.columns:
+        if region_col and region_col in cube:
             st.markdown(f'<div class="section-header">Regional Breakdown by {region_label}</div>', unsafe_allow_html=True)
             
-            pivot_data = df.groupby([region_col, model_col]).size().unstack(fill_value=0)
-            pivot_data["Total"] = pivot_data.sum(axis=1)
-            pivot_data.loc["Grand Total"] = pivot_data.sum()
-            pivot_data = pivot_data.reset_index().rename(columns={region_col: "Region"})
+            pivot_data = region_table(cube.crosstab(region_col, model_col, rows), region_col)
             
             st.dataframe(pivot_data, use_container_width=True, hide_index=True)
         else:
@@ -586,13 +761,11 @@ def show_category_metrics_with_region(df, model_col, asset_type):
 # ============================================================================
 
 @st.cache_data
-def create_pie_chart(df, model_col):
+def create_pie_chart(model_counts, model_col):
     """Create pie chart for asset distribution"""
-    if not model_col:
+    if not model_col or model_counts.empty:
         return None
 
-    model_counts = df[model_col].value_counts()
-
     fig = px.pie(
         values=model_counts.values,
         names=model_counts.index,
@@ -618,12 +791,14 @@ def create_pie_chart(df, model_col):
     return fig
 
 @st.cache_data
-def create_department_chart(df, dept_col):
+def create_department_chart(counts, dept_col):
     """Create bar chart for department distribution"""
     if not dept_col:
         return None
     
-    dept_counts = df[dept_col].value_counts().head(10)
+    dept_counts = counts.head(10)
+    if dept_counts.empty:
+        return None
     
     fig = px.bar(
         x=dept_counts.values,
@@ -648,186 +823,206 @@ def create_department_chart(df, dept_col):
 # SIDEBAR CONTROLS
 # ============================================================================
 
-def sidebar_controls(df, asset_type, model_col, type_col):
+def column_multiselect(col, key, filter_index):
+    """Multiselect over a column's values, labelled with their row counts"""
+    counts = filter_index.option_counts(col)
+    return st.sidebar.multiselect(
+        f"Filter by {col}",
+        filter_index.options(col),
+        format_func=lambda value: f"{value} ({counts.get(value, 0):,})",
+        key=key
+    )
+
+def sidebar_controls(df, asset_type, model_col, type_col, schema, search_index=None, filter_index=None):
     """Create sidebar filter controls"""
+    if filter_index is None:
+        filter_index = FilterIndex(df, schema.columns(*FILTER_FIELDS))
     st.sidebar.markdown('<div class="sidebar-section">Asset Filters</div>', unsafe_allow_html=True)
 
     filters = {}
     
     # Model Filter
     if model_col:
-        filters[model_col] = st.sidebar.multiselect(
-            f"Filter by {model_col}",
-            df[model_col].unique(),
-            key="filter_model"
-        )
+        filters[model_col] = column_multiselect(model_col, "filter_model", filter_index)
     
     # Type Filter
     if type_col:
-        filters[type_col] = st.sidebar.multiselect(
-            f"Filter by {type_col}",
-            df[type_col].unique(),
-            key="filter_type"
-        )
+        filters[type_col] = column_multiselect(type_col, "filter_type", filter_index)
     
     # Site Filter
-    site_col = find_column(df, ["site", "user site", "usersite"])
+    site_col = schema["site"]
     if site_col:
-        filters[site_col] = st.sidebar.multiselect(
-            f"Filter by {site_col}",
-            df[site_col].unique(),
-            key="filter_site"
-        )
+        filters[site_col] = column_multiselect(site_col, "filter_site", filter_index)
     
     # Location Filter
-    location_col = find_column(df, ["location"])
+    location_col = schema["location"]
     if location_col:
-        filters[location_col] = st.sidebar.multiselect(
-            f"Filter by {location_col}",
-            df[location_col].unique(),
-            key="filter_location"
-        )
+        filters[location_col] = column_multiselect(location_col, "filter_location", filter_index)
     
     # Department Filter
-    dept_col = find_column(df, ["department", "user department"])
+    dept_col = schema["department"]
     if dept_col:
-        filters[dept_col] = st.sidebar.multiselect(
-            f"Filter by {dept_col}",
-            df[dept_col].unique(),
-            key="filter_department"
-        )
+        filters[dept_col] = column_multiselect(dept_col, "filter_department", filter_index)
     
     # Workstation-specific filters
     if asset_type == "Workstation":
-        status_col = find_column(df, ["workstation status", "workstationstatus"])
+        status_col = schema["status"]
         if status_col:
-            filters[status_col] = st.sidebar.multiselect(
-                f"Filter by {status_col}",
-                df[status_col].unique(),
-                key="filter_status"
-            )
+            filters[status_col] = column_multiselect(status_col, "filter_status", filter_index)
         
-        place_col = find_column(df, ["place"])
+        place_col = schema["place"]
         if place_col:
-            filters[place_col] = st.sidebar.multiselect(
-                f"Filter by {place_col}",
-                df[place_col].unique(),
-                key="filter_place"
-            )
+            filters[place_col] = column_multiselect(place_col, "filter_place", filter_index)
         
-        state_col = find_column(df, ["state"])
+        state_col = schema["state"]
         if state_col:
-            filters[state_col] = st.sidebar.multiselect(
-                f"Filter by {state_col}",
-                df[state_col].unique(),
-                key="filter_state"
-            )
+            filters[state_col] = column_multiselect(state_col, "filter_state", filter_index)
     else:
         # Mobile-specific filters
-        programme_col = find_column(df, ["programme", "program"])
+        programme_col = schema["programme"]
         if programme_col:
-            filters[programme_col] = st.sidebar.multiselect(
-                f"Filter by {programme_col}",
-                df[programme_col].unique(),
-                key="filter_programme"
-            )
+            filters[programme_col] = column_multiselect(programme_col, "filter_programme", filter_index)
         
-        state_col = find_column(df, ["state"])
+        state_col = schema["state"]
         if state_col:
-            filters[state_col] = st.sidebar.multiselect(
-                f"Filter by {state_col}",
-                df[state_col].unique(),
-                key="filter_state_mobile"
-            )
+            filters[state_col] = column_multiselect(state_col, "filter_state_mobile", filter_index)
 
     st.sidebar.markdown('<div class="sidebar-section">Replacement Planning</div>', unsafe_allow_html=True)
     expired_models = st.sidebar.multiselect(
         "Mark for Replacement",
-        options=df[model_col].unique() if model_col else [],
+        options=filter_index.options(model_col) if model_col else [],
         help="Select assets that need replacement"
     )
 
     st.sidebar.markdown('<div class="sidebar-section">Search</div>', unsafe_allow_html=True)
     search_query = st.sidebar.text_input("Search all fields", placeholder="Enter search term...")
+    search_mode = "prefix" if st.sidebar.checkbox("Match start of words only", value=False) else "substring"
 
-    # Apply filters
-    filtered_df = df.copy()
-    for col, selected_values in filters.items():
-        if selected_values:
-            filtered_df = filtered_df[filtered_df[col].isin(selected_values)]
-
-    expired_df = None
-    if expired_models and model_col:
-        expired_df = filtered_df[filtered_df[model_col].isin(expired_models)]
+    # Resolve the selection on row positions once and take both frames from it
+    column_rows = filter_index.rows(filters)
+    view_rows = filter_rows(filters, filter_index, search_query, search_index, search_mode, rows=column_rows)
+    filtered_df = df if view_rows is None else df.take(view_rows)
+    marked = marked_rows(filter_index, column_rows, expired_models, model_col)
+    expired_df = None if marked is None else df.take(marked)
+    filter_key = make_filter_key(filters, expired_models, search_query, search_mode)
+    return filtered_df, expired_df, view_rows, filter_key
 
-    if search_query:
-        filtered_df = filtered_df[filtered_df.apply(
-            lambda row: row.astype(str).str.contains(search_query, case=False).any(), axis=1
-        )]
+# ============================================================================
+# DATA SOURCES
+# ============================================================================
 
-    return filtered_df, expired_df
+def select_single_sheet(file_name, file_bytes, workbook_cache):
+    """Sheet and header row chosen in the sidebar, with the asset type hint, dataset key and source label"""
+    file_digest = hash_file_bytes(file_bytes)
+    sheet_names = workbook_cache.sheet_names(file_bytes, file_digest)
+    selected_sheet = st.sidebar.selectbox("Select Sheet", sheet_names)
+
+    st.sidebar.markdown("---")
+    st.sidebar.markdown('<div class="sidebar-section">Header Settings</div>', unsafe_allow_html=True)
+    use_manual = st.sidebar.checkbox("Manual Header Row Selection", value=False)
+    header_row = None
+    if use_manual:
+        detected_row = workbook_cache.detect_header_row(file_bytes, file_digest, selected_sheet)
+        header_row = st.sidebar.number_input("Header Row (0-based)", min_value=0, max_value=20, value=detected_row)
+        st.sidebar.success(f"Using row {header_row} as header")
+
+    # Load data, streaming in the background with the header row
+    # detected from the first rows unless one was chosen
+    load = workbook_cache.stream_sheet(file_bytes, file_digest, selected_sheet, header_row)
+    if not load.done:
+        show_loading_progress(load, selected_sheet)
+    df = load.result()
+    dataset_key = (file_digest, selected_sheet, int(load.header_row), pd.Timestamp.now().strftime('%Y%m%d'))
+    return df, None, dataset_key, f"{file_name} / {selected_sheet}"
+
+def select_combined_inventory(uploaded_files, workbook_cache):
+    """Sheets chosen across several workbooks, combined into one inventory of the chosen asset type.
+
+    Returns the frame, asset type, dataset key and source label.
+    """
+    sources = []
+    for uploaded in uploaded_files:
+        uploaded.seek(0)
+        file_bytes = uploaded.read()
+        file_digest = hash_file_bytes(file_bytes)
+        for sheet_name in workbook_cache.sheet_names(file_bytes, file_digest):
+            sources.append((uploaded.name, file_bytes, sheet_name, file_digest))
+
+    st.sidebar.markdown("---")
+    st.sidebar.markdown('<div class="sidebar-section">Workbooks</div>', unsafe_allow_html=True)
+    labels = [f"{file_name} / {sheet_name}" for file_name, _, sheet_name, _ in sources]
+    chosen = set(st.sidebar.multiselect("Sheets to Combine", labels, default=labels))
+    selected = [source for source, label in zip(sources, labels) if label in chosen]
+    if not selected:
+        st.info("Select at least one sheet to combine")
+        st.stop()
+
+    sources_key = tuple((file_digest, sheet_name) for _, _, sheet_name, file_digest in selected)
+    with st.spinner(f"Parsing {len(selected)} sheet(s) from {len(uploaded_files)} workbook(s)..."), \
+            profile_stage("get_combined_inventory", cached=True):
+        combined = get_combined_inventory(sources_key, [source[:3] for source in selected])
+    for sheet in combined.skipped:
+        st.sidebar.caption(f"Skipped {sheet.source}: {sheet.error}")
+    if not combined.frames:
+        st.error("None of the selected sheets has a Model or Product column.")
+        st.stop()
+
+    asset_types = list(combined.frames)
+    asset_type = asset_types[0]
+    if len(asset_types) > 1:
+        asset_type = st.sidebar.radio("Asset Type", asset_types, horizontal=True)
+    sheet_count = sum(sheet.asset_type == asset_type for sheet in combined.sheets)
+    st.sidebar.caption(f"Combined {sheet_count} sheet(s) into the {asset_type} inventory")
+
+    sources_digest = hash_file_bytes(repr(sources_key).encode())
+    dataset_key = (sources_digest, asset_type, "combined", pd.Timestamp.now().strftime('%Y%m%d'))
+    source = ", ".join(sorted({file_name for file_name, _, _, _ in selected}))
+    return combined.frames[asset_type], asset_type, dataset_key, source
 
 # ============================================================================
-# FILE OPERATIONS
+# DATA SECURITY NOTICE
 # ============================================================================
 
-def export_to_excel(df, filename="asset_data.xlsx"):
-    """Export dataframe to Excel"""
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Assets')
-    output.seek(0)
-    return output
-
-def create_sample_workstation_file():
-    """Create sample workstation Excel file"""
-    sample_data = {
-        'Asset Tag': ['WS001', 'WS002', 'WS003', 'WS004', 'WS005'],
-        'Model': ['Dell Latitude 5420', 'HP EliteBook 840', 'Lenovo ThinkPad X1', 'Dell Optiplex 7090', 'HP ProBook 450'],
-        'Workstation Type': ['Laptop', 'Laptop', 'Laptop', 'Desktop', 'Laptop'],
-        'Serial Number': ['SN12345', 'SN12346', 'SN12347', 'SN12348', 'SN12349'],
-        'User': ['John Doe', 'Jane Smith', 'Bob Wilson', 'Alice Brown', 'Charlie Davis'],
-        'User Email': ['john.doe@company.com', 'jane.smith@company.com', 'bob.wilson@company.com', 'alice.brown@company.com', 'charlie.davis@company.com'],
-        'Department': ['IT', 'Finance', 'HR', 'Operations', 'Marketing'],
-        'Location': ['HQ Building A', 'HQ Building B', 'Branch Office', 'HQ Building A', 'Remote'],
-        'Site': ['Headquarters', 'Headquarters', 'Branch', 'Headquarters', 'Remote'],
-        'Year Of Purchase': [2022, 2021, 2023, 2020, 2022],
-        'Warranty Expiry': ['2025-12-31', '2024-11-30', '2026-06-30', '2023-10-31', '2025-08-15'],
-        'Place': ['Malaysia', 'Malaysia', 'Singapore', 'Malaysia', 'Malaysia'],
-        'Workstation Status': ['Active', 'Active', 'Active', 'Retired', 'Active'],
-        'State': ['In Use', 'In Use', 'In Use', 'Storage', 'In Use']
-    }
-    
-    df = pd.DataFrame(sample_data)
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Workstation Assets')
-    output.seek(0)
-    return output
-
-def create_sample_mobile_file():
-    """Create sample mobile Excel file"""
-    sample_data = {
-        'Asset Tag': ['MB001', 'MB002', 'MB003', 'MB004', 'MB005'],
-        'Product': ['iPhone 13 Pro', 'Samsung Galaxy S21', 'iPad Air', 'iPhone 12', 'Samsung Tab S8'],
-        'Product Type': ['Phone', 'Phone', 'Tablet', 'Phone', 'Tablet'],
-        'Serial Number': ['SNM12345', 'SNM12346', 'SNM12347', 'SNM12348', 'SNM12349'],
-        'User': ['John Doe', 'Jane Smith', 'Bob Wilson', 'Alice Brown', 'Charlie Davis'],
-        'User Email': ['john.doe@company.com', 'jane.smith@company.com', 'bob.wilson@company.com', 'alice.brown@company.com', 'charlie.davis@company.com'],
-        'Department': ['IT', 'Sales', 'Operations', 'Finance', 'HR'],
-        'Location': ['HQ Building A', 'Field', 'HQ Building B', 'HQ Building A', 'Branch Office'],
-        'Site': ['Headquarters', 'Field', 'Headquarters', 'Headquarters', 'Branch'],
-        'Year Of Purchase': [2022, 2021, 2023, 2021, 2022],
-        'Programme': ['Enterprise Mobility', 'Sales Force', 'Operations', 'Finance', 'HR Management'],
-        'State': ['In Use', 'In Use', 'In Use', 'In Use', 'In Use']
-    }
-    
-    df = pd.DataFrame(sample_data)
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Mobile Assets')
-    output.seek(0)
-    return output
+DATA_SECURITY_TEXT = {
+    "EN": {
+        "title": "Your Data Security",
+        "memory": ["Files are NOT stored on any server", "Processing happens in memory only",
+                   "Data stays completely private"],
+        "cache": "Processed sheets are cached on this server's disk to speed up repeat uploads",
+        "snapshots": "Every processed inventory is kept as a snapshot on this server's disk, including user "
+                     "names, emails, departments and locations",
+        "stored": "Uploaded data is kept on the server; check with your administrator before uploading "
+                  "confidential data",
+    },
+    "MY": {
+        "title": "Keselamatan Data Anda",
+        "memory": ["Fail TIDAK disimpan di mana-mana pelayan", "Pemprosesan berlaku sepenuhnya dalam memori",
+                   "Data anda kekal sepenuhnya peribadi"],
+        "cache": "Sheet yang telah diproses disimpan pada disk pelayan ini untuk mempercepat upload berulang",
+        "snapshots": "Setiap inventori yang diproses disimpan sebagai snapshot pada disk pelayan ini, termasuk "
+                     "nama pengguna, email, jabatan dan lokasi",
+        "stored": "Data yang dimuat naik disimpan pada pelayan; semak dengan pentadbir sebelum memuat naik "
+                  "data sulit",
+    },
+}
+
+def data_storage_notes(text):
+    """What this server keeps on disk, one line per enabled store"""
+    notes = []
+    if get_workbook_cache().columnar is not None:
+        notes.append(text["cache"])
+    if get_snapshot_store() is not None:
+        notes.append(text["snapshots"])
+    return notes
+
+def show_data_security(language):
+    """Landing page data security notice, true to the disk stores this server has enabled"""
+    text = DATA_SECURITY_TEXT[language]
+    notes = data_storage_notes(text)
+    if not notes:
+        st.success(f"**{text['title']}**  \n" + "\n".join(f"- {line}" for line in text["memory"]))
+        return
+    st.warning(f"**{text['title']}**  \n" + "\n".join(f"- {line}" for line in notes + [text["stored"]]))
 
 # ============================================================================
 # MAIN APPLICATION
@@ -842,17 +1037,31 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
-uploaded_file = st.file_uploader("Upload Excel File (.xlsx)", type=["xlsx"])
+combine_workbooks = st.toggle("Combine several workbooks",
+                              help="Upload regional workbooks and combine their sheets into one inventory")
+if combine_workbooks:
+    uploaded_files = st.file_uploader("Upload Excel Files (.xlsx)", type=["xlsx"], accept_multiple_files=True)
+    uploaded_file = uploaded_files[0] if uploaded_files else None
+else:
+    uploaded_file = st.file_uploader("Upload Excel File (.xlsx)", type=["xlsx"])
 
 if uploaded_file is not None:
     try:
-        # Validate file format
+        # Validate file format of every upload before any is parsed
+        invalid_files = []
+        for upload in (uploaded_files if combine_workbooks else [uploaded_file]):
+            upload.seek(0)
+            if upload.read(2) != b'PK':
+                invalid_files.append(upload.name)
         uploaded_file.seek(0)
         file_bytes = uploaded_file.read()
         
-        if not file_bytes.startswith(b'PK'):
+        if invalid_files:
             st.error("File Format Error")
-            st.warning("The uploaded file is not a valid Excel (.xlsx) file.")
+            if combine_workbooks:
+                st.warning(f"These uploaded files are not valid Excel (.xlsx) files: {', '.join(invalid_files)}")
+            else:
+                st.warning("The uploaded file is not a valid Excel (.xlsx) file.")
             
             with st.expander("Troubleshooting Guide - Click to Expand", expanded=True):
                 st.markdown("""
@@ -944,33 +1153,19 @@ if uploaded_file is not None:
                     )
             st.stop()
         
-        # Read Excel file
-        uploaded_file.seek(0)
-        xls = pd.ExcelFile(uploaded_file, engine='openpyxl')
-        sheet_names = xls.sheet_names
-        selected_sheet = st.sidebar.selectbox("Select Sheet", sheet_names)
-
-        # Detect header row
-        uploaded_file.seek(0)
-        header_row = detect_header_row(uploaded_file, selected_sheet)
-        
-        st.sidebar.markdown("---")
-        st.sidebar.markdown('<div class="sidebar-section">Header Settings</div>', unsafe_allow_html=True)
-        use_manual = st.sidebar.checkbox("Manual Header Row Selection", value=False)
-        if use_manual:
-            header_row = st.sidebar.number_input("Header Row (0-based)", min_value=0, max_value=20, value=header_row)
-            st.sidebar.success(f"Using row {header_row} as header")
-
-        # Load data
-        uploaded_file.seek(0)
-        df = pd.read_excel(uploaded_file, sheet_name=selected_sheet, header=header_row, engine='openpyxl')
-        
-        df.columns = [str(c).strip() for c in df.columns]
-        df = df.loc[:, ~df.columns.duplicated(keep='first')]
-        
-        # Detect asset type
-        asset_type = detect_asset_type(df.columns)
-        st.sidebar.success(f"Detected: **{asset_type}** Assets")
+        # Read Excel file (parsed once per upload, reused across reruns)
+        workbook_cache = get_workbook_cache()
+        with profile_stage("load_sheet"):
+            if combine_workbooks:
+                df, asset_type_hint, dataset_key, source = select_combined_inventory(uploaded_files, workbook_cache)
+            else:
+                df, asset_type_hint, dataset_key, source = select_single_sheet(uploaded_file.name, file_bytes,
+                                                                                workbook_cache)
+        cache_stats = workbook_cache.stats()
+        if profiler is not None:
+            profiler.cache_stats("workbook_cache", cache_stats)
+            profiler.cache_stats("export_cache", get_export_cache().stats())
+        st.sidebar.caption(f"Workbook cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
         
         # Show columns
         with st.sidebar.expander("Excel Columns Found", expanded=False):
@@ -978,30 +1173,75 @@ if uploaded_file is not None:
             for idx, col in enumerate(df.columns, 1):
                 st.text(f"{idx}. {col}")
         
-        # Get key columns
-        model_col = get_model_column(df, asset_type)
-        type_col = get_type_column(df, asset_type)
+        # Detect asset type, key columns and process data
+        with profile_stage("process_inventory", cached=True) as timing:
+            inventory = process_inventory(dataset_key, df, asset_type_hint)
+            timing["rows"] = len(inventory.df)
+        df = inventory.df
+        asset_type = inventory.asset_type
+        model_col = inventory.model_col
+        type_col = inventory.type_col
+        expired_warranty_df = inventory.expired_warranty_df
+        schema = inventory.schema
+        st.sidebar.success(f"Detected: **{asset_type}** Assets")
+        if schema.fuzzy:
+            matched = ", ".join(f"'{col}' as {field.replace('_', ' ')}" for field, col in schema.fuzzy.items())
+            st.sidebar.caption(f"Closest match used for misspelled headers: {matched}")
+        if inventory.memory:
+            memory = inventory.memory
+            st.sidebar.caption(f"Dataset memory: {memory['bytes_after'] / 1024 / 1024:.1f} MB "
+                               f"(compacted from {memory['bytes_before'] / 1024 / 1024:.1f} MB)")
         
         if not model_col:
             st.error("Model column not found in Excel file.")
             st.info("Ensure Excel has 'Model' (Workstation) or 'Product' (Mobile) column")
             st.stop()
-        
-        # Process data
-        df = calculate_asset_age(df)
-        
-        expired_warranty_df = None
-        if asset_type == "Workstation":
-            df, expired_warranty_df = get_warranty_status(df)
 
         # Data validation
         st.markdown("---")
-        with st.expander("Data Validation Report", expanded=False):
-            issues = validate_data(df, asset_type, model_col)
-            show_validation_issues(issues)
+        with profile_stage("get_table_pager", cached=True):
+            pager = get_table_pager(dataset_key, df)
+        validation_expander = st.expander("Data Validation Report", expanded=False,
+                                          key="validation_report", on_change="rerun")
+        with validation_expander:
+            if validation_expander.open:
+                with profile_stage("get_validation_report", cached=True):
+                    issues = get_validation_report(dataset_key, df, asset_type, model_col, schema)
+                with profile_stage("render:validation"):
+                    show_validation_issues(issues, pager)
+
+        # Changes since an earlier upload, when a snapshot store is configured
+        if get_snapshot_store() is not None:
+            with profile_stage("record_snapshot", cached=True):
+                snapshot, snapshot_entry = record_snapshot(dataset_key, df, schema, asset_type, source)
+            if snapshot is not None:
+                st.caption(f"Snapshots of every {asset_type} upload, including user names, emails, departments "
+                           f"and locations, are kept on this server's disk to list changes between uploads.")
+                changes_expander = st.expander("Changes Since Earlier Upload", expanded=False,
+                                               key="snapshot_changes", on_change="rerun")
+                with changes_expander:
+                    if changes_expander.open:
+                        with profile_stage("render:snapshot_changes"):
+                            show_snapshot_changes(dataset_key, asset_type, snapshot, snapshot_entry, pager,
+                                                  asset_type, model_col, schema)
+                trends_expander = st.expander("Trends Across Snapshots", expanded=False,
+                                              key="snapshot_trends", on_change="rerun")
+                with trends_expander:
+                    if trends_expander.open:
+                        with profile_stage("render:snapshot_trends"):
+                            show_snapshot_trends(asset_type, snapshot_entry, schema)
 
         # Sidebar controls
-        df_filtered, df_expired = sidebar_controls(df, asset_type, model_col, type_col)
+        with profile_stage("get_search_index", cached=True):
+            search_index = get_search_index(dataset_key, df)
+        with profile_stage("get_filter_index", cached=True):
+            filter_index = get_filter_index(dataset_key, df, tuple(schema.columns(*FILTER_FIELDS)))
+        with profile_stage("get_aggregate_cube", cached=True):
+            cube = get_aggregate_cube(dataset_key, df, tuple(schema.columns(*CUBE_FIELDS)))
+        with profile_stage("sidebar_controls") as timing:
+            df_filtered, df_expired, view_rows, filter_key = sidebar_controls(df, asset_type, model_col, type_col,
+                                                                              schema, search_index, filter_index)
+            timing["rows"] = len(df_filtered)
 
         # Export section
         st.sidebar.markdown("---")
@@ -1013,38 +1253,53 @@ if uploaded_file is not None:
             col_exp1, col_exp2 = st.sidebar.columns(2)
         
         with col_exp1:
-            excel_data = export_to_excel(df_filtered)
             st.download_button(
                 label="All",
-                data=excel_data,
+                data=deferred_export(dataset_key, filter_key, "all", df_filtered),
                 file_name=f"{asset_type.lower()}_assets_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                help="Export all filtered data"
+                help="Export all filtered data",
+                on_click="ignore"
             )
         
         with col_exp2:
             if df_expired is not None and not df_expired.empty:
-                excel_expired = export_to_excel(df_expired)
                 st.download_button(
                     label="Expired",
-                    data=excel_expired,
+                    data=deferred_export(dataset_key, filter_key, "replacement", df_expired),
                     file_name=f"{asset_type.lower()}_expired_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    help="Export expired assets only"
+                    help="Export expired assets only",
+                    on_click="ignore"
                 )
         
         if asset_type == "Workstation":
             with col_exp3:
                 if expired_warranty_df is not None and not expired_warranty_df.empty:
-                    excel_warranty = export_to_excel(expired_warranty_df)
                     st.download_button(
                         label="Warranty",
-                        data=excel_warranty,
+                        data=deferred_export(dataset_key, None, "warranty", expired_warranty_df),
                         file_name=f"warranty_expired_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        help="Export expired warranties"
+                        help="Export expired warranties",
+                        on_click="ignore"
                     )
         
+        export_segments = [("Assets", df_filtered)]
+        if df_expired is not None and not df_expired.empty:
+            export_segments.append(("Replacement", df_expired))
+        if expired_warranty_df is not None and not expired_warranty_df.empty:
+            export_segments.append(("Expired Warranty", expired_warranty_df))
+        if len(export_segments) > 1:
+            st.sidebar.download_button(
+                label="All Segments (one workbook)",
+                data=deferred_workbook_export(dataset_key, filter_key, "segments", export_segments),
+                file_name=f"{asset_type.lower()}_report_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                help="Export filtered, replacement and expired warranty lists as separate sheets",
+                on_click="ignore"
+            )
+        
         # Help section
         st.sidebar.markdown("---")
         st.sidebar.markdown('<div class="sidebar-section">Help & Support</div>', unsafe_allow_html=True)
@@ -1092,68 +1347,75 @@ if uploaded_file is not None:
 
         # Dashboard Summary
         st.markdown('<div class="section-header">Dashboard Summary</div>', unsafe_allow_html=True)
-        show_summary_cards(df_filtered, df_expired)
+        with profile_stage("render:summary"):
+            show_summary_cards(df_filtered, df_expired)
 
         # Type Statistics
         if type_col:
             st.markdown("---")
-            show_type_cards(df_filtered, type_col, asset_type)
+            with profile_stage("render:type_cards"):
+                show_type_cards(cube.counts(type_col, view_rows), type_col)
 
         # Warranty Status
         if asset_type == "Workstation" and "Warranty Status" in df_filtered.columns:
             st.markdown("---")
             st.markdown('<div class="section-header">Warranty Status</div>', unsafe_allow_html=True)
-            show_warranty_summary(df_filtered, model_col)
+            with profile_stage("render:warranty"):
+                show_warranty_summary(cube, view_rows, pager, model_col, schema)
 
         # Asset Age Analysis
         if "Asset Age" in df_filtered.columns:
             st.markdown("---")
             st.markdown('<div class="section-header">Asset Age Analysis</div>', unsafe_allow_html=True)
-            show_asset_age_summary(df_filtered)
+            with profile_stage("render:age"):
+                show_asset_age_summary(cube.age_summary(view_rows))
 
         # Category Metrics
         st.markdown("---")
-        show_category_metrics_with_region(df_filtered, model_col, asset_type)
+        with profile_stage("render:category"):
+            show_category_metrics_with_region(cube, view_rows, model_col, asset_type, schema)
 
         # Visual Analytics
         st.markdown("---")
         st.markdown('<div class="section-header">Visual Analytics</div>', unsafe_allow_html=True)
         
-        col_chart1, col_chart2 = st.columns(2)
-        
-        with col_chart1:
-            pie_fig = create_pie_chart(df_filtered, model_col)
-            if pie_fig:
-                st.plotly_chart(pie_fig, use_container_width=True)
-        
-        with col_chart2:
-            dept_col = find_column(df_filtered, ["department", "user department"])
-            dept_fig = create_department_chart(df_filtered, dept_col)
-            if dept_fig:
-                st.plotly_chart(dept_fig, use_container_width=True)
-            else:
-                st.info("Department data not available")
-
-        location_col = find_column(df_filtered, ["location"])
-        loc_fig = create_department_chart(df_filtered, location_col)
-        if loc_fig:
-            st.plotly_chart(loc_fig, use_container_width=True)
+        with profile_stage("render:charts"):
+            col_chart1, col_chart2 = st.columns(2)
+
+            with col_chart1:
+                pie_fig = create_pie_chart(cube.counts(model_col, view_rows), model_col)
+                if pie_fig:
+                    st.plotly_chart(pie_fig, use_container_width=True)
+
+            with col_chart2:
+                dept_col = schema["department"]
+                dept_fig = create_department_chart(cube.counts(dept_col, view_rows) if dept_col else None, dept_col)
+                if dept_fig:
+                    st.plotly_chart(dept_fig, use_container_width=True)
+                else:
+                    st.info("Department data not available")
+
+            location_col = schema["location"]
+            loc_fig = create_department_chart(cube.counts(location_col, view_rows) if location_col else None,
+                                              location_col)
+            if loc_fig:
+                st.plotly_chart(loc_fig, use_container_width=True)
 
         # Replacement Assets
         if df_expired is not None and not df_expired.empty:
             st.markdown("---")
             st.markdown('<div class="section-header">Assets Marked for Replacement</div>', unsafe_allow_html=True)
-            st.dataframe(df_expired, use_container_width=True, hide_index=True)
+            show_paged_table("replacement", TablePager(df_expired))
 
         # Asset Details
         st.markdown("---")
         st.markdown('<div class="section-header">Asset Details</div>', unsafe_allow_html=True)
         
-        year_col = find_column(df_filtered, ["year of purchase", "yearofpurchase"])
+        year_col = schema["year_of_purchase"]
         display_columns = [col for col in df_filtered.columns if col != year_col]
         
         st.info(f"Displaying {len(display_columns)} columns from Excel file")
-        st.dataframe(df_filtered[display_columns], use_container_width=True, height=600)
+        show_paged_table("details", pager, view_rows, display_columns)
 
     except Exception as e:
         st.error(f"Error reading Excel file: {str(e)}")
@@ -1230,12 +1492,7 @@ else:
                 use_container_width=True
             )
         
-        st.success("""
-        **Your Data Security**  
-        - Files are NOT stored on any server  
-        - Processing happens in memory only  
-        - Data stays completely private
-        """)
+        show_data_security("EN")
     
     else:
         st.info("Sila muat naik fail Excel anda untuk bermula.")
@@ -1282,9 +1539,8 @@ else:
                 use_container_width=True
             )
 
-        st.success("""
-        **Keselamatan Data Anda**  
-        - Fail TIDAK disimpan di mana-mana pelayan  
-        - Pemprosesan berlaku sepenuhnya dalam memori
-        - Data anda kekal sepenuhnya peribadi
-        """)
\ No newline at end of file
+        show_data_security("MY")
+
+# Profiling panel and JSON log line of this rerun
+if profiler is not None:
+    show_profile_panel(profiler.finish())
@@ -0,0 +1,71 @@
+"""Compare the vectorized warranty classifier against the old per-row generator.
+
+Run from the repository root:
+
+    python benchmarks/bench_warranty.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from itam import classify_warranty  # noqa: E402
+
+def legacy_warranty_status(days_to_expiry):
+    """Per-row classification as done before the vectorized classifier"""
+    conditions = [
+        days_to_expiry < 0,
+        (days_to_expiry >= 0) & (days_to_expiry <= 90),
+        days_to_expiry > 90
+    ]
+    choices = ["Expired", "Expiring Soon", "Active"]
+    status = pd.Series(pd.NA, dtype="object", index=days_to_expiry.index)
+    status = status.where(
+        ~days_to_expiry.notna(),
+        pd.Series([choices[i] for i in [next((j for j, c in enumerate(conditions) if c.iloc[idx]), -1)
+                   for idx in range(len(days_to_expiry))]], dtype="object")
+    )
+    return status.fillna("Unknown")
+
+def make_days(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.Series(rng.integers(-2000, 2000, rows), dtype="float64")
+    days[rng.random(rows) < 0.05] = np.nan
+    return days
+
+def best_of(func, arg, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    days = make_days(args.rows)
+    legacy_time, legacy = best_of(legacy_warranty_status, days, 1)
+    fast_time, fast = best_of(classify_warranty, days, args.repeat)
+
+    identical = legacy.astype(str).equals(fast.astype(str))
+    print(f"rows:        {args.rows}")
+    print(f"legacy:      {legacy_time * 1000:.1f} ms")
+    print(f"vectorized:  {fast_time * 1000:.2f} ms")
+    print(f"speedup:     {legacy_time / fast_time:.0f}x")
+    print(f"identical:   {identical}")
+    print(f"memory:      {legacy.memory_usage(deep=True) / 1024:.0f} KiB -> "
+          f"{fast.memory_usage(deep=True) / 1024:.0f} KiB")
+    return 0 if identical else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""Per-stage timing and peak-memory benchmarks for the dashboard pipeline.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --rows 1000 10000 100000 --output before.json
+    python benchmarks/run_benchmarks.py --compare before.json after.json
+
+Each stage is timed (best of ``--repeat``) and then run once more under
+tracemalloc to record its peak allocation. Sizes above ``--max-xlsx-rows``
+skip the workbook read/write stages and feed the generated frame straight
+into enrichment. Reports are JSON so results from different commits can be
+compared.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import itam  # noqa: E402
+from synthetic import generate_inventory, write_workbook  # noqa: E402
+
+# Same pandas mode as the dashboard
+itam.enable_copy_on_write()
+
+SHEET_NAME = "Assets"
+XLSX_STAGES = ("detect_header_row", "first_chunk", "read_excel", "ingest_workbooks", "export_to_excel")
+# Regional workbooks combined by the ingest_workbooks stage
+INGEST_WORKBOOKS = 4
+# Weekly snapshots charted by the snapshot_trends stage
+TREND_WEEKS = 52
+
+def _top_values(df, col, count=2):
+    return list(df[col].value_counts().index[:count]) if col else []
+
+def stage_detect_header_row(state):
+    state["header_row"] = itam.detect_header_row(BytesIO(state["file_bytes"]), SHEET_NAME)
+
+def stage_first_chunk(state):
+    # Time until the dashboard can draw its first summary cards, with the
+    # header row detected from the stream
+    stream = itam.stream_sheet(BytesIO(state["file_bytes"]), SHEET_NAME)
+    state["first_chunk"] = next(stream)[1]
+    stream.close()
+
+def stage_read_excel(state):
+    # A cold workbook cache streaming the sheet, as the dashboard's first run does
+    state["workbook_cache"] = itam.WorkbookCache()
+    load = state["workbook_cache"].stream_sheet(state["file_bytes"], state["digest"], SHEET_NAME,
+                                                state["header_row"])
+    state["raw"] = load.result()
+
+def stage_ingest_workbooks(state):
+    # Copies of the workbook standing in for regional files, parsed in one
+    # worker process per sheet; compare with INGEST_WORKBOOKS x read_excel
+    sources = [(f"region{i}.xlsx", state["file_bytes"], SHEET_NAME) for i in range(INGEST_WORKBOOKS)]
+    state["combined"] = itam.ingest_workbooks(sources)
+
+def stage_calculate_asset_age(state):
+    state["df"] = itam.calculate_asset_age(state["raw"])
+
+def stage_get_warranty_status(state):
+    df, expired = itam.get_warranty_status(state["df"])
+    state["enriched"], state["expired_warranty"] = df, expired
+
+def stage_compact_frame(state):
+    state["enriched"], state["memory_report"] = itam.compact_frame(state["enriched"])
+
+def cached_sheet(state):
+    # The parsed sheet fetched back from the workbook cache, as every dashboard rerun does
+    if "workbook_cache" not in state:
+        # Without the read_excel stage (or an xlsx) the generated frame stands in for the parsed sheet
+        state["workbook_cache"] = itam.WorkbookCache()
+        state["workbook_cache"].add_sheet(state["digest"], SHEET_NAME, state["header_row"], state["raw"])
+    return state["workbook_cache"].stream_sheet(state["file_bytes"], state["digest"], SHEET_NAME,
+                                                state["header_row"]).result()
+
+def stage_enrich_inventory(state):
+    state["inventory"] = itam.enrich_inventory(cached_sheet(state), state["asset_type"])
+
+def stage_rerun(state):
+    # What every dashboard rerun does once the dataset is cached: fetch the
+    # parsed sheet and enriched inventory, apply an empty sidebar selection
+    # and aggregate for the cards and charts, from the aggregate cube when
+    # the build_filter_index and build_aggregate_cube stages ran
+    cached_sheet(state)
+    inventory = state["inventory"]
+    df = inventory.df
+    model_col = inventory.model_col
+    region_col = inventory.schema.region
+    filters = {col: [] for col in inventory.schema.columns(*itam.FILTER_FIELDS)}
+    filtered, expired = itam.apply_filters(df, filters, [], model_col,
+                                           filter_index=state.get("filter_index"))
+    itam.asset_summary(filtered, expired)
+    cube = state.get("cube") if "filter_index" in state else None
+    if cube is not None:
+        rows = itam.filter_rows(filters, state["filter_index"])
+        cube.counts("Warranty Status", rows)
+        cube.age_summary(rows)
+        itam.model_table(cube.counts(model_col, rows), model_col)
+        if region_col:
+            itam.region_table(cube.crosstab(region_col, model_col, rows), region_col)
+        return
+    itam.warranty_counts(filtered)
+    itam.asset_age_summary(filtered)
+    itam.model_breakdown(filtered, model_col)
+    if region_col:
+        itam.region_breakdown(filtered, region_col, model_col)
+
+def stage_validate_data(state):
+    df = state["enriched"]
+    state["issues"] = itam.validate_data(df, state["asset_type"], itam.get_model_column(df, state["asset_type"]))
+
+def stage_build_search_index(state):
+    state["search_index"] = itam.SearchIndex(state["enriched"])
+
+def stage_build_filter_index(state):
+    df = state["enriched"]
+    schema = itam.resolve_schema(df.columns, state["asset_type"])
+    state["filter_index"] = itam.FilterIndex(df, schema.columns(*itam.FILTER_FIELDS))
+
+def stage_build_aggregate_cube(state):
+    inventory = state["inventory"]
+    state["cube"] = itam.AggregateCube(inventory.df, inventory.schema.columns(*itam.CUBE_FIELDS))
+
+def stage_filter(state):
+    df = state["enriched"]
+    asset_type = state["asset_type"]
+    model_col = itam.get_model_column(df, asset_type)
+    dept_col = itam.find_column(df, ["department", "user department"])
+    filters = {model_col: _top_values(df, model_col, 3), dept_col: _top_values(df, dept_col, 20)}
+    state["filtered"], _ = itam.apply_filters(df, filters, _top_values(df, model_col, 1), model_col,
+                                              search_query=state["search_query"],
+                                              search_index=state.get("search_index"),
+                                              filter_index=state.get("filter_index"))
+
+def stage_page_table(state):
+    # Asset Details page sorted by serial, as sent to st.dataframe
+    if "pager" not in state:
+        state["pager"] = itam.TablePager(state["inventory"].df)
+    serial_col = state["inventory"].schema["serial"]
+    state["page"], _ = state["pager"].page(page=5, sort_by=serial_col, ascending=False)
+
+def stage_snapshot_frame(state):
+    inventory = state["inventory"]
+    state["snapshot"] = itam.snapshot_frame(inventory.df, inventory.schema)
+
+def stage_snapshot_diff(state):
+    # Last week's snapshot stands in as the current one with 1% of users
+    # reassigned and without the first 1% of assets, which show as added
+    if "previous_snapshot" not in state:
+        previous = state["snapshot"].copy()
+        user = previous["user"].to_numpy(copy=True)
+        user[::100] = "Previous Owner"
+        previous["user"] = user
+        previous[itam.HASH_COLUMN] = itam.snapshots.row_hashes(
+            previous, previous.columns.drop([itam.KEY_COLUMN, itam.HASH_COLUMN]))
+        state["previous_snapshot"] = previous.iloc[len(previous) // 100:]
+    state["snapshot_diff"] = itam.diff_snapshots(state["previous_snapshot"], state["snapshot"])
+
+def stage_inventory_rollups(state):
+    inventory = state["inventory"]
+    state["rollups"] = itam.inventory_rollups(inventory.df, inventory.schema)
+
+def stage_snapshot_trends(state):
+    # A year of weekly snapshots, each standing in with this dataset's rollups
+    if "trend_rollups" not in state:
+        weeks = pd.date_range(end=pd.Timestamp.now(), periods=TREND_WEEKS, freq="7D")
+        state["trend_rollups"] = pd.concat(
+            [state["rollups"].assign(Snapshot=str(i), Taken=week.isoformat()) for i, week in enumerate(weeks)],
+            ignore_index=True)[itam.trends.ROLLUP_COLUMNS]
+    rollups = state["trend_rollups"]
+    itam.rollup_trend(rollups, "warranty", period="M")
+    itam.rollup_trend(rollups, "department", "Average Age", period="M", top=8)
+    itam.rollup_trend(rollups, "model", period="M", top=8)
+
+def stage_export_to_excel(state):
+    # Unfiltered "All" export, the worst case on every rerun
+    state["export"] = itam.export_to_excel(state["enriched"])
+
+STAGES = [
+    ("detect_header_row", stage_detect_header_row),
+    ("first_chunk", stage_first_chunk),
+    ("read_excel", stage_read_excel),
+    ("ingest_workbooks", stage_ingest_workbooks),
+    ("calculate_asset_age", stage_calculate_asset_age),
+    ("get_warranty_status", stage_get_warranty_status),
+    ("compact_frame", stage_compact_frame),
+    ("enrich_inventory", stage_enrich_inventory),
+    ("validate_data", stage_validate_data),
+    ("build_search_index", stage_build_search_index),
+    ("build_filter_index", stage_build_filter_index),
+    ("build_aggregate_cube", stage_build_aggregate_cube),
+    ("filter", stage_filter),
+    ("rerun", stage_rerun),
+    ("page_table", stage_page_table),
+    ("snapshot_frame", stage_snapshot_frame),
+    ("snapshot_diff", stage_snapshot_diff),
+    ("inventory_rollups", stage_inventory_rollups),
+    ("snapshot_trends", stage_snapshot_trends),
+    ("export_to_excel", stage_export_to_excel),
+]
+
+def measure(func, state, repeat, memory):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(state)
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    results = []
+    stages = [(name, func) for name, func in STAGES if not args.stages or name in args.stages]
+    for rows in args.rows:
+        df = generate_inventory(rows, args.asset_type, seed=args.seed,
+                                duplicate_rate=args.duplicate_rate,
+                                missing_rate=args.missing_rate,
+                                invalid_email_rate=args.invalid_email_rate,
+                                mixed_dates=args.mixed_dates)
+        with_xlsx = rows <= args.max_xlsx_rows
+        state = {
+            "asset_type": args.asset_type,
+            "file_bytes": write_workbook(df, SHEET_NAME) if with_xlsx else b"",
+            "search_query": args.search,
+            "header_row": 2,
+            "raw": df,
+        }
+        state["digest"] = itam.hash_file_bytes(state["file_bytes"])
+        state["df"] = state["raw"]
+        state["enriched"] = state["raw"]
+        print(f"{rows:>9} rows  ({len(state['file_bytes']) / 1024 / 1024:.1f} MB xlsx)", file=sys.stderr)
+
+        for name, func in stages:
+            if not with_xlsx and name in XLSX_STAGES:
+                continue
+            seconds, peak = measure(func, state, args.repeat, not args.no_memory)
+            result = {"rows": rows, "stage": name, "seconds": seconds, "peak_bytes": peak}
+            peak_text = f"{peak / 1024 / 1024:9.1f} MB" if peak is not None else ""
+            if name == "compact_frame":
+                report = state["memory_report"]
+                result.update(bytes_before=report["bytes_before"], bytes_after=report["bytes_after"])
+                peak_text += (f"  frame {report['bytes_before'] / 1024 / 1024:.1f} MB"
+                              f" -> {report['bytes_after'] / 1024 / 1024:.1f} MB")
+            if name == "page_table":
+                page_bytes, full_bytes = itam.transfer_size(state["page"]), itam.transfer_size(state["inventory"].df)
+                result.update(page_bytes=page_bytes, full_bytes=full_bytes)
+                peak_text += f"  sent {page_bytes / 1024:.1f} KB instead of {full_bytes / 1024 / 1024:.1f} MB"
+            results.append(result)
+            print(f"    {name:<22} {seconds * 1000:10.1f} ms {peak_text}", file=sys.stderr)
+
+    return {
+        "revision": git_revision(),
+        "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results,
+    }
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    baseline = {(r["rows"], r["stage"]): r for r in old["results"]}
+
+    print(f"{'rows':>9}  {'stage':<22} {'time old':>10} {'time new':>10} {'speedup':>8} {'peak old':>10} {'peak new':>10}")
+    for result in new["results"]:
+        before = baseline.get((result["rows"], result["stage"]))
+        if before is None:
+            continue
+        speedup = before["seconds"] / result["seconds"] if result["seconds"] else float("inf")
+        peaks = [r["peak_bytes"] for r in (before, result)]
+        peak_text = "".join(f" {p / 1024 / 1024:9.1f}M" if p is not None else f" {'-':>10}" for p in peaks)
+        print(f"{result['rows']:>9}  {result['stage']:<22} {before['seconds'] * 1000:9.1f}ms "
+              f"{result['seconds'] * 1000:9.1f}ms {speedup:7.2f}x{peak_text}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--asset-type", choices=["Workstation", "Mobile"], default="Workstation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--missing-rate", type=float, default=0.02)
+    parser.add_argument("--invalid-email-rate", type=float, default=0.01)
+    parser.add_argument("--mixed-dates", action="store_true",
+                        help="warranty dates as a mix of ISO text, dd/mm/yyyy text and Excel serials")
+    parser.add_argument("--search", default="latitude", help="global search query used by the filter stage")
+    parser.add_argument("--stages", nargs="+", choices=[name for name, _ in STAGES],
+                        help="only run these stages (later stages reuse generated data)")
+    parser.add_argument("--max-xlsx-rows", type=int, default=200_000,
+                        help="skip workbook read/write stages above this size (openpyxl takes minutes)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two JSON reports")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Deterministic synthetic Workstation/Mobile inventories for benchmarking.
+
+The column sets follow the downloadable sample templates; value pools are
+widened so the generated sheets have realistic cardinalities (a few dozen
+models, hundreds of departments and locations, unique tags and serials).
+"""
+import os
+import sys
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from itam import sample_mobile_data, sample_workstation_data  # noqa: E402
+
+WORKSTATION_MODELS = [
+    "Dell Latitude 5420", "Dell Latitude 7430", "Dell Optiplex 7090", "Dell Precision 3660",
+    "HP EliteBook 840", "HP ProBook 450", "HP EliteDesk 800", "HP ZBook Firefly",
+    "Lenovo ThinkPad X1", "Lenovo ThinkPad T14", "Lenovo ThinkCentre M70", "Apple MacBook Pro 14",
+]
+MOBILE_PRODUCTS = [
+    "iPhone 12", "iPhone 13 Pro", "iPhone 15", "iPad Air", "iPad Pro 11",
+    "Samsung Galaxy S21", "Samsung Galaxy A54", "Samsung Tab S8", "Samsung Tab Active4",
+]
+PLACES = ["Shah Alam", "Petaling Jaya", "Klang", "Gombak", "Hulu Langat", "Sepang",
+          "Kuala Selangor", "Sabak Bernam", "Kuala Langat", "Hulu Selangor"]
+STATES = ["In Use", "Storage", "Repair", "Disposed"]
+FIRST_NAMES = ["Ahmad", "Siti", "Muhammad", "Nur", "John", "Jane", "Wei", "Priya",
+               "Aisyah", "Hafiz", "Mei Ling", "Raj", "Farah", "Daniel", "Lim", "Kumar"]
+LAST_NAMES = ["Abdullah", "Rahman", "Tan", "Lee", "Wong", "Smith", "Ismail", "Hassan",
+              "Chong", "Nair", "Yusof", "Ong", "Brown", "Ibrahim", "Ng", "Kaur"]
+
+def _pool(prefix, size):
+    return np.array([f"{prefix} {i:03d}" for i in range(1, size + 1)], dtype=object)
+
+def _ids(prefix, n, width):
+    return (prefix + pd.Series(np.arange(1, n + 1)).astype(str).str.zfill(width)).to_numpy(dtype=object, copy=True)
+
+def _dates(dates, rng, mixed):
+    values = pd.Series(dates).dt.strftime("%Y-%m-%d").to_numpy(dtype=object, copy=True)
+    if mixed:
+        kind = rng.integers(0, 3, len(values))
+        values[kind == 1] = pd.Series(dates[kind == 1]).dt.strftime("%d/%m/%Y").to_numpy(dtype=object)
+        values[kind == 2] = (dates[kind == 2] - pd.Timestamp("1899-12-30")).days.to_numpy()
+    return values
+
+def generate_inventory(rows, asset_type="Workstation", seed=0, duplicate_rate=0.01,
+                       missing_rate=0.02, invalid_email_rate=0.01, mixed_dates=False):
+    """Build a synthetic inventory frame with the template's columns.
+
+    ``duplicate_rate`` of rows reuse another row's asset tag and (separately)
+    serial number, ``missing_rate`` of rows have no user and
+    ``invalid_email_rate`` of the remaining emails are malformed. With
+    ``mixed_dates`` warranty expiry dates are a mix of ISO text, dd/mm/yyyy
+    text and Excel serial numbers, as in hand-maintained sheets.
+    """
+    rng = np.random.default_rng(seed)
+    workstation = asset_type == "Workstation"
+    columns = list((sample_workstation_data() if workstation else sample_mobile_data()).columns)
+
+    first = rng.choice(FIRST_NAMES, rows)
+    last = rng.choice(LAST_NAMES, rows)
+    users = pd.Series(first).str.cat(pd.Series(last), sep=" ")
+    emails = (users.str.lower().str.replace(" ", ".", regex=False)
+              + pd.Series(rng.integers(1, 100, rows)).astype(str) + "@company.com")
+
+    data = {
+        "Asset Tag": _ids("WS" if workstation else "MB", rows, 7),
+        "Serial Number": _ids("SN" if workstation else "SNM", rows, 8),
+        "User": users.to_numpy(dtype=object, copy=True),
+        "User Email": emails.to_numpy(dtype=object, copy=True),
+        "Department": rng.choice(_pool("Dept", 120), rows),
+        "Location": rng.choice(_pool("Building", 300), rows),
+        "Site": rng.choice(_pool("Site", 40), rows),
+        "Year Of Purchase": rng.integers(2012, pd.Timestamp.now().year + 1, rows),
+        "State": rng.choice(STATES, rows, p=[0.8, 0.1, 0.05, 0.05]),
+    }
+    if workstation:
+        expiry = pd.Timestamp.now().normalize() + pd.to_timedelta(rng.integers(-1500, 1500, rows), unit="D")
+        data.update({
+            "Model": rng.choice(WORKSTATION_MODELS, rows),
+            "Workstation Type": rng.choice(["Laptop", "Desktop", "Workstation"], rows, p=[0.6, 0.35, 0.05]),
+            "Warranty Expiry": _dates(expiry, rng, mixed_dates),
+            "Place": rng.choice(PLACES, rows),
+            "Workstation Status": rng.choice(["Active", "Retired", "Spare"], rows, p=[0.85, 0.1, 0.05]),
+        })
+    else:
+        data.update({
+            "Product": rng.choice(MOBILE_PRODUCTS, rows),
+            "Product Type": rng.choice(["Phone", "Tablet"], rows, p=[0.7, 0.3]),
+            "Programme": rng.choice(_pool("Programme", 25), rows),
+        })
+
+    for key in ("Asset Tag", "Serial Number"):
+        dup = np.flatnonzero(rng.random(rows) < duplicate_rate)
+        if len(dup):
+            data[key][dup] = data[key][rng.integers(0, rows, len(dup))]
+
+    missing = rng.random(rows) < missing_rate
+    data["User"][missing] = None
+    invalid = ~missing & (rng.random(rows) < invalid_email_rate)
+    data["User Email"][invalid] = pd.Series(data["User Email"][invalid]).str.replace("@", " at ", regex=False).to_numpy(dtype=object)
+    data["User Email"][missing] = None
+
+    return pd.DataFrame({col: data[col] for col in columns})
+
+def write_workbook(df, sheet_name="Assets", title_rows=2):
+    """Serialize an inventory to xlsx bytes with a title block above the header"""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        if title_rows:
+            title = pd.DataFrame([["Asset Inventory Report"]] + [[None]] * (title_rows - 1))
+            title.to_excel(writer, index=False, header=False, sheet_name=sheet_name)
+        df.to_excel(writer, index=False, sheet_name=sheet_name, startrow=title_rows)
+    return output.getvalue()
@@ -0,0 +1,107 @@
+"""Headless core of the Asset Management Dashboard.
+
+Loading, column resolution, enrichment, validation and aggregation as plain
+functions, usable without a Streamlit server. ``asset_dashboard.py`` is the
+Streamlit front end over this package.
+"""
+from .columns import (
+    FIELD_SEARCH_TERMS,
+    ColumnSchema,
+    MOBILE_IDENTIFIERS,
+    WORKSTATION_IDENTIFIERS,
+    detect_asset_type,
+    find_column,
+    get_model_column,
+    get_type_column,
+    match_column,
+    normalize_text,
+    resolve_schema,
+)
+from .loader import (
+    STREAM_CHUNK_ROWS,
+    SheetLoad,
+    WorkbookCache,
+    detect_header_row,
+    detect_header_row_from_preview,
+    hash_file_bytes,
+    iter_sheet_rows,
+    read_header_preview,
+    stream_sheet,
+)
+from .enrich import (
+    AGE_BANDS,
+    WARRANTY_TIERS,
+    WARRANTY_UNKNOWN,
+    age_columns,
+    age_in_months,
+    asset_age,
+    calculate_asset_age,
+    classify_age,
+    classify_warranty,
+    get_warranty_status,
+    warranty_columns,
+)
+from .dates import DATE_DAYFIRST, DATE_FORMATS, parse_dates, unparseable_date_rows
+from .validation import ValidationReport, validate_data
+from .fuzzy import near_duplicate_pairs
+from .search import SearchIndex
+from .filters import FILTER_FIELDS, FilterIndex, apply_filters, filter_rows, make_filter_key, marked_rows
+from .aggregate import (
+    AGE_CATEGORIES,
+    age_category_codes,
+    asset_age_summary,
+    asset_summary,
+    get_region_column,
+    model_breakdown,
+    model_table,
+    observed_counts,
+    region_breakdown,
+    region_table,
+    summary_counts,
+    warranty_counts,
+)
+from .cube import CUBE_FIELDS, AggregateCube
+from .snapshots import (
+    HASH_COLUMN,
+    KEY_COLUMN,
+    SNAPSHOT_DIR_ENV,
+    SnapshotDiff,
+    SnapshotStore,
+    diff_snapshots,
+    snapshot_frame,
+)
+from .trends import ROLLUPS, TREND_PERIODS, inventory_rollups, rollup_trend
+from .ingest import (
+    SOURCE_COLUMN,
+    CombinedInventory,
+    IngestedSheet,
+    combine_sheets,
+    ingest_sheets,
+    ingest_workbooks,
+)
+from .paging import DEFAULT_PAGE_SIZE, PAGE_SIZES, TablePager, page_count, transfer_size
+from .cache import LRUCache
+from .profiling import (
+    PROFILE_ENV,
+    PROFILE_LOG_ENV,
+    Profiler,
+    active_profiler,
+    profile_mode,
+    profile_stage,
+    profiled,
+    record_cache_miss,
+)
+from .columnar import ColumnarCache, warm_cache
+from .compact import compact_frame, frame_memory
+from .export import (
+    ExportCache,
+    create_sample_mobile_file,
+    create_sample_workstation_file,
+    export_to_excel,
+    export_workbook,
+    sample_mobile_data,
+    sample_workstation_data,
+)
+from .pipeline import Inventory, enable_copy_on_write, enrich_inventory, load_inventory, read_file_bytes
+
+__version__ = "2.4.0"
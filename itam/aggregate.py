@@ -0,0 +1,88 @@
+"""Aggregations behind the dashboard's metric cards and breakdown tables"""
+import numpy as np
+import pandas as pd
+
+from .columns import resolve_schema
+from .enrich import AGE_BANDS
+
+AGE_CATEGORIES = [label for label, _ in AGE_BANDS]
+
+def get_region_column(df, asset_type):
+    """Get region column (Place for Workstation, Site for Mobile)"""
+    return resolve_schema(df.columns, asset_type).region
+
+def observed_counts(series):
+    """Value counts, leaving out categories no row uses"""
+    counts = series.value_counts()
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+    return counts
+
+def age_category_codes(age, bands=AGE_BANDS):
+    """Position in the bands of every age in years"""
+    bounds = np.array([bound for _, bound in bands[:-1]], dtype="float64")
+    return np.searchsorted(bounds, np.asarray(age, dtype="float64"), side="left")
+
+def asset_summary(df, df_expired=None):
+    """Total, active and expired asset counts with the replacement rate"""
+    return summary_counts(len(df), len(df_expired) if df_expired is not None else 0)
+
+def summary_counts(total_assets, expired_assets):
+    """Summary card values from asset counts alone"""
+    return {
+        "total": total_assets,
+        "active": total_assets - expired_assets,
+        "expired": expired_assets,
+        "replacement_rate": (expired_assets / total_assets * 100) if total_assets > 0 else 0,
+    }
+
+def warranty_counts(df):
+    """Number of assets per warranty status"""
+    if "Warranty Status" not in df.columns:
+        return pd.Series(dtype="int64")
+    return df["Warranty Status"].value_counts()
+
+def asset_age_summary(df, bands=AGE_BANDS):
+    """Average age and count per lifecycle band, or None without age data"""
+    if "Asset Age" not in df.columns or df["Asset Age"].sum() == 0:
+        return None
+
+    age = df["Asset Age"]
+    if "Age Category" in df.columns:
+        counts = observed_counts(df["Age Category"])
+    else:
+        labels = np.array([label for label, _ in bands], dtype=object)
+        codes = age_category_codes(age, bands)
+        counts = pd.Series(np.bincount(codes, minlength=len(labels)), index=labels)
+        counts = counts[counts > 0]
+
+    return {
+        "average_age": age[age > 0].mean(),
+        "counts": counts,
+    }
+
+def model_breakdown(df, model_col):
+    """Units per model, largest first"""
+    return model_table(observed_counts(df[model_col]).sort_values(ascending=False), model_col)
+
+def model_table(model_counts, model_col):
+    """Units-per-model table from model counts"""
+    return pd.DataFrame({
+        model_col: model_counts.index,
+        "Total Units": model_counts.values
+    })
+
+def region_breakdown(df, region_col, model_col):
+    """Region x model pivot with row and grand totals"""
+    pivot_data = df.groupby([region_col, model_col], observed=True).size().unstack(fill_value=0)
+    pivot_data.index = pivot_data.index.astype(object)
+    pivot_data.columns = pivot_data.columns.astype(object)
+    return region_table(pivot_data, region_col)
+
+def region_table(pivot_data, region_col):
+    """Region breakdown table from a region x model count pivot"""
+    pivot_data = pivot_data.copy()
+    pivot_data["Total"] = pivot_data.sum(axis=1)
+    pivot_data.loc["Grand Total"] = pivot_data.sum()
+    return pivot_data.reset_index().rename(columns={region_col: "Region"})
@@ -0,0 +1,165 @@
+"""Headless batch reports over a directory of workbooks.
+
+Runs the dashboard pipeline (header detection, enrichment, validation,
+warranty, age and regional breakdowns) on every sheet of every workbook
+without a Streamlit session. Each workbook is handled by one worker process,
+which writes a report workbook per asset sheet holding the same segments as
+the dashboard's exports and returns only a small JSON-ready summary.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .aggregate import asset_age_summary, region_breakdown, warranty_counts
+from .export import export_workbook
+from .ingest import INGEST_START_METHOD
+from .loader import WorkbookCache, hash_file_bytes
+from .pipeline import load_inventory, read_file_bytes
+from .profiling import Profiler, profile_stage
+
+SEVERITIES = ("low", "medium", "high")
+SUMMARY_FILE = "summary.json"
+ISSUE_FIELDS = ("type", "severity", "count", "details")
+
+def clean_name(text):
+    """Text reduced to characters safe in a file name"""
+    return re.sub(r"[^\w.-]+", "_", str(text)).strip("_")
+
+def report_file_name(path, sheet_name, root=None):
+    """Report workbook name for one sheet of a workbook.
+
+    The name holds the workbook's path under ``root`` and the sheet name,
+    plus a short hash of the full path and the raw sheet name, so workbooks
+    of one name in different folders, or sheets whose names clean up the
+    same, get reports of their own.
+    """
+    path = Path(path)
+    relative = path.relative_to(root) if root is not None else Path(path.name)
+    parts = [clean_name(part) for part in (*relative.parent.parts, relative.stem)]
+    tag = hashlib.blake2b(f"{path.resolve()}\n{sheet_name}".encode("utf-8"), digest_size=4).hexdigest()
+    return f"{'__'.join(part for part in parts if part)}__{clean_name(sheet_name) or 'sheet'}__{tag}_report.xlsx"
+
+def issue_summary(issues):
+    """JSON-ready issues, without their row positions"""
+    return [{"type": issue["type"], "severity": issue["severity"], "count": int(issue["count"]),
+             "details": issue["details"]} for issue in issues]
+
+def report_segments(inventory, expired_models=()):
+    """(sheet name, frame) segments of one sheet's report workbook"""
+    df = inventory.df
+    segments = [("Assets", df)]
+    if expired_models:
+        replacement = df[df[inventory.model_col].isin(expired_models)]
+        if not replacement.empty:
+            segments.append(("Replacement", replacement))
+    if inventory.expired_warranty_df is not None and not inventory.expired_warranty_df.empty:
+        segments.append(("Expired Warranty", inventory.expired_warranty_df))
+
+    segments.append(("Validation Issues", pd.DataFrame(issue_summary(inventory.issues), columns=list(ISSUE_FIELDS))))
+    warranty = warranty_counts(df)
+    if not warranty.empty:
+        segments.append(("Warranty Summary", warranty.rename_axis("Warranty Status").reset_index(name="Assets")))
+    age = asset_age_summary(df)
+    if age is not None:
+        segments.append(("Age Summary", age["counts"].rename_axis("Age Category").reset_index(name="Assets")))
+    region_col = inventory.schema.region
+    if region_col:
+        segments.append(("Region Breakdown", region_breakdown(df, region_col, inventory.model_col)))
+    return segments
+
+def sheet_summary(inventory, path, output_file):
+    """JSON-ready summary of one sheet's report"""
+    df = inventory.df
+    age = asset_age_summary(df)
+    severities = pd.Series([issue["severity"] for issue in inventory.issues], dtype=object)
+    return {
+        "file": str(path),
+        "sheet": inventory.sheet_name,
+        "header_row": inventory.header_row,
+        "asset_type": inventory.asset_type,
+        "rows": len(df),
+        "expired_warranty": 0 if inventory.expired_warranty_df is None else len(inventory.expired_warranty_df),
+        "warranty": {str(status): int(count) for status, count in warranty_counts(df).items()},
+        "average_age": None if age is None else round(float(age["average_age"]), 2),
+        "issues": issue_summary(inventory.issues),
+        "issue_severities": {severity: int((severities == severity).sum()) for severity in SEVERITIES},
+        "report": str(output_file),
+    }
+
+def workbook_reports(path, output_dir, expired_models=(), root=None):
+    """Write a report workbook for every asset sheet of a workbook; returns the sheet summaries"""
+    file_bytes = read_file_bytes(path)
+    digest = hash_file_bytes(file_bytes)
+    cache = WorkbookCache()
+    sheets, skipped, written = [], [], set()
+    for sheet_name in cache.sheet_names(file_bytes, digest):
+        profiler = Profiler.from_env("report", file=str(path), sheet=sheet_name)
+        if profiler is not None:
+            profiler.activate()
+        inventory = load_inventory(file_bytes, sheet_name, cache=cache)
+        if not inventory.model_col:
+            skipped.append({"file": str(path), "sheet": sheet_name, "reason": "no model or product column"})
+        else:
+            output_file = Path(output_dir) / report_file_name(path, sheet_name, root)
+            if output_file in written:
+                raise ValueError(f"sheets of {path} share the report name {output_file.name}")
+            written.add(output_file)
+            with profile_stage("export_workbook"):
+                output_file.write_bytes(export_workbook(report_segments(inventory, expired_models)).getvalue())
+            sheets.append(sheet_summary(inventory, path, output_file))
+        if profiler is not None:
+            profiler.finish(rows=len(inventory.df))
+    return {"sheets": sheets, "skipped": skipped}
+
+def _workbook_reports(path, output_dir, expired_models, root):
+    try:
+        return workbook_reports(path, output_dir, expired_models, root)
+    except Exception as e:
+        return {"sheets": [], "skipped": [], "failed": {"path": str(path), "error": str(e)}}
+
+def run_batch(paths, output_dir, expired_models=(), max_workers=None, root=None):
+    """Reports for every workbook in paths, one worker process per workbook at a time.
+
+    Writes the report workbooks and ``SUMMARY_FILE`` into output_dir and
+    returns the summary. Report names hold each workbook's path under
+    ``root`` (its file name without one); sheets that still end up sharing
+    a report are listed as failed.
+    """
+    paths = [str(path) for path in paths]
+    os.makedirs(output_dir, exist_ok=True)
+    expired_models = tuple(expired_models)
+    workers = min(len(paths), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        results = [_workbook_reports(path, output_dir, expired_models, root) for path in paths]
+    else:
+        context = multiprocessing.get_context(INGEST_START_METHOD)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(_workbook_reports, paths, [output_dir] * len(paths),
+                                    [expired_models] * len(paths), [root] * len(paths)))
+
+    sheets = [sheet for result in results for sheet in result["sheets"]]
+    reports = Counter(sheet["report"] for sheet in sheets)
+    summary = {
+        "generated": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "workbooks": sum("failed" not in result for result in results),
+        "sheets": [sheet for sheet in sheets if reports[sheet["report"]] == 1],
+        "skipped": [sheet for result in results for sheet in result["skipped"]],
+        "failed": [result["failed"] for result in results if "failed" in result]
+                  + [{"path": sheet["file"], "error": f"sheet {sheet['sheet']} shares report {sheet['report']}"}
+                     for sheet in sheets if reports[sheet["report"]] > 1],
+    }
+    with open(Path(output_dir) / SUMMARY_FILE, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+def issue_count(summary, min_severity="high"):
+    """Issues at or above a severity across every sheet of a batch summary"""
+    levels = SEVERITIES[SEVERITIES.index(min_severity):]
+    return sum(sheet["issue_severities"][level] for sheet in summary["sheets"] for level in levels)
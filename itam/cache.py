@@ -0,0 +1,88 @@
+"""Memory-bounded LRU cache shared by the workbook and export caches"""
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+def estimate_size(value):
+    """Approximate memory held by a cached value"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, (list, set)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by the approximate size of its values.
+
+    Entries are evicted least-recently-used first once ``max_bytes`` is
+    exceeded; the newest entry is always kept even if it alone is larger.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, default=None, count=True):
+        """Cached value for key, or default on a miss; ``count=False`` leaves the hit counter alone"""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            self.hits += count
+            return self._entries[key][0]
+
+    def get_or_load(self, key, loader, count=True):
+        """Cached value for key, calling loader() on a miss; ``count=False`` skips the counters"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += count
+                return self._entries[key][0]
+            self.misses += count
+
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a value loaded elsewhere, keeping an existing entry for key"""
+        size = estimate_size(value)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self._size += size
+                while self._size > self.max_bytes and len(self._entries) > 1:
+                    _, (_, old_size) = self._entries.popitem(last=False)
+                    self._size -= old_size
+                    self.evictions += 1
+
+    def stats(self):
+        """Hit/miss counters and current memory use"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
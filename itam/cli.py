@@ -0,0 +1,70 @@
+"""Command-line entry point: ``python -m itam <command>``"""
+import argparse
+import os
+import sys
+
+from .batch import SEVERITIES, SUMMARY_FILE, issue_count, run_batch
+from .columnar import COLUMNAR_CACHE_ENV, ColumnarCache, feather, find_workbooks, warm_cache
+
+def warm_cache_command(args, parser):
+    if feather is None:
+        parser.error("pyarrow is required for the columnar cache")
+    if not args.cache_dir:
+        parser.error(f"--cache-dir or {COLUMNAR_CACHE_ENV} is required")
+
+    summary = warm_cache(find_workbooks(args.directory, args.recursive), ColumnarCache(args.cache_dir))
+    print(f"Cached {summary['sheets']} sheet(s) from {summary['workbooks']} workbook(s) into {args.cache_dir}")
+    for failure in summary["failed"]:
+        print(f"Failed: {failure['path']}: {failure['error']}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+def report_command(args, parser):
+    paths = find_workbooks(args.directory, args.recursive)
+    if not paths:
+        parser.error(f"no .xlsx workbooks found in {args.directory}")
+
+    summary = run_batch(paths, args.output_dir, args.expired_model, args.workers, root=args.directory)
+    print(f"Reported {len(summary['sheets'])} sheet(s) from {summary['workbooks']} workbook(s) "
+          f"into {args.output_dir} (see {SUMMARY_FILE})")
+    for sheet in summary["skipped"]:
+        print(f"Skipped: {sheet['file']} / {sheet['sheet']}: {sheet['reason']}", file=sys.stderr)
+    for failure in summary["failed"]:
+        print(f"Failed: {failure['path']}: {failure['error']}", file=sys.stderr)
+    if summary["failed"]:
+        return 1
+    if args.fail_on != "none":
+        flagged = issue_count(summary, args.fail_on)
+        if flagged:
+            print(f"{flagged} validation issue(s) of {args.fail_on} severity or above", file=sys.stderr)
+            return 2
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m itam", description="Asset Management Dashboard tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warm = commands.add_parser("warm-cache", help="pre-warm the columnar cache from a directory of workbooks")
+    warm.add_argument("directory", help="directory containing .xlsx workbooks")
+    warm.add_argument("--cache-dir", default=os.environ.get(COLUMNAR_CACHE_ENV),
+                      help=f"cache directory (default: ${COLUMNAR_CACHE_ENV})")
+    warm.add_argument("--recursive", action="store_true", help="include sub-directories")
+    warm.set_defaults(handler=warm_cache_command)
+
+    report = commands.add_parser("report", help="write the dashboard's reports for a directory of workbooks",
+                                 description="Exits 1 if a workbook cannot be read and 2 if validation "
+                                             "finds issues at the --fail-on severity or above.")
+    report.add_argument("directory", help="directory containing .xlsx workbooks")
+    report.add_argument("--output-dir", required=True, help="directory for the report workbooks and summary")
+    report.add_argument("--recursive", action="store_true", help="include sub-directories")
+    report.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    report.add_argument("--expired-model", action="append", default=[], metavar="MODEL",
+                        help="model to list for replacement; repeat for several")
+    report.add_argument("--fail-on", choices=[*reversed(SEVERITIES), "none"], default="high",
+                        help="lowest issue severity that fails the run (default: high)")
+    report.set_defaults(handler=report_command)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.handler(args, parser)
@@ -0,0 +1,161 @@
+"""On-disk columnar (Arrow/Feather) cache of parsed sheets.
+
+Parsed sheets are written after header detection and column clean-up, keyed
+by the workbook's content hash, so re-uploads of the same workbook in any
+session memory-map the cached file instead of going through openpyxl. The
+cache is opt-in: it is only used when ``ITAM_CACHE_DIR`` is set.
+
+Pre-warm from a directory of workbooks with:
+
+    python -m itam warm-cache --cache-dir /var/cache/itam /path/to/workbooks
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from .loader import WorkbookCache, hash_file_bytes
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = feather = None
+
+COLUMNAR_CACHE_ENV = "ITAM_CACHE_DIR"
+MANIFEST_NAME = "manifest.json"
+
+def to_arrow_compatible(df):
+    """Frame with mixed-type object columns stored as text so Arrow accepts it"""
+    mixed = [col for col in df.columns
+             if df[col].dtype == object
+             and pd.api.types.infer_dtype(df[col], skipna=True) not in
+             ("string", "empty", "integer", "floating", "mixed-integer-float", "boolean",
+              "datetime", "datetime64", "date")]
+    if not mixed:
+        return df.reset_index(drop=True)
+    df = df.copy()
+    for col in mixed:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df.reset_index(drop=True)
+
+def write_atomic(path, write):
+    """Write a file through write(tmp_path) and move it into place in one step"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+class ColumnarCache:
+    """Directory of Feather files, one per (workbook hash, sheet, header row).
+
+    Each workbook hash gets a folder holding a manifest with its sheet names
+    and detected header rows, and one Feather file per loaded sheet.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Cache configured by ITAM_CACHE_DIR, or None if unset or pyarrow is missing"""
+        directory = os.environ.get(COLUMNAR_CACHE_ENV)
+        if not directory or feather is None:
+            return None
+        return cls(directory)
+
+    def _folder(self, digest):
+        return self.directory / digest
+
+    @staticmethod
+    def _sheet_file(sheet_name, header_row):
+        sheet_hash = hashlib.blake2b(str(sheet_name).encode("utf-8"), digest_size=8).hexdigest()
+        return f"{sheet_hash}-{int(header_row)}.feather"
+
+    def read_manifest(self, digest):
+        """Sheet names and header rows recorded for a workbook"""
+        try:
+            with open(self._folder(digest) / MANIFEST_NAME, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _update_manifest(self, digest, update):
+        with self._lock:
+            manifest = self.read_manifest(digest)
+            update(manifest)
+
+            def write(path):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f)
+            write_atomic(self._folder(digest) / MANIFEST_NAME, write)
+
+    def sheet_names(self, digest):
+        """Cached sheet names, or None"""
+        return self.read_manifest(digest).get("sheets")
+
+    def record_sheet_names(self, digest, sheet_names):
+        """Remember a workbook's sheet names"""
+        self._update_manifest(digest, lambda m: m.__setitem__("sheets", list(sheet_names)))
+
+    def header_row(self, digest, sheet_name):
+        """Cached detected header row, or None"""
+        return self.read_manifest(digest).get("header_rows", {}).get(str(sheet_name))
+
+    def record_header_row(self, digest, sheet_name, header_row):
+        """Remember the detected header row of a sheet"""
+        self._update_manifest(digest, lambda m: m.setdefault("header_rows", {}).__setitem__(str(sheet_name), int(header_row)))
+
+    def read_sheet(self, digest, sheet_name, header_row):
+        """Memory-mapped cached sheet, or None on a miss"""
+        path = self._folder(digest) / self._sheet_file(sheet_name, header_row)
+        if not path.exists():
+            return None
+        try:
+            return feather.read_table(path, memory_map=True).to_pandas()
+        except (OSError, pa.ArrowException):
+            return None
+
+    def write_sheet(self, digest, sheet_name, header_row, df):
+        """Store a loaded sheet; returns False if it cannot be represented in Arrow"""
+        try:
+            table = pa.Table.from_pandas(to_arrow_compatible(df), preserve_index=False)
+        except (pa.ArrowException, TypeError, ValueError):
+            return False
+        path = self._folder(digest) / self._sheet_file(sheet_name, header_row)
+        write_atomic(path, lambda tmp: feather.write_feather(table, tmp, compression="uncompressed"))
+        return True
+
+def warm_cache(paths, cache, workbook_cache=None):
+    """Parse every sheet of the given workbooks into the columnar cache"""
+    own_cache = workbook_cache is None
+    if own_cache:
+        workbook_cache = WorkbookCache(columnar=cache)
+    summary = {"workbooks": 0, "sheets": 0, "failed": []}
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                file_bytes = f.read()
+            digest = hash_file_bytes(file_bytes)
+            for sheet_name in workbook_cache.sheet_names(file_bytes, digest):
+                workbook_cache.stream_sheet(file_bytes, digest, sheet_name).result()
+                summary["sheets"] += 1
+            summary["workbooks"] += 1
+        except Exception as e:
+            summary["failed"].append({"path": str(path), "error": str(e)})
+        if own_cache:
+            workbook_cache.clear()
+    return summary
+
+def find_workbooks(directory, recursive=False):
+    """Excel workbooks in a directory, skipping Office lock files"""
+    pattern = "**/*.xlsx" if recursive else "*.xlsx"
+    return sorted(p for p in Path(directory).glob(pattern) if not p.name.startswith("~$"))
@@ -0,0 +1,213 @@
+"""Column name matching and asset type detection.
+
+Headers are matched by normalized substring first. When a schema is
+resolved, fields that match no header exactly are scored against the
+vocabulary with a fuzzy ratio, so misspellings such as "Serail No" or
+"Warrenty Exp" still resolve. A fuzzy match must contain every word of the
+term, and short one-word terms need a closer score, so "Purchased" is not
+read as a purchase date nor "Stat" as a state. Fields resolved fuzzily are
+logged. Scores are cached per header text and schemas per column layout, so
+a recurring workbook layout costs one dictionary lookup.
+"""
+import logging
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from .fuzzy import partial_similarity, similarity
+
+WORKSTATION_IDENTIFIERS = ["workstation", "model", "warranty", "place"]
+MOBILE_IDENTIFIERS = ["product", "programme", "program"]
+FUZZY_MATCH_THRESHOLD = 0.8
+# Shorter terms ("user", "site") match too many unrelated words when fuzzy
+FUZZY_MIN_TERM_LENGTH = 5
+# One-word terms up to this length ("state", "model") are one edit from
+# other words, so they need a closer match
+FUZZY_SHORT_TERM_LENGTH = 7
+FUZZY_SHORT_TERM_THRESHOLD = 0.9
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=4096)
+def normalize_text(text):
+    """Normalize text for column matching"""
+    return re.sub(r'[^a-z0-9]', '', str(text).lower())
+
+# Logical fields and the search terms that locate them; per-asset-type terms
+# are given as {"Workstation": [...], "Mobile": [...]}
+FIELD_SEARCH_TERMS = {
+    "asset_tag": ["asset tag", "assettag"],
+    "serial": ["serial number", "serialnumber", "serial no"],
+    "user": ["user"],
+    "email": ["email"],
+    "department": ["department", "user department"],
+    "location": ["location"],
+    "warranty_expiry": ["warranty expiry", "warrantyexpiry", "warranty exp"],
+    "year_of_purchase": ["year of purchase", "yearofpurchase"],
+    "purchase_date": ["purchase date", "purchasedate", "date of purchase", "dateofpurchase"],
+    "model": {"Workstation": ["model"], "Mobile": ["product"]},
+    "type": {"Workstation": ["workstation type", "workstationtype"],
+             "Mobile": ["product type", "producttype"]},
+    "place": ["place"],
+    "site": ["site", "user site", "usersite"],
+    "state": ["state"],
+    "programme": ["programme", "program"],
+    "status": ["workstation status", "workstationstatus"],
+}
+
+def contains_word(norm_col, word):
+    """Whether a normalized header holds a term word: exactly, or misspelled for longer words"""
+    if word in norm_col:
+        return True
+    return len(word) >= FUZZY_MIN_TERM_LENGTH and partial_similarity(norm_col, word) >= FUZZY_MATCH_THRESHOLD
+
+@lru_cache(maxsize=16384)
+def fuzzy_score(column, term):
+    """Fuzzy score of a header against a search term, 0 when it is not a plausible misspelling"""
+    norm_col, norm_term = normalize_text(column), normalize_text(term)
+    if len(norm_term) < FUZZY_MIN_TERM_LENGTH:
+        return 0.0
+    words = [normalize_text(word) for word in term.split()]
+    if len(words) > 1 and not all(contains_word(norm_col, word) for word in words):
+        return 0.0
+    # Windows only for headers with extra words ("Warrenty Expiry Date"), so
+    # a near-miss like "Status" is not read as "State"
+    if len(norm_col) > len(norm_term) + 2:
+        score = partial_similarity(norm_col, norm_term)
+    else:
+        score = similarity(norm_col, norm_term)
+    if len(words) == 1 and len(norm_term) <= FUZZY_SHORT_TERM_LENGTH and score < FUZZY_SHORT_TERM_THRESHOLD:
+        return 0.0
+    return score
+
+def fuzzy_terms(terms):
+    """Terms worth fuzzing: run-together spellings ("purchasedate") are left to their spaced form"""
+    spaced = {normalize_text(term) for term in terms if " " in term}
+    return tuple(term for term in terms if " " in term or normalize_text(term) not in spaced)
+
+@lru_cache(maxsize=1024)
+def _fuzzy_match(columns, terms, exclude):
+    best, best_score = None, FUZZY_MATCH_THRESHOLD
+    for term in fuzzy_terms(terms):
+        for col in columns:
+            if col in exclude:
+                continue
+            score = fuzzy_score(col, term)
+            if score > best_score or (best is None and score == best_score):
+                best, best_score = col, score
+    return best
+
+def match_column(columns, search_terms, fuzzy=False, exclude=()):
+    """Find column name by multiple search terms, with ``fuzzy`` falling back to fuzzy matching"""
+    if isinstance(search_terms, str):
+        search_terms = [search_terms]
+    
+    normalized_cols = {normalize_text(col): col for col in columns}
+    
+    for term in search_terms:
+        normalized_term = normalize_text(term)
+        for norm_col, orig_col in normalized_cols.items():
+            if normalized_term in norm_col:
+                return orig_col
+    if fuzzy:
+        return _fuzzy_match(tuple(columns), tuple(search_terms), tuple(exclude))
+    return None
+
+def find_column(df, search_terms, fuzzy=False):
+    """Find column by multiple search terms; fuzzy matching is opt-in"""
+    return match_column(df.columns, search_terms, fuzzy=fuzzy)
+
+class ColumnSchema:
+    """Logical field to actual column mapping, resolved once per loaded sheet.
+
+    ``schema["serial"]`` returns the matching column name or None, so
+    rendering and validation code never rescan the column list.
+    """
+
+    def __init__(self, fields, asset_type, fuzzy=None):
+        self.fields = dict(fields)
+        self.asset_type = asset_type
+        # Fields resolved only by fuzzy matching, for display
+        self.fuzzy = dict(fuzzy or {})
+
+    def __getitem__(self, field):
+        return self.fields.get(field)
+
+    def get(self, field, default=None):
+        column = self.fields.get(field)
+        return default if column is None else column
+
+    @property
+    def region(self):
+        """Place for Workstation assets, Site for Mobile"""
+        return self.fields.get("place" if self.asset_type == "Workstation" else "site")
+
+    def columns(self, *fields):
+        """Resolved columns for the given fields, skipping missing ones"""
+        return [self.fields[f] for f in fields if self.fields.get(f)]
+
+    def __repr__(self):
+        return f"ColumnSchema({self.asset_type!r}, {self.fields!r})"
+
+def field_terms(field, asset_type):
+    """Search terms of a logical field for an asset type"""
+    terms = FIELD_SEARCH_TERMS[field]
+    return terms.get(asset_type, []) if isinstance(terms, dict) else terms
+
+@lru_cache(maxsize=256)
+def _resolve_schema(columns, asset_type):
+    fields = {field: match_column(columns, field_terms(field, asset_type)) for field in FIELD_SEARCH_TERMS}
+
+    # Fuzzy fallback only for unresolved fields and only onto unclaimed columns
+    claimed = [col for col in fields.values() if col]
+    fuzzy = {}
+    for field, col in fields.items():
+        if col is None:
+            col = match_column(columns, field_terms(field, asset_type), fuzzy=True, exclude=claimed)
+            if col is not None:
+                fields[field] = fuzzy[field] = col
+                claimed.append(col)
+    if fuzzy:
+        logger.info("Resolved %s columns fuzzily: %s", asset_type,
+                    ", ".join(f"{field}={col!r}" for field, col in fuzzy.items()))
+    return ColumnSchema(fields, asset_type, fuzzy)
+
+def resolve_schema(columns, asset_type=None):
+    """Column schema for a sheet's columns (memoized per column layout)"""
+    columns = tuple(columns)
+    if asset_type is None:
+        asset_type = detect_asset_type(columns)
+    return _resolve_schema(columns, asset_type)
+
+@lru_cache(maxsize=16384)
+def keyword_hits(text, keywords):
+    """Which keywords a header cell contains, exactly or as a misspelled word"""
+    normalized = normalize_text(text)
+    words = re.findall(r'[a-z0-9]+', str(text).lower())
+    return tuple(keyword in normalized
+                 or (len(keyword) >= FUZZY_MIN_TERM_LENGTH
+                     and any(similarity(word, keyword) >= FUZZY_MATCH_THRESHOLD for word in words))
+                 for keyword in keywords)
+
+def keyword_matrix(texts, keywords):
+    """Boolean (texts x keywords) matrix of keyword hits"""
+    keywords = tuple(keywords)
+    hits = [keyword_hits(text, keywords) for text in texts]
+    return np.array(hits, dtype=bool).reshape(len(hits), len(keywords))
+
+def detect_asset_type(df_columns):
+    """Auto-detect asset type from column names"""
+    columns = list(df_columns)
+    workstation_score = int(keyword_matrix(columns, WORKSTATION_IDENTIFIERS).any(axis=0).sum())
+    mobile_score = int(keyword_matrix(columns, MOBILE_IDENTIFIERS).any(axis=0).sum())
+    
+    return "Workstation" if workstation_score > mobile_score else "Mobile"
+
+def get_model_column(df, asset_type):
+    """Get model column based on asset type"""
+    return resolve_schema(df.columns, asset_type)["model"]
+
+def get_type_column(df, asset_type):
+    """Get type column based on asset type"""
+    return resolve_schema(df.columns, asset_type)["type"]
@@ -0,0 +1,96 @@
+"""Compact in-memory representation of loaded inventories.
+
+``pd.read_excel`` yields object columns throughout, where every cell is a
+separate Python string. After enrichment, repetitive text columns (models,
+departments, sites, states) become categoricals, the remaining text columns
+Arrow-backed strings when pyarrow is installed, and integer columns the
+smallest integer type that holds them.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    ARROW_STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    ARROW_STRING_DTYPE = None
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_RATIO = 0.5
+
+def frame_memory(df):
+    """Bytes held by a frame, including the Python objects it references"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+def compact_integers(series):
+    """Smallest integer dtype for whole-number columns, nullable if there are gaps"""
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if not pd.api.types.is_float_dtype(series):
+        return series
+    values = series.dropna()
+    if values.empty or not np.array_equal(values, np.round(values)):
+        return series
+    for dtype in ("Int8", "Int16", "Int32", "Int64"):
+        info = np.iinfo(dtype.lower())
+        if values.min() >= info.min and values.max() <= info.max:
+            return series.astype(dtype)
+    return series
+
+def compact_text(series, category_max_ratio=CATEGORY_MAX_RATIO):
+    """Categorical for repetitive text, Arrow-backed string for the rest.
+
+    Returns the compacted column and the bytes the object column held,
+    sized from its distinct values rather than cell by cell.
+    """
+    codes, uniques = pd.factorize(series, sort=False)
+    sizes = np.fromiter(map(sys.getsizeof, uniques), dtype=np.int64, count=len(uniques))
+    present = codes >= 0
+    bytes_before = (series.memory_usage(index=False)
+                    + int(np.bincount(codes[present], minlength=len(uniques)) @ sizes)
+                    + int((~present).sum()) * sys.getsizeof(np.nan))
+
+    if pd.api.types.infer_dtype(uniques, skipna=True) != "string":
+        return series, bytes_before
+    if len(uniques) <= present.sum() * category_max_ratio:
+        # Sorted categories keep sort_values in alphabetical order
+        order = np.argsort(uniques.astype(str), kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        categorical = pd.Categorical.from_codes(np.where(present, rank[codes], -1),
+                                                categories=uniques[order])
+        return pd.Series(categorical, index=series.index, name=series.name), bytes_before
+    if ARROW_STRING_DTYPE is not None:
+        return series.astype(ARROW_STRING_DTYPE), bytes_before
+    return series, bytes_before
+
+def compact_frame(df, category_max_ratio=CATEGORY_MAX_RATIO):
+    """Frame with compact column dtypes, and a report of the memory saved"""
+    bytes_before = int(df.index.memory_usage(deep=True))
+    columns = {}
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object:
+            compacted, column_bytes = compact_text(series, category_max_ratio)
+        else:
+            compacted, column_bytes = compact_integers(series), series.memory_usage(index=False, deep=True)
+        bytes_before += int(column_bytes)
+        if compacted.dtype != series.dtype:
+            converted[col] = str(compacted.dtype)
+        columns[col] = compacted
+
+    # Unconverted columns are shared with df rather than copied
+    compacted = pd.DataFrame(columns, index=df.index, copy=False) if converted else df
+    bytes_after = frame_memory(compacted)
+    report = {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "saved_bytes": bytes_before - bytes_after,
+        "converted": converted,
+    }
+    return compacted, report
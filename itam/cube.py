@@ -0,0 +1,131 @@
+"""Pre-aggregated group counts behind the dashboard's charts and breakdowns.
+
+Every dimension (model, type, department, location, region, state, warranty
+status and lifecycle band) is factorized once per loaded dataset, or taken
+from its categorical codes. The
+unfiltered view is answered from stored totals, and a filtered view, given
+as row positions from a ``FilterIndex``, is one ``bincount`` over the
+dimension codes of those rows; cross-tabs combine two code arrays into one.
+Charts and tables are then built from small count series instead of
+grouping, hashing or copying the filtered frame on every rerun.
+"""
+import numpy as np
+import pandas as pd
+
+from .aggregate import age_category_codes
+from .enrich import AGE_BANDS
+
+# Logical fields kept as cube dimensions; warranty status and age category
+# are added whenever the enriched frame has them
+CUBE_FIELDS = ("model", "type", "department", "location", "place", "site", "state")
+AGE_CATEGORY = "Age Category"
+DERIVED_DIMENSIONS = ("Warranty Status", AGE_CATEGORY)
+
+def sorted_label_order(labels):
+    """Positions of labels in sorted order, or as they are if they don't compare"""
+    try:
+        return np.argsort(np.asarray(labels, dtype=object), kind="stable")
+    except TypeError:
+        return np.arange(len(labels))
+
+class AggregateCube:
+    """Per-dataset group counts over the dashboard's dimensions.
+
+    Methods take ``rows``, sorted row positions of the filtered view, or
+    None for the whole dataset.
+    """
+
+    def __init__(self, df, columns, age_bands=AGE_BANDS):
+        self.size = len(df)
+        self._codes = {}
+        self._labels = {}
+        self._totals = {}
+        for col in dict.fromkeys([*columns, *DERIVED_DIMENSIONS]):
+            if col is None or col not in df.columns:
+                continue
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Categories keep their order (tiers, bands) and need no hashing
+                self._add(col, series.cat.codes.to_numpy(), pd.Index(series.cat.categories, dtype=object))
+            else:
+                codes, uniques = pd.factorize(series)
+                self._add(col, codes, pd.Index(uniques, tupleize_cols=False).astype(object))
+
+        self._ages = None
+        if "Asset Age" in df.columns:
+            self._ages = df["Asset Age"].to_numpy(dtype="float64", na_value=0)
+            known = self._ages > 0
+            self._age_total = (float(self._ages[known].sum()), int(known.sum()))
+            if AGE_CATEGORY not in self._codes:
+                self._add(AGE_CATEGORY, age_category_codes(self._ages, age_bands),
+                          pd.Index([label for label, _ in age_bands], dtype=object))
+
+    def _add(self, col, codes, labels):
+        self._codes[col] = codes.astype(np.int32, copy=False)
+        self._labels[col] = labels
+        self._totals[col] = np.bincount(codes[codes >= 0], minlength=len(labels))
+
+    def __contains__(self, col):
+        return col in self._codes
+
+    def _counts(self, col, rows):
+        if rows is None:
+            return self._totals[col]
+        codes = self._codes[col][rows]
+        return np.bincount(codes[codes >= 0], minlength=len(self._labels[col]))
+
+    def total(self, rows=None):
+        """Number of rows in the view"""
+        return self.size if rows is None else len(rows)
+
+    def counts(self, col, rows=None):
+        """Rows per value of a column, largest first, leaving out values no row has"""
+        counts = self._counts(col, rows)
+        present = np.flatnonzero(counts)
+        present = present[np.argsort(-counts[present], kind="stable")]
+        return pd.Series(counts[present], index=self._labels[col][present], name="count")
+
+    def value_rows(self, col, value, rows=None):
+        """Positions of the rows in the view holding one value of a column"""
+        code = self._labels[col].get_indexer([value])[0]
+        if rows is None:
+            return np.flatnonzero(self._codes[col] == code) if code >= 0 else np.empty(0, dtype=np.int64)
+        rows = np.asarray(rows)
+        return rows[self._codes[col][rows] == code] if code >= 0 else rows[:0]
+
+    def crosstab(self, index_col, columns_col, rows=None):
+        """Rows per (index value, column value) pair, like groupby().size().unstack(fill_value=0)"""
+        first, second = self._codes[index_col], self._codes[columns_col]
+        if rows is not None:
+            first, second = first[rows], second[rows]
+        width = len(self._labels[columns_col])
+        both = (first >= 0) & (second >= 0)
+        table = np.bincount(first[both].astype(np.int64) * width + second[both],
+                            minlength=len(self._labels[index_col]) * width).reshape(-1, width)
+
+        index_labels, column_labels = self._labels[index_col], self._labels[columns_col]
+        keep_rows = np.flatnonzero(table.any(axis=1))
+        keep_rows = keep_rows[sorted_label_order(index_labels[keep_rows])]
+        keep_cols = np.flatnonzero(table.any(axis=0))
+        keep_cols = keep_cols[sorted_label_order(column_labels[keep_cols])]
+        return pd.DataFrame(table[np.ix_(keep_rows, keep_cols)],
+                            index=index_labels[keep_rows].rename(index_col),
+                            columns=column_labels[keep_cols].rename(columns_col))
+
+    def age_summary(self, rows=None):
+        """Average age and count per lifecycle band, or None without age data"""
+        if self._ages is None:
+            return None
+        if rows is None:
+            age_sum, known = self._age_total
+        else:
+            ages = self._ages[rows]
+            age_sum, known = float(ages[ages > 0].sum()), int((ages > 0).sum())
+        if not known:
+            return None
+        counts = self._counts(AGE_CATEGORY, rows)
+        present = np.flatnonzero(counts)
+        return {
+            "average_age": age_sum / known,
+            "counts": pd.Series(counts[present], index=self._labels[AGE_CATEGORY][present], name="count"),
+        }
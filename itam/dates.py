@@ -0,0 +1,125 @@
+"""Date parsing for warranty expiry and purchase date columns.
+
+Spreadsheet date columns mix real date cells, Excel serial numbers typed as
+numbers and text in whatever format the author used. Each column is reduced
+to its distinct values first, so a date repeated on thousands of rows is
+parsed once. The dominant text format is inferred from a sample of those
+values, with day-first and month-first orders competing on the values only
+one of them can read, and the text is then parsed with that format in one
+vectorized call. Parsed values are memoized per set of distinct values, so
+enrichment and validation share the work.
+"""
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+# Serial numbers between 1954 and 2119; anything else is not read as a date
+EXCEL_SERIAL_RANGE = (20_000, 80_000)
+# Order tried when day-first and month-first read the same number of values
+DATE_DAYFIRST = True
+DATE_FORMATS = (
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d",
+    "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%m-%d-%Y", "%d.%m.%Y",
+    "%d/%m/%y", "%m/%d/%y",
+    "%d %b %Y", "%d-%b-%Y", "%d %B %Y", "%b %d, %Y", "%B %d, %Y",
+)
+FORMAT_SAMPLE_SIZE = 500
+# Text that means "no date" rather than a date that failed to parse
+MISSING_DATE_MARKERS = frozenset({"", "-", "--", "n/a", "na", "nil", "none", "null", "tba", "tbc", "unknown"})
+
+def candidate_formats(dayfirst=DATE_DAYFIRST):
+    """DATE_FORMATS with the preferred day/month order first"""
+    if dayfirst:
+        return DATE_FORMATS
+    return tuple(sorted(DATE_FORMATS, key=lambda fmt: fmt.startswith("%d")))
+
+def infer_date_format(texts, dayfirst=DATE_DAYFIRST, sample_size=FORMAT_SAMPLE_SIZE):
+    """Candidate formats that read a sample of the texts, most matches first"""
+    sample = pd.Series(texts[:sample_size], dtype=object)
+    scores = []
+    for rank, fmt in enumerate(candidate_formats(dayfirst)):
+        matched = int(pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum())
+        if matched:
+            scores.append((-matched, rank, fmt))
+    return [fmt for _, _, fmt in sorted(scores)]
+
+def parse_texts(texts, dayfirst=DATE_DAYFIRST):
+    """Parse date strings with the dominant format, then the runner-up formats on what is left.
+
+    Texts none of DATE_FORMATS reads are parsed one by one in pandas'
+    mixed mode, so a column in an unlisted format still gets its dates;
+    times with a UTC offset are converted to UTC.
+    """
+    texts = pd.Series(texts, dtype=object)
+    parsed = pd.Series(pd.NaT, index=texts.index, dtype="datetime64[ns]")
+    for fmt in infer_date_format(texts.to_numpy(), dayfirst):
+        pending = parsed.isna()
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(texts[pending], format=fmt, errors="coerce")
+    pending = parsed.isna()
+    if pending.any():
+        # Read as UTC so texts with and without an offset share one dtype
+        fallback = pd.to_datetime(texts[pending], format="mixed", dayfirst=dayfirst, errors="coerce", utc=True)
+        parsed[pending] = fallback.dt.tz_localize(None)
+    return parsed.to_numpy()
+
+@lru_cache(maxsize=16)
+def parse_unique_dates(values, dayfirst=DATE_DAYFIRST):
+    """Dates for a tuple of distinct cell values, and which of them failed to parse.
+
+    Date cells are kept, numbers in EXCEL_SERIAL_RANGE are read as Excel
+    serials and text goes through format inference. Missing markers such as
+    "n/a" give NaT without counting as failures.
+    """
+    values = np.array(values, dtype=object)
+    parsed = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ns]")
+    missing = np.zeros(len(values), dtype=bool)
+
+    is_date = np.fromiter((isinstance(v, (date, np.datetime64)) for v in values), dtype=bool, count=len(values))
+    if is_date.any():
+        parsed[is_date] = pd.to_datetime(pd.Series(values[is_date], dtype=object), errors="coerce").to_numpy()
+
+    is_text = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+    text = np.array([v.strip() for v in values[is_text]], dtype=object)
+    missing[np.flatnonzero(is_text)[np.isin(np.char.lower(text.astype(str)), list(MISSING_DATE_MARKERS))]] = True
+
+    # Serial numbers, whether stored as numbers or typed as text
+    numbers = pd.to_numeric(pd.Series(np.where(is_date | missing, np.nan, values), dtype=object),
+                            errors="coerce").to_numpy(dtype="float64")
+    is_serial = (numbers >= EXCEL_SERIAL_RANGE[0]) & (numbers <= EXCEL_SERIAL_RANGE[1])
+    if is_serial.any():
+        parsed[is_serial] = (EXCEL_EPOCH + pd.to_timedelta(numbers[is_serial], unit="D")).to_numpy()
+
+    is_text_date = is_text & ~missing & ~is_serial
+    if is_text_date.any():
+        position = np.cumsum(is_text) - 1
+        parsed[is_text_date] = parse_texts(text[position[is_text_date]], dayfirst)
+
+    failed = np.isnat(parsed) & ~missing
+    # Shared by every caller through the cache
+    parsed.flags.writeable = failed.flags.writeable = False
+    return parsed, failed
+
+def _unique_dates(series, dayfirst):
+    codes, uniques = pd.factorize(series)
+    parsed, failed = parse_unique_dates(tuple(np.asarray(uniques, dtype=object)), dayfirst)
+    return codes, parsed, failed
+
+def parse_dates(series, dayfirst=DATE_DAYFIRST):
+    """Date column parsed from cells, Excel serials and text, NaT where there is no date"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    codes, parsed, _ = _unique_dates(series, dayfirst)
+    values = np.append(parsed, np.datetime64("NaT"))[codes]
+    return pd.Series(values, index=series.index, name=series.name)
+
+def unparseable_date_rows(series, dayfirst=DATE_DAYFIRST):
+    """Positions of cells holding a value that is not a recognisable date"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return np.empty(0, dtype=np.int64)
+    codes, _, failed = _unique_dates(series, dayfirst)
+    return np.flatnonzero(np.append(failed, False)[codes])
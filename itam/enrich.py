@@ -0,0 +1,106 @@
+"""Derived columns: asset age, lifecycle band and warranty status"""
+import numpy as np
+import pandas as pd
+
+from .columns import resolve_schema
+from .dates import parse_dates
+
+# Warranty tiers as (status, last day of the tier); the final tier is open-ended
+WARRANTY_TIERS = (("Expired", -1), ("Expiring Soon", 90), ("Active", None))
+WARRANTY_UNKNOWN = "Unknown"
+# Lifecycle bands as (label, last year of the band); the final band is open-ended
+AGE_BANDS = (("New (0-1 year)", 1), ("Active (1-3 years)", 3), ("Aging (3-5 years)", 5),
+             ("Old (5+ years)", None))
+
+def age_in_months(df, schema=None, today=None):
+    """Whole months since purchase, NaN where neither purchase date nor year is known.
+
+    The purchase date is used where a row has one, the purchase year otherwise.
+    """
+    schema = schema or resolve_schema(df.columns)
+    today = today or pd.Timestamp.now()
+    months = pd.Series(np.nan, index=df.index)
+
+    year_col = schema["year_of_purchase"]
+    if year_col:
+        months = (today.year - pd.to_numeric(df[year_col], errors='coerce')) * 12
+
+    date_col = schema["purchase_date"]
+    if date_col:
+        purchased = parse_dates(df[date_col])
+        date_months = ((today.year - purchased.dt.year) * 12 + (today.month - purchased.dt.month)
+                       - (today.day < purchased.dt.day))
+        months = date_months.where(purchased.notna(), months)
+    return months.astype("float64")
+
+def age_in_years(age_months):
+    """Completed years as nullable integers, 0 where unknown"""
+    return (age_months.fillna(0) // 12).astype("Int64").rename("Asset Age")
+
+def asset_age(df, schema=None):
+    """Asset age in years from purchase date or year"""
+    schema = schema or resolve_schema(df.columns)
+    return age_in_years(age_in_months(df, schema=schema))
+
+def classify_age(age_months, bands=AGE_BANDS):
+    """Bin ages in months into lifecycle bands as a categorical, in one searchsorted pass"""
+    labels = [label for label, _ in bands]
+    bounds = np.array([bound * 12 for _, bound in bands[:-1]], dtype="float64")
+    months = np.nan_to_num(np.asarray(age_months, dtype="float64"), nan=0.0)
+    codes = np.searchsorted(bounds, months, side='left').astype(np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels),
+                     index=getattr(age_months, "index", None), name="Age Category")
+
+def age_columns(df, bands=AGE_BANDS, schema=None):
+    """Asset age and lifecycle band columns"""
+    schema = schema or resolve_schema(df.columns)
+    months = age_in_months(df, schema=schema)
+    return {
+        "Asset Age": age_in_years(months),
+        "Age Category": classify_age(months, bands),
+    }
+
+def calculate_asset_age(df, schema=None, bands=AGE_BANDS):
+    """Frame with Asset Age and Age Category columns; df itself is left unchanged"""
+    return df.assign(**age_columns(df, bands, schema=schema))
+
+def classify_warranty(days_to_expiry, tiers=WARRANTY_TIERS):
+    """Bin days-to-expiry into warranty tiers as a categorical"""
+    labels = [status for status, _ in tiers]
+    bounds = np.array([bound for _, bound in tiers[:-1]], dtype="float64")
+    days = pd.to_numeric(days_to_expiry, errors='coerce').to_numpy(dtype="float64", na_value=np.nan)
+
+    codes = np.searchsorted(bounds, days, side='left')
+    codes[np.isnan(days)] = len(labels)
+    codes = codes.astype(np.int8 if len(labels) < 127 else np.int16)
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=labels + [WARRANTY_UNKNOWN]),
+        index=days_to_expiry.index,
+        name="Warranty Status",
+    )
+
+def warranty_columns(df, tiers=WARRANTY_TIERS, schema=None):
+    """Expiry date, days to expiry and warranty status columns, empty without a warranty column"""
+    warranty_col = (schema or resolve_schema(df.columns))["warranty_expiry"]
+    if not warranty_col:
+        return {}
+
+    expiry = parse_dates(df[warranty_col])
+    today = pd.Timestamp.now()
+    days = (expiry - today).dt.days
+    return {
+        "Warranty Expiry Date": expiry,
+        "Days to Expiry": days,
+        "Warranty Status": classify_warranty(days, tiers),
+    }
+
+def get_warranty_status(df, tiers=WARRANTY_TIERS, schema=None):
+    """Calculate warranty status; df itself is left unchanged"""
+    columns = warranty_columns(df, tiers, schema=schema)
+    if not columns:
+        return df, None
+
+    df = df.assign(**columns)
+    expired_warranty_df = df[df["Warranty Status"] == tiers[0][0]]
+    return df, expired_warranty_df
@@ -0,0 +1,122 @@
+"""Excel export and sample templates"""
+from io import BytesIO
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from .cache import LRUCache
+
+EXPORT_CACHE_MAX_BYTES = 128 * 1024 * 1024
+EXPORT_CHUNK_ROWS = 10_000
+
+def _write_sheet(ws, df, chunk_rows):
+    """Stream a frame into a write-only worksheet, chunk by chunk"""
+    header = []
+    for col in df.columns:
+        cell = WriteOnlyCell(ws, value=str(col))
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(row)
+
+def export_workbook(segments, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Export (sheet name, dataframe) segments into one workbook in a single pass.
+
+    Uses openpyxl's write-only mode so rows are streamed out in chunks
+    instead of holding every cell object in memory.
+    """
+    wb = Workbook(write_only=True)
+    for sheet_name, df in segments:
+        _write_sheet(wb.create_sheet(title=sheet_name), df, chunk_rows)
+
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    return output
+
+def export_to_excel(df, filename="asset_data.xlsx"):
+    """Export dataframe to Excel"""
+    return export_workbook([("Assets", df)])
+
+class ExportCache(LRUCache):
+    """Export bytes memoized by (dataset key, filter state, export kind).
+
+    Exports are only built when a download is requested, and repeated
+    downloads of the same view reuse the bytes.
+    """
+
+    def __init__(self, max_bytes=EXPORT_CACHE_MAX_BYTES):
+        super().__init__(max_bytes)
+
+    def get(self, dataset_key, filter_key, kind, df):
+        """Excel bytes of df, built on the first request"""
+        return self.get_or_load((dataset_key, filter_key, kind), lambda: export_to_excel(df).getvalue())
+
+    def get_workbook(self, dataset_key, filter_key, kind, segments):
+        """Excel bytes with one sheet per (sheet name, dataframe) segment"""
+        return self.get_or_load((dataset_key, filter_key, kind), lambda: export_workbook(segments).getvalue())
+
+def sample_workstation_data():
+    """Sample workstation inventory used for the downloadable template"""
+    sample_data = {
+        'Asset Tag': ['WS001', 'WS002', 'WS003', 'WS004', 'WS005'],
+        'Model': ['Dell Latitude 5420', 'HP EliteBook 840', 'Lenovo ThinkPad X1', 'Dell Optiplex 7090', 'HP ProBook 450'],
+        'Workstation Type': ['Laptop', 'Laptop', 'Laptop', 'Desktop', 'Laptop'],
+        'Serial Number': ['SN12345', 'SN12346', 'SN12347', 'SN12348', 'SN12349'],
+        'User': ['John Doe', 'Jane Smith', 'Bob Wilson', 'Alice Brown', 'Charlie Davis'],
+        'User Email': ['john.doe@company.com', 'jane.smith@company.com', 'bob.wilson@company.com', 'alice.brown@company.com', 'charlie.davis@company.com'],
+        'Department': ['IT', 'Finance', 'HR', 'Operations', 'Marketing'],
+        'Location': ['HQ Building A', 'HQ Building B', 'Branch Office', 'HQ Building A', 'Remote'],
+        'Site': ['Headquarters', 'Headquarters', 'Branch', 'Headquarters', 'Remote'],
+        'Year Of Purchase': [2022, 2021, 2023, 2020, 2022],
+        'Warranty Expiry': ['2025-12-31', '2024-11-30', '2026-06-30', '2023-10-31', '2025-08-15'],
+        'Place': ['Malaysia', 'Malaysia', 'Singapore', 'Malaysia', 'Malaysia'],
+        'Workstation Status': ['Active', 'Active', 'Active', 'Retired', 'Active'],
+        'State': ['In Use', 'In Use', 'In Use', 'Storage', 'In Use']
+    }
+    
+    return pd.DataFrame(sample_data)
+
+def create_sample_workstation_file():
+    """Create sample workstation Excel file"""
+    df = sample_workstation_data()
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Workstation Assets')
+    output.seek(0)
+    return output
+
+def sample_mobile_data():
+    """Sample mobile inventory used for the downloadable template"""
+    sample_data = {
+        'Asset Tag': ['MB001', 'MB002', 'MB003', 'MB004', 'MB005'],
+        'Product': ['iPhone 13 Pro', 'Samsung Galaxy S21', 'iPad Air', 'iPhone 12', 'Samsung Tab S8'],
+        'Product Type': ['Phone', 'Phone', 'Tablet', 'Phone', 'Tablet'],
+        'Serial Number': ['SNM12345', 'SNM12346', 'SNM12347', 'SNM12348', 'SNM12349'],
+        'User': ['John Doe', 'Jane Smith', 'Bob Wilson', 'Alice Brown', 'Charlie Davis'],
+        'User Email': ['john.doe@company.com', 'jane.smith@company.com', 'bob.wilson@company.com', 'alice.brown@company.com', 'charlie.davis@company.com'],
+        'Department': ['IT', 'Sales', 'Operations', 'Finance', 'HR'],
+        'Location': ['HQ Building A', 'Field', 'HQ Building B', 'HQ Building A', 'Branch Office'],
+        'Site': ['Headquarters', 'Field', 'Headquarters', 'Headquarters', 'Branch'],
+        'Year Of Purchase': [2022, 2021, 2023, 2021, 2022],
+        'Programme': ['Enterprise Mobility', 'Sales Force', 'Operations', 'Finance', 'HR Management'],
+        'State': ['In Use', 'In Use', 'In Use', 'In Use', 'In Use']
+    }
+    
+    return pd.DataFrame(sample_data)
+
+def create_sample_mobile_file():
+    """Create sample mobile Excel file"""
+    df = sample_mobile_data()
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Mobile Assets')
+    output.seek(0)
+    return output
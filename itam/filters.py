@@ -0,0 +1,156 @@
+"""Sidebar filter application"""
+import numpy as np
+import pandas as pd
+
+from .search import SearchIndex
+
+# Logical fields offered as sidebar multiselects
+FILTER_FIELDS = ("model", "type", "site", "location", "department", "status", "place", "state", "programme")
+
+class FilterIndex:
+    """Posting lists of row positions for every (column, value) of a dataset.
+
+    Built once per loaded dataset over the filterable columns. Option lists
+    and per-option counts come straight from the index, and a selection is
+    resolved by intersecting position arrays, starting from the most
+    selective filter, so only the final rows are materialized.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self._codes = {}
+        self._options = {}
+        self._counts = {}
+        self._postings = {}
+        for col in dict.fromkeys(columns):
+            if col not in df.columns:
+                continue
+            # Same order and NaN handling as df[col].unique() / isin
+            codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes, minlength=len(uniques))
+            self._codes[col] = codes
+            self._options[col] = pd.Index(uniques, tupleize_cols=False)
+            self._counts[col] = counts
+            self._postings[col] = (order, np.concatenate(([0], np.cumsum(counts))))
+
+    def __contains__(self, col):
+        return col in self._codes
+
+    def options(self, col):
+        """Distinct values of a column in order of first appearance"""
+        return list(self._options[col])
+
+    def option_counts(self, col):
+        """Rows per distinct value of a column"""
+        return dict(zip(self._options[col], self._counts[col].tolist()))
+
+    def _selected_codes(self, col, values):
+        codes = self._options[col].get_indexer(list(values))
+        return codes[codes >= 0]
+
+    def rows(self, filters):
+        """Sorted positions of the rows passing every non-empty filter"""
+        active = []
+        for col, values in filters.items():
+            if values:
+                codes = self._selected_codes(col, values)
+                active.append((int(self._counts[col][codes].sum()), col, codes))
+        if not active:
+            return np.arange(len(self.df))
+
+        active.sort(key=lambda item: item[0])
+        _, col, codes = active[0]
+        order, bounds = self._postings[col]
+        rows = np.sort(np.concatenate([order[bounds[c]:bounds[c + 1]] for c in codes] or [order[:0]]))
+        for _, col, codes in active[1:]:
+            selected = np.zeros(len(self._counts[col]), dtype=bool)
+            selected[codes] = True
+            rows = rows[selected[self._codes[col][rows]]]
+        return rows
+
+    def isin(self, col, values, rows):
+        """Which of the given rows hold one of the values in a column"""
+        selected = np.zeros(len(self._counts[col]), dtype=bool)
+        selected[self._selected_codes(col, values)] = True
+        return selected[self._codes[col][rows]]
+
+def apply_filters(df, filters, expired_models=None, model_col=None,
+                  search_query="", search_index=None, search_mode="substring",
+                  filter_index=None):
+    """Apply column filters, replacement marking and global search.
+
+    ``filters`` maps column name to the selected values; empty selections are
+    ignored. Returns the filtered frame and the rows marked for replacement
+    (taken before the search is applied), or None if nothing is marked.
+    With a ``FilterIndex`` of df covering the filtered columns, the
+    selection is resolved on row positions and materialized once. The
+    filtered frame may be df itself, so callers treat it as read-only.
+    """
+    if filter_index is not None and all(col in filter_index for col, values in filters.items() if values):
+        return _apply_indexed(df, filters, expired_models, model_col, search_query,
+                              search_index, search_mode, filter_index)
+
+    filtered_df = df
+    for col, selected_values in filters.items():
+        if selected_values:
+            filtered_df = filtered_df[filtered_df[col].isin(selected_values)]
+
+    expired_df = None
+    if expired_models and model_col:
+        expired_df = filtered_df[filtered_df[model_col].isin(expired_models)]
+
+    if search_query:
+        if search_index is None:
+            search_index = SearchIndex(df)
+        filtered_df = search_index.filter(filtered_df, search_query, search_mode)
+
+    return filtered_df, expired_df
+
+def _apply_indexed(df, filters, expired_models, model_col, search_query,
+                   search_index, search_mode, filter_index):
+    rows = filter_index.rows(filters)
+
+    marked = marked_rows(filter_index, rows, expired_models, model_col)
+    expired_df = None if marked is None else df.iloc[marked]
+
+    if search_query:
+        if search_index is None:
+            search_index = SearchIndex(df)
+        rows = rows[search_index.search(search_query, search_mode)[rows]]
+
+    if len(rows) == len(df):
+        # Nothing filtered out; hand back df itself rather than a copy
+        return df, expired_df
+    return df.iloc[rows], expired_df
+
+def marked_rows(filter_index, rows, expired_models=None, model_col=None):
+    """Positions among ``rows`` whose model is marked for replacement, or None if nothing is marked"""
+    if not (expired_models and model_col):
+        return None
+    if model_col in filter_index:
+        return rows[filter_index.isin(model_col, expired_models, rows)]
+    return rows[filter_index.df[model_col].iloc[rows].isin(expired_models).to_numpy()]
+
+def filter_rows(filters, filter_index, search_query="", search_index=None, search_mode="substring", rows=None):
+    """Row positions of the view apply_filters returns, or None when no row is left out.
+
+    ``rows`` are the positions passing the column filters, when the caller
+    has already resolved them with ``filter_index.rows``.
+    """
+    if rows is None:
+        rows = filter_index.rows(filters)
+    if search_query:
+        if search_index is None:
+            search_index = SearchIndex(filter_index.df)
+        rows = rows[search_index.search(search_query, search_mode)[rows]]
+    return None if len(rows) == len(filter_index.df) else rows
+
+def make_filter_key(filters, expired_models=None, search_query="", search_mode="substring"):
+    """Hashable summary of the sidebar selection, for memoizing filtered views"""
+    return (
+        tuple((col, tuple(values)) for col, values in filters.items() if values),
+        tuple(expired_models or ()),
+        str(search_query or "").strip().lower(),
+        search_mode,
+    )
@@ -0,0 +1,183 @@
+"""Near-duplicate detection for identifiers such as serial numbers.
+
+Comparing every pair of keys is quadratic, so candidates come from a sorted
+neighbourhood instead: keys are sorted forwards and by their reversed text,
+and each key is only compared with the next few keys in either order. A typo
+near the end of a key keeps it next to the original in the forward order, a
+typo near the start in the reversed one. Candidates are then scored with
+Levenshtein distance in one batch. A typo in the middle of a long key moves
+it away from the original in both orders, so such pairs can be missed when
+many keys share its start and end.
+
+The same module scores misspelled headers against the column vocabulary.
+"""
+from difflib import SequenceMatcher
+from functools import partial
+
+import numpy as np
+
+try:
+    from Levenshtein import distance as levenshtein_distance
+    from Levenshtein import ratio as levenshtein_ratio
+except ImportError:
+    levenshtein_distance = levenshtein_ratio = None
+
+NEAR_DUPLICATE_MAX_DISTANCE = 1
+NEAR_DUPLICATE_MIN_LENGTH = 6
+NEAR_DUPLICATE_MAX_LENGTH = 40
+NEAR_DUPLICATE_WINDOW = 4
+SEQUENCE_MIN_KEYS = 3
+PAIR_CHUNK = 500_000
+
+def similarity(first, second):
+    """Similarity of two strings from 0 to 1"""
+    if levenshtein_ratio is not None:
+        return levenshtein_ratio(first, second)
+    return SequenceMatcher(None, first, second).ratio()
+
+def partial_similarity(text, term):
+    """Best similarity of ``term`` to any window of ``text`` the same length"""
+    if len(text) <= len(term):
+        return similarity(text, term)
+    return max(similarity(text[start:start + len(term)], term)
+               for start in range(len(text) - len(term) + 1))
+
+def char_matrix(keys):
+    """Keys as a zero-padded (keys x characters) integer matrix"""
+    try:
+        fixed = np.array(keys.tolist(), dtype=bytes)
+        dtype = np.uint8
+    except UnicodeEncodeError:
+        fixed = np.array(keys.tolist(), dtype=str)
+        dtype = np.uint32
+    return fixed.view(dtype).reshape(len(keys), -1)
+
+def candidate_pairs(keys, window=NEAR_DUPLICATE_WINDOW):
+    """Index pairs of keys that sit within ``window`` of each other in either sort order.
+
+    Pairs may repeat when two keys are neighbours in both orders.
+    """
+    keys = np.asarray(keys, dtype=str)
+    if len(keys) < 2 or window < 1:
+        return np.empty((0, 2), dtype=np.int64)
+    reversed_keys = np.array([key[::-1] for key in keys.tolist()], dtype=str)
+    batches = []
+    for sort_keys in (keys, reversed_keys):
+        order = np.argsort(sort_keys, kind="stable")
+        for offset in range(1, min(window, len(keys) - 1) + 1):
+            batches.append(np.stack([order[:-offset], order[offset:]], axis=1))
+    return np.sort(np.concatenate(batches), axis=1)
+
+def unique_pairs(pairs, size):
+    """Pairs with repeats removed"""
+    encoded = np.sort(pairs[:, 0] * size + pairs[:, 1])
+    encoded = encoded[np.r_[True, encoded[1:] != encoded[:-1]]] if len(encoded) else encoded
+    return np.stack([encoded // size, encoded % size], axis=1)
+
+def position_mismatches(chars, pairs):
+    """Per pair: characters that differ position by position, whether all of them are digits,
+    and the first position that differs"""
+    mismatches = np.empty(len(pairs), dtype=np.int64)
+    digits_only = np.empty(len(pairs), dtype=bool)
+    first_difference = np.empty(len(pairs), dtype=np.int64)
+    for start in range(0, len(pairs), PAIR_CHUNK):
+        first = chars[pairs[start:start + PAIR_CHUNK, 0]]
+        second = chars[pairs[start:start + PAIR_CHUNK, 1]]
+        differs = first != second
+        digits = (first >= ord("0")) & (first <= ord("9")) & (second >= ord("0")) & (second <= ord("9"))
+        mismatches[start:start + PAIR_CHUNK] = differs.sum(axis=1)
+        digits_only[start:start + PAIR_CHUNK] = ~(differs & ~digits).any(axis=1)
+        first_difference[start:start + PAIR_CHUNK] = differs.argmax(axis=1)
+    return mismatches, digits_only, first_difference
+
+def shared_prefix_counts(chars, order, rows, ends, reach):
+    """Per row of ``chars``: keys sharing its first ``ends`` characters, counting up to ``reach`` either side.
+
+    Keys sharing a prefix are contiguous in sorted ``order``, so only the
+    common prefix lengths of sorted neighbours are compared.
+    """
+    sorted_chars = chars[order]
+    differs = sorted_chars[1:] != sorted_chars[:-1]
+    common = np.where(differs.any(axis=1), differs.argmax(axis=1), chars.shape[1])
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    rank = rank[rows]
+    counts = np.ones(len(rows), dtype=np.int64)
+    for direction in (-1, 1):
+        shared = np.full(len(rows), chars.shape[1], dtype=np.int64)
+        for step in range(1, reach + 1):
+            edge = rank - step if direction < 0 else rank + step - 1
+            inside = (edge >= 0) & (edge < len(common))
+            shared = np.minimum(shared, np.where(inside, common[np.clip(edge, 0, len(common) - 1)], -1))
+            counts += shared >= ends
+    return counts
+
+def near_duplicate_pairs(keys, max_distance=NEAR_DUPLICATE_MAX_DISTANCE,
+                         min_length=NEAR_DUPLICATE_MIN_LENGTH, window=NEAR_DUPLICATE_WINDOW,
+                         skip_numbered=True):
+    """Index pairs of distinct keys within ``max_distance`` edits of each other.
+
+    Keys shorter than ``min_length`` (or too long to be identifiers) are
+    ignored. With ``skip_numbered``, equal-length keys that differ only in
+    digits count as consecutive numbers, not typos, when the text before the
+    first differing digit starts at least ``SEQUENCE_MIN_KEYS`` keys
+    (``WS0001``, ``WS0002``, ``WS0003``); a lone ``SN12345678``/``SN12345679``
+    pair is still reported.
+    """
+    keys = np.asarray(keys, dtype=object)
+    if levenshtein_distance is None or max_distance < 1 or len(keys) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    eligible = np.flatnonzero((lengths >= min_length) & (lengths <= NEAR_DUPLICATE_MAX_LENGTH))
+    if len(eligible) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = eligible[candidate_pairs(keys[eligible], window)]
+    pairs = pairs[np.abs(lengths[pairs[:, 0]] - lengths[pairs[:, 1]]) <= max_distance]
+    pairs = unique_pairs(pairs, len(keys))
+
+    # Position-wise mismatches bound the edit distance from above; for equal
+    # lengths and a single edit they are exact, so most pairs never reach
+    # the Levenshtein scorer.
+    chars = char_matrix(keys[eligible])
+    row_of_key = np.zeros(len(keys), dtype=np.int64)
+    row_of_key[eligible] = np.arange(len(eligible))
+    mismatches, digits_only, first_difference = position_mismatches(chars, row_of_key[pairs])
+    same_length = lengths[pairs[:, 0]] == lengths[pairs[:, 1]]
+    if skip_numbered:
+        numbered = np.flatnonzero(same_length & digits_only)
+        order = np.argsort(np.asarray(keys[eligible], dtype=str), kind="stable")
+        sharing = shared_prefix_counts(chars, order, row_of_key[pairs[numbered, 0]], first_difference[numbered],
+                                       SEQUENCE_MIN_KEYS - 1)
+        keep = np.ones(len(pairs), dtype=bool)
+        keep[numbered] = sharing < SEQUENCE_MIN_KEYS
+        pairs, mismatches, same_length = pairs[keep], mismatches[keep], same_length[keep]
+
+    close = mismatches <= max_distance
+    unsure = ~close if max_distance > 1 else ~close & ~same_length
+    score = partial(levenshtein_distance, score_cutoff=max_distance)
+    distances = np.fromiter(map(score, keys[pairs[unsure, 0]], keys[pairs[unsure, 1]]),
+                            dtype=np.int64, count=int(unsure.sum()))
+    close[unsure] = distances <= max_distance
+    return pairs[close]
+
+def pair_groups(pairs, size):
+    """Group label per key joining every pair transitively; -1 for unpaired keys"""
+    parent = {}
+
+    def find(node):
+        root = parent.setdefault(node, node)
+        while root != parent[root]:
+            root = parent[root]
+        while node != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for a, b in pairs.tolist():
+        parent[find(a)] = find(b)
+
+    labels = np.full(size, -1, dtype=np.int64)
+    roots = {}
+    for node in parent:
+        labels[node] = roots.setdefault(find(node), len(roots))
+    return labels
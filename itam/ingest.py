@@ -0,0 +1,114 @@
+"""Parallel ingestion of several workbooks into one inventory per asset type.
+
+Every selected sheet is parsed in its own worker process with its own
+header detection, asset type detection and column resolution, so loading a
+set of regional workbooks takes about as long as the slowest sheet rather
+than all of them in turn. Sheets of the same asset type are then combined
+into one frame: each resolved field is renamed to the column name the first
+sheet used for it, so "Model" and "Model Name" land in one column, and a
+``SOURCE_COLUMN`` records the workbook and sheet each row came from.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Optional
+
+import pandas as pd
+
+from .columns import ColumnSchema, resolve_schema
+from .loader import concat_chunks, stream_sheet
+
+# Named so it does not clash with a "Source" (procurement source) inventory column
+SOURCE_COLUMN = "Source Workbook"
+# Worker processes are spawned rather than forked: the dashboard server is
+# multi-threaded and a forked copy of its locks can deadlock
+INGEST_START_METHOD = "spawn"
+
+@dataclass
+class IngestedSheet:
+    """One sheet of an uploaded workbook, parsed on its own"""
+    file_name: str
+    sheet_name: str
+    header_row: int = 0
+    asset_type: Optional[str] = None
+    df: Optional[pd.DataFrame] = None
+    schema: Optional[ColumnSchema] = None
+    error: Optional[str] = None
+
+    @property
+    def source(self):
+        return f"{self.file_name} / {self.sheet_name}"
+
+@dataclass
+class CombinedInventory:
+    """Sheets combined per asset type, and the sheets left out"""
+    frames: dict = field(default_factory=dict)
+    sheets: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+
+def ingest_sheet(file_bytes, file_name, sheet_name):
+    """Load a sheet with its own detected header row, asset type and column schema"""
+    sheet = IngestedSheet(file_name, sheet_name)
+    try:
+        chunks = list(stream_sheet(BytesIO(file_bytes), sheet_name))
+    except Exception as e:
+        sheet.error = str(e)
+        return sheet
+    sheet.header_row = int(chunks[0][0])
+    sheet.df = concat_chunks([chunk for _, chunk in chunks])
+    sheet.schema = resolve_schema(sheet.df.columns)
+    sheet.asset_type = sheet.schema.asset_type
+    if sheet.df.empty:
+        sheet.error = "no data rows"
+    elif not sheet.schema["model"]:
+        sheet.error = "no model or product column"
+    return sheet
+
+def ingest_sheets(sources, max_workers=None):
+    """IngestedSheet for each (file name, file bytes, sheet name), in the order given.
+
+    Sheets are parsed in parallel worker processes, at most ``max_workers``
+    (default: the CPU count) at a time; a single sheet is parsed in-process.
+    """
+    sources = list(sources)
+    workers = min(len(sources), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [ingest_sheet(file_bytes, file_name, sheet_name) for file_name, file_bytes, sheet_name in sources]
+    context = multiprocessing.get_context(INGEST_START_METHOD)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(ingest_sheet, file_bytes, file_name, sheet_name)
+                   for file_name, file_bytes, sheet_name in sources]
+        return [future.result() for future in futures]
+
+def combine_sheets(sheets):
+    """One frame per asset type from ingested sheets, their columns aligned by field"""
+    combined = CombinedInventory()
+    groups = {}
+    for sheet in sheets:
+        if sheet.error:
+            combined.skipped.append(sheet)
+        else:
+            combined.sheets.append(sheet)
+            groups.setdefault(sheet.asset_type, []).append(sheet)
+
+    for asset_type, group in groups.items():
+        names = {}
+        for sheet in group:
+            for name, col in sheet.schema.fields.items():
+                if col:
+                    names.setdefault(name, col)
+        frames = []
+        for sheet in group:
+            renames = {col: names[name] for name, col in sheet.schema.fields.items() if col}
+            frame = sheet.df.rename(columns=renames)
+            frame = frame.loc[:, ~frame.columns.duplicated(keep="first")]
+            frames.append(frame.assign(**{SOURCE_COLUMN: sheet.source}))
+        df = pd.concat(frames, ignore_index=True)
+        combined.frames[asset_type] = df[[SOURCE_COLUMN, *df.columns.drop(SOURCE_COLUMN)]]
+    return combined
+
+def ingest_workbooks(sources, max_workers=None):
+    """Parse the given (file name, file bytes, sheet name) sheets in parallel and combine them"""
+    return combine_sheets(ingest_sheets(sources, max_workers))
@@ -0,0 +1,321 @@
+"""Workbook loading, header detection and the parsed-workbook cache.
+
+Sheets are streamed through openpyxl's read-only ``iter_rows`` rather than
+parsed whole by ``pd.read_excel``. The header row is detected from the first
+rows as they arrive, and data rows are gathered into column-wise buffers
+that become a frame every ``STREAM_CHUNK_ROWS`` rows, so the start of a
+large sheet is usable long before its end is read. ``SheetLoad`` runs the
+stream in a background thread.
+"""
+import hashlib
+import threading
+from io import BytesIO
+from itertools import chain, islice
+from operator import itemgetter
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from .cache import LRUCache
+from .columns import keyword_matrix
+
+HEADER_KEYWORDS = ["model", "serial", "user", "department", "asset", "workstation",
+                   "location", "site", "computer", "employee", "email", "product",
+                   "mobile", "programme", "program"]
+HEADER_PREVIEW_ROWS = 15
+STREAM_CHUNK_ROWS = 5_000
+# Cell text read as missing, as pd.read_excel does by default
+NA_STRINGS = frozenset({"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+                        "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+                        "n/a", "nan", "null"})
+WORKBOOK_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+def iter_sheet_rows(excel_file, sheet_name):
+    """Cell values of a sheet row by row, read in openpyxl's read-only mode"""
+    workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        # The stored <dimension> is often stale; read every row and cell actually present
+        sheet.reset_dimensions()
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def read_header_preview(excel_file, sheet_name):
+    """Read the first rows of a sheet for header detection"""
+    return pd.DataFrame(list(islice(iter_sheet_rows(excel_file, sheet_name), HEADER_PREVIEW_ROWS)))
+
+def detect_header_row_from_preview(preview):
+    """Find the header row in a preview of the first rows"""
+    if preview.empty:
+        return 0
+    # Score each distinct cell text once, then count hits per row
+    codes, texts = pd.factorize(preview.astype(str).to_numpy().ravel())
+    cell_hits = keyword_matrix(texts, HEADER_KEYWORDS).any(axis=1)
+    matches = cell_hits[codes].reshape(preview.shape).sum(axis=1)
+    header_rows = np.flatnonzero(matches >= 3)
+    return int(preview.index[header_rows[0]]) if len(header_rows) else 0
+
+def detect_header_row(excel_file, sheet_name):
+    """Auto-detect header row in Excel file"""
+    try:
+        return detect_header_row_from_preview(read_header_preview(excel_file, sheet_name))
+    except:
+        return 0
+
+def header_columns(header):
+    """Positions and cleaned names of the columns a header row defines.
+
+    Names follow ``pd.read_excel``: blank cells become "Unnamed: <n>" and
+    repeated names get a ".<n>" suffix. Names that only differ in
+    surrounding whitespace keep their first column.
+    """
+    values = list(header)
+    while values and values[-1] is None:
+        values.pop()
+    positions, names, seen = [], [], {}
+    for position, value in enumerate(values):
+        name = f"Unnamed: {position}" if value is None else str(value)
+        while name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen[name] = 0
+        name = name.strip()
+        if name not in names:
+            positions.append(position)
+            names.append(name)
+    return positions, names
+
+def column_values(values):
+    """Column from streamed cell values, with NA text as missing and dtypes inferred"""
+    series = pd.Series(values, dtype=object)
+    is_text = series.map(type).to_numpy() == str
+    if is_text.any():
+        series = series.mask(is_text & series.isin(NA_STRINGS).to_numpy())
+    return series.infer_objects()
+
+def chunk_frame(names, rows, start):
+    """Frame of one chunk of buffered rows, indexed by its position in the sheet's data"""
+    buffers = list(zip(*rows)) if rows else [()] * len(names)
+    frame = pd.DataFrame({name: column_values(buffer) for name, buffer in zip(names, buffers)})
+    frame.index = pd.RangeIndex(start, start + len(rows))
+    return frame
+
+def stream_sheet(excel_file, sheet_name, header_row=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Data rows of a sheet as a sequence of frames, each paired with the header row in use.
+
+    With ``header_row`` None the header row is detected from the first
+    ``HEADER_PREVIEW_ROWS`` rows. Blank rows and cells past the last header
+    cell are left out. At least one, possibly empty, frame is produced.
+    """
+    rows = iter_sheet_rows(excel_file, sheet_name)
+    head = list(islice(rows, max(HEADER_PREVIEW_ROWS, (header_row or 0) + 1)))
+    if header_row is None:
+        header_row = detect_header_row_from_preview(pd.DataFrame(head))
+    if header_row >= len(head):
+        yield header_row, pd.DataFrame()
+        return
+
+    positions, names = header_columns(head[header_row])
+    if not names:
+        yield header_row, pd.DataFrame()
+        return
+    width = positions[-1] + 1
+    pick = itemgetter(*positions) if len(names) > 1 else lambda row: (row[positions[0]],)
+    buffered = []
+    start = 0
+    for row in chain(head[header_row + 1:], rows):
+        if len(row) < width:
+            row = row + (None,) * (width - len(row))
+        values = pick(row)
+        if values.count(None) == len(values):
+            continue
+        buffered.append(values)
+        if len(buffered) >= chunk_rows:
+            yield header_row, chunk_frame(names, buffered, start)
+            start += len(buffered)
+            buffered = []
+    if buffered or start == 0:
+        yield header_row, chunk_frame(names, buffered, start)
+
+def concat_chunks(chunks):
+    """One frame from the chunks of a sheet"""
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks) if chunks else pd.DataFrame()
+
+class SheetLoad:
+    """A sheet streaming in a background thread.
+
+    Chunks can be read while the load runs; ``result`` waits for the whole
+    frame. ``on_done`` is called from the loading thread with the header
+    row and the whole frame.
+    """
+
+    def __init__(self, chunks=None, on_done=None, frame=None, header_row=None):
+        self.header_row = header_row
+        self.rows = 0 if frame is None else len(frame)
+        self.error = None
+        self._chunks = []
+        self._frame = frame
+        self._lock = threading.Lock()
+        self._started = threading.Event()
+        self._done = threading.Event()
+        if chunks is None:
+            self._started.set()
+            self._done.set()
+        else:
+            threading.Thread(target=self._run, args=(chunks, on_done), daemon=True).start()
+
+    @classmethod
+    def loaded(cls, frame, header_row):
+        """A load that has already finished"""
+        return cls(frame=frame, header_row=int(header_row))
+
+    def _run(self, chunks, on_done):
+        try:
+            for header_row, chunk in chunks:
+                with self._lock:
+                    self.header_row = header_row
+                    self._chunks.append(chunk)
+                    self.rows += len(chunk)
+                self._started.set()
+            with self._lock:
+                self._frame = concat_chunks(self._chunks)
+                self._chunks = []
+            if on_done is not None:
+                on_done(self.header_row, self._frame)
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self._started.set()
+            self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for the load to finish; False if it is still running after timeout"""
+        return self._done.wait(timeout)
+
+    def wait_header(self):
+        """Header row in use, once the first chunk is read"""
+        self._started.wait()
+        if self.error is not None:
+            raise self.error
+        return self.header_row
+
+    def chunks(self, start=0):
+        """Chunks read so far from position start on; empty once the load has finished"""
+        with self._lock:
+            return self._chunks[start:]
+
+    def result(self):
+        """Whole sheet, shared with the cache; callers add columns to a new frame rather than modify it"""
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self._frame.copy(deep=False)
+
+def hash_file_bytes(file_bytes):
+    """Content hash used to key parsed workbooks"""
+    return hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+
+class WorkbookCache(LRUCache):
+    """LRU cache of parsed workbooks keyed by content hash, sheet and header row.
+
+    Holds sheet names, header rows and loaded sheets so reruns never go
+    back to openpyxl for a workbook that was already parsed. The hit and
+    miss counters cover sheet loads only, one per ``stream_sheet`` call;
+    sheet names and header rows are bookkeeping and not counted. Entries are
+    evicted least-recently-used first once ``max_bytes`` is exceeded. With a
+    ``ColumnarCache`` attached, misses are served from (and written to) disk
+    so other sessions and server restarts skip the XLSX parse as well.
+    """
+
+    def __init__(self, max_bytes=WORKBOOK_CACHE_MAX_BYTES, columnar=None):
+        super().__init__(max_bytes)
+        self.columnar = columnar
+        self._loads = {}
+
+    def sheet_names(self, file_bytes, digest):
+        """Sheet names of the workbook"""
+        def loader():
+            if self.columnar is not None:
+                cached = self.columnar.sheet_names(digest)
+                if cached is not None:
+                    return cached
+            sheet_names = list(pd.ExcelFile(BytesIO(file_bytes), engine='openpyxl').sheet_names)
+            if self.columnar is not None:
+                self.columnar.record_sheet_names(digest, sheet_names)
+            return sheet_names
+        return list(self.get_or_load((digest, "sheets"), loader, count=False))
+
+    def _record_header_row(self, digest, sheet_name, header_row):
+        self.put((digest, sheet_name, "header"), header_row)
+        if self.columnar is not None:
+            self.columnar.record_header_row(digest, sheet_name, header_row)
+
+    def known_header_row(self, digest, sheet_name):
+        """Header row detected earlier for a sheet, or None"""
+        header_row = self.get((digest, sheet_name, "header"), count=False)
+        if header_row is None and self.columnar is not None:
+            header_row = self.columnar.header_row(digest, sheet_name)
+        return header_row
+
+    def detect_header_row(self, file_bytes, digest, sheet_name):
+        """Detected header row of a sheet, read from its first rows unless known already"""
+        header_row = self.known_header_row(digest, sheet_name)
+        if header_row is None:
+            header_row = detect_header_row(BytesIO(file_bytes), sheet_name)
+            self._record_header_row(digest, sheet_name, header_row)
+        return header_row
+
+    def add_sheet(self, digest, sheet_name, header_row, df):
+        """Cache a sheet loaded elsewhere, as if it had been streamed from the workbook"""
+        self.put((digest, sheet_name, int(header_row)), df)
+
+    def stream_sheet(self, file_bytes, digest, sheet_name, header_row=None):
+        """``SheetLoad`` of a sheet, already finished when the sheet is cached.
+
+        With ``header_row`` None the header row detected earlier is used, or
+        else detected from the stream. Calls for a sheet that is still
+        loading share that load instead of starting another. Every call
+        counts one cache hit (sheet in memory) or miss (read from the
+        columnar cache, joined to a running load or streamed).
+        """
+        if header_row is None:
+            header_row = self.known_header_row(digest, sheet_name)
+        if header_row is not None:
+            header_row = int(header_row)
+            cached = self.get((digest, sheet_name, header_row))
+            if cached is not None:
+                return SheetLoad.loaded(cached, header_row)
+        with self._lock:
+            self.misses += 1
+        if header_row is not None and self.columnar is not None:
+            cached = self.columnar.read_sheet(digest, sheet_name, header_row)
+            if cached is not None:
+                self.put((digest, sheet_name, header_row), cached)
+                return SheetLoad.loaded(cached, header_row)
+
+        load_key = (digest, sheet_name, header_row)
+        with self._lock:
+            load = self._loads.get(load_key)
+            if load is not None and load.error is None:
+                return load
+
+            def on_done(detected_row, frame):
+                self.put((digest, sheet_name, detected_row), frame)
+                if header_row is None:
+                    self._record_header_row(digest, sheet_name, detected_row)
+                if self.columnar is not None:
+                    self.columnar.write_sheet(digest, sheet_name, detected_row, frame)
+                with self._lock:
+                    self._loads.pop(load_key, None)
+
+            load = SheetLoad(stream_sheet(BytesIO(file_bytes), sheet_name, header_row), on_done)
+            self._loads[load_key] = load
+        return load
@@ -0,0 +1,101 @@
+"""Server-side paging of the dashboard's tables.
+
+Only the visible page of a table, limited to the chosen columns, is handed
+to ``st.dataframe``, so each rerun serializes one page instead of the whole
+filtered frame. Sort orders are computed once per (column, direction) over
+the full dataset; a filtered view keeps the positions of that order that
+fall in the view, which needs no sort at all.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .compact import frame_memory
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+PAGE_SIZES = (50, 100, 250, 1000)
+DEFAULT_PAGE_SIZE = 100
+
+def page_count(total, page_size):
+    """Number of pages needed for ``total`` rows, at least one"""
+    return max(1, -(-total // page_size))
+
+def sort_order(series, ascending=True):
+    """Row positions that sort a column, missing values last"""
+    values = series.reset_index(drop=True)
+    try:
+        ordered = values.sort_values(ascending=ascending, kind="stable", na_position="last")
+    except TypeError:
+        # Mixed types in one column: order by their text instead
+        text = values.astype(str).where(values.notna())
+        ordered = text.sort_values(ascending=ascending, kind="stable", na_position="last")
+    return ordered.index.to_numpy()
+
+def drop_unused_categories(df):
+    """Frame whose categoricals keep only the categories it uses.
+
+    A slice of a categorical column still carries every category, and Arrow
+    sends them all as the column's dictionary.
+    """
+    categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return df
+    return df.assign(**{col: df[col].cat.remove_unused_categories() for col in categorical})
+
+def transfer_size(df):
+    """Approximate bytes sent to the browser for a frame, as Arrow data"""
+    if pa is not None:
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False).nbytes
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+    return frame_memory(df)
+
+class TablePager:
+    """Pages, sorts and projects the rows of one frame.
+
+    ``rows`` passed to ``page`` selects and orders the rows of the view
+    (None for every row); when the page is sorted, the sort order decides
+    and ``rows`` only selects.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def order(self, col, ascending=True):
+        """Cached sort order of a column over every row"""
+        key = (col, bool(ascending))
+        with self._lock:
+            order = self._orders.get(key)
+        if order is None:
+            order = sort_order(self.df[col], ascending)
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def view_positions(self, rows=None, sort_by=None, ascending=True):
+        """Row positions of the view in display order"""
+        if sort_by is None:
+            return np.arange(len(self.df)) if rows is None else np.asarray(rows)
+        order = self.order(sort_by, ascending)
+        if rows is None:
+            return order
+        in_view = np.zeros(len(self.df), dtype=bool)
+        in_view[rows] = True
+        return order[in_view[order]]
+
+    def page(self, rows=None, page=0, page_size=DEFAULT_PAGE_SIZE, sort_by=None, ascending=True,
+             columns=None):
+        """One page of the view as a frame, and the number of rows in the view"""
+        positions = self.view_positions(rows, sort_by, ascending)
+        start = page * page_size
+        columns = self.df.columns if columns is None else pd.Index(columns)
+        page_df = self.df.iloc[positions[start:start + page_size], self.df.columns.get_indexer(columns)]
+        return drop_unused_categories(page_df), len(positions)
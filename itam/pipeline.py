@@ -0,0 +1,107 @@
+"""End-to-end pipeline: workbook bytes to an enriched inventory"""
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pandas as pd
+
+from .columns import ColumnSchema, resolve_schema
+from .compact import compact_frame
+from .enrich import AGE_BANDS, WARRANTY_TIERS, age_columns, warranty_columns
+from .loader import WorkbookCache, hash_file_bytes
+from .profiling import profile_stage
+from .validation import validate_data
+
+@dataclass
+class Inventory:
+    """A loaded and enriched asset sheet"""
+    df: pd.DataFrame
+    asset_type: str
+    model_col: Optional[str]
+    type_col: Optional[str]
+    expired_warranty_df: Optional[pd.DataFrame] = None
+    sheet_name: Optional[str] = None
+    header_row: int = 0
+    digest: Optional[str] = None
+    issues: list = field(default_factory=list)
+    schema: Optional[ColumnSchema] = None
+    memory: Optional[dict] = None
+
+def enable_copy_on_write():
+    """Turn on pandas copy-on-write, the default from pandas 3.
+
+    Enriched frames, filtered views and the workbook cache share column
+    data; copy-on-write copies a column only when something writes to it.
+    """
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+def read_file_bytes(source):
+    """Raw bytes of a workbook given as a path, file-like object or bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    source.seek(0)
+    return source.read()
+
+def enrich_inventory(df, asset_type=None, compact=True, age_bands=AGE_BANDS):
+    """Detect asset type and key columns, then add age, lifecycle band and warranty columns.
+
+    The derived columns are computed once and added to a new frame in a
+    single step; df itself is never modified, and under copy-on-write the
+    new frame shares the loaded columns instead of copying them. With
+    ``compact`` the enriched frame is converted to compact dtypes and the
+    memory saved is reported in ``Inventory.memory``.
+    """
+    schema = resolve_schema(df.columns, asset_type)
+    asset_type = schema.asset_type
+
+    with profile_stage("age_columns"):
+        derived = age_columns(df, age_bands, schema=schema)
+    if asset_type == "Workstation":
+        with profile_stage("warranty_columns"):
+            derived.update(warranty_columns(df, schema=schema))
+    df = df.assign(**derived)
+
+    memory = None
+    if compact:
+        with profile_stage("compact_frame"):
+            df, memory = compact_frame(df)
+
+    expired_warranty_df = None
+    if "Warranty Status" in derived:
+        expired_warranty_df = df[df["Warranty Status"] == WARRANTY_TIERS[0][0]]
+
+    return Inventory(df=df, asset_type=asset_type, model_col=schema["model"],
+                     type_col=schema["type"], expired_warranty_df=expired_warranty_df,
+                     schema=schema, memory=memory)
+
+def load_inventory(source, sheet_name=None, header_row=None, cache=None, validate=True):
+    """Load one sheet of a workbook and run enrichment and validation.
+
+    ``sheet_name`` defaults to the first sheet and ``header_row`` to the
+    detected header row. Pass a shared ``WorkbookCache`` to reuse parsed
+    workbooks across calls.
+    """
+    file_bytes = read_file_bytes(source)
+    digest = hash_file_bytes(file_bytes)
+    cache = cache if cache is not None else WorkbookCache()
+
+    if sheet_name is None:
+        sheet_name = cache.sheet_names(file_bytes, digest)[0]
+
+    with profile_stage("load_sheet"):
+        load = cache.stream_sheet(file_bytes, digest, sheet_name, header_row)
+        df = load.result()
+    with profile_stage("enrich_inventory"):
+        inventory = enrich_inventory(df)
+    inventory.sheet_name = sheet_name
+    inventory.header_row = int(load.header_row)
+    inventory.digest = digest
+    if validate and inventory.model_col:
+        with profile_stage("validate_data"):
+            inventory.issues = validate_data(inventory.df, inventory.asset_type, inventory.model_col,
+                                             schema=inventory.schema)
+    return inventory
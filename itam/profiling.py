@@ -0,0 +1,175 @@
+"""Opt-in timing of pipeline stages and dashboard sections.
+
+Profiling is off unless ``ITAM_PROFILE`` is set: ``1`` times every
+instrumented stage, ``memory`` also traces Python allocations with
+tracemalloc (slower, and process-wide, so a dashboard server's other
+sessions show up in the numbers too). A ``Profiler`` covers one run, a
+dashboard rerun or one sheet of a batch report. While it is active,
+``profile_stage`` blocks in the package and the app record their wall time
+nested under the stage they run in, and cached stages note whether they
+were built or reused. With no active profiler every stage is a no-op.
+
+Finished runs are written as one JSON object per line on the
+``itam.profile`` logger: to the file named by ``ITAM_PROFILE_LOG``, or to
+standard error when that is unset.
+"""
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+PROFILE_ENV = "ITAM_PROFILE"
+PROFILE_LOG_ENV = "ITAM_PROFILE_LOG"
+PROFILE_LOGGER = "itam.profile"
+MEMORY_PROFILE = "memory"
+OFF_VALUES = ("", "0", "false", "no", "off")
+
+_active = contextvars.ContextVar("itam_profiler", default=None)
+_logger_lock = threading.Lock()
+
+def profile_mode():
+    """None when profiling is off, "memory" with allocation tracing, "time" otherwise"""
+    value = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if value in OFF_VALUES:
+        return None
+    return MEMORY_PROFILE if value == MEMORY_PROFILE else "time"
+
+def profile_logger():
+    """The itam.profile logger, given its JSON-lines handler on first use"""
+    logger = logging.getLogger(PROFILE_LOGGER)
+    with _logger_lock:
+        if not logger.handlers:
+            path = os.environ.get(PROFILE_LOG_ENV)
+            handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+    return logger
+
+class Profiler:
+    """Stage timings, cache use and allocations of one run"""
+
+    def __init__(self, run, memory=False, **fields):
+        self.run = run
+        self.fields = fields
+        self.memory = memory
+        self.stages = []
+        self.caches = {}
+        self._stack = []
+        self._misses = set()
+        self._token = None
+        self.started = time.time()
+        self._start = time.perf_counter()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_env(cls, run, **fields):
+        """Profiler configured by ITAM_PROFILE, or None when profiling is off"""
+        mode = profile_mode()
+        if mode is None:
+            return None
+        return cls(run, memory=mode == MEMORY_PROFILE, **fields)
+
+    def activate(self):
+        """Make this the profiler that profile_stage records into, in the current thread"""
+        self._token = _active.set(self)
+        return self
+
+    def _note_peak(self, peak):
+        if self._stack:
+            self._stack[-1]["_peak"] = max(self._stack[-1]["_peak"], peak)
+
+    @contextmanager
+    def stage(self, name, cached=False):
+        """Time a block as a stage nested in the open one; yields its record for extra fields"""
+        record = {"stage": name, "depth": len(self._stack)}
+        self.stages.append(record)
+        if self.memory:
+            # tracemalloc keeps one peak, so each stage restarts it and hands
+            # the highest value seen back to its parent on exit
+            current, peak = tracemalloc.get_traced_memory()
+            self._note_peak(peak)
+            tracemalloc.reset_peak()
+            record["_start_bytes"] = record["_peak"] = current
+        self._stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self._stack.pop()
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, record.pop("_peak"))
+                start_bytes = record.pop("_start_bytes")
+                record["allocated_bytes"] = current - start_bytes
+                record["peak_bytes"] = peak - start_bytes
+                self._note_peak(peak)
+            if cached:
+                record["cache"] = "miss" if name in self._misses else "hit"
+                self._misses.discard(name)
+                counts = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+                counts["misses" if record["cache"] == "miss" else "hits"] += 1
+
+    def cache_miss(self, name):
+        """Note that the cached stage of this name was built rather than reused"""
+        self._misses.add(name)
+
+    def cache_stats(self, name, stats):
+        """Counters of a shared cache (see LRUCache.stats), as of this run"""
+        self.caches[name] = dict(stats)
+
+    def finish(self, **fields):
+        """Close the run, log it as one JSON line and return the record"""
+        if self._token is not None:
+            _active.reset(self._token)
+            self._token = None
+        record = {
+            "run": self.run,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "seconds": time.perf_counter() - self._start,
+            **self.fields,
+            **fields,
+            "stages": self.stages,
+            "caches": self.caches,
+        }
+        if self.memory:
+            record["traced_bytes"], record["traced_peak_bytes"] = tracemalloc.get_traced_memory()
+        profile_logger().info(json.dumps(record, default=str))
+        return record
+
+def active_profiler():
+    """Profiler of the current run, or None"""
+    return _active.get()
+
+def profile_stage(name, cached=False):
+    """Stage of the active profiler, or a no-op block yielding a throwaway record"""
+    profiler = _active.get()
+    return nullcontext({}) if profiler is None else profiler.stage(name, cached)
+
+def record_cache_miss(name):
+    """Called from a cached function's body: the cached stage of this name was built"""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.cache_miss(name)
+
+def profiled(run, func, **fields):
+    """func, logged as a run of its own each time it is called while profiling is on"""
+    if profile_mode() is None:
+        return func
+
+    def call(*args, **kwargs):
+        profiler = Profiler.from_env(run, **fields).activate()
+        try:
+            with profiler.stage(run):
+                return func(*args, **kwargs)
+        finally:
+            profiler.finish()
+    return call
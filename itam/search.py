@@ -0,0 +1,96 @@
+"""Per-dataset full-text search index"""
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+SEARCH_FIELD_SEPARATOR = "\x1f"
+SEARCH_CACHED_QUERIES = 64
+
+class SearchIndex:
+    """Lowercase text of every row, searchable by substring or word prefix.
+
+    Built once per loaded dataset. Each row is flattened into one string with
+    its fields separated so a query never matches across two cells. Query
+    results are memoized, and a query that extends an earlier one only
+    re-checks the rows the earlier query matched.
+    """
+
+    def __init__(self, df, max_cached_queries=SEARCH_CACHED_QUERIES):
+        self.index = df.index
+        self.max_cached_queries = max_cached_queries
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+        text = None
+        for col in df.columns:
+            values = df[col].astype(str).str.lower().str.replace("\n", " ", regex=False)
+            values = values.where(df[col].notna(), "")
+            text = values if text is None else text + SEARCH_FIELD_SEPARATOR + values
+        self._rows = text.tolist() if text is not None else [""] * len(df)
+
+        lengths = np.fromiter(map(len, self._rows), dtype=np.int64, count=len(self._rows)) + 1
+        self._starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        self._text = "\n".join(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    @staticmethod
+    def _pattern(query, mode):
+        if mode == "prefix":
+            return re.compile(r"(?<![0-9a-z])" + re.escape(query))
+        return re.compile(re.escape(query))
+
+    def _candidates(self, query, mode):
+        """Smallest earlier result that must contain every match of query"""
+        best = None
+        with self._lock:
+            for (cached_query, cached_mode), rows in self._results.items():
+                if cached_mode != mode:
+                    continue
+                narrower = query.startswith(cached_query) if mode == "prefix" else cached_query in query
+                if narrower and (best is None or len(rows) < len(best)):
+                    best = rows
+        if best is not None and len(best) * 10 <= len(self._rows):
+            return best
+        return None
+
+    def search_rows(self, query, mode="substring"):
+        """Positions of the rows matching the query"""
+        query = str(query).strip().lower()
+        if not query:
+            return np.arange(len(self._rows))
+
+        key = (query, mode)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        pattern = self._pattern(query, mode)
+        candidates = self._candidates(query, mode)
+        if candidates is not None:
+            rows_text = self._rows
+            rows = np.array([r for r in candidates if pattern.search(rows_text[r])], dtype=np.int64)
+        else:
+            positions = np.fromiter((m.start() for m in pattern.finditer(self._text)), dtype=np.int64)
+            rows = np.unique(np.searchsorted(self._starts, positions, side='right') - 1)
+
+        with self._lock:
+            self._results[key] = rows
+            while len(self._results) > self.max_cached_queries:
+                self._results.popitem(last=False)
+        return rows
+
+    def search(self, query, mode="substring"):
+        """Boolean mask over the indexed rows matching the query"""
+        mask = np.zeros(len(self._rows), dtype=bool)
+        mask[self.search_rows(query, mode)] = True
+        return mask
+
+    def filter(self, df, query, mode="substring"):
+        """Rows of df, a subset of the indexed frame, matching the query"""
+        positions = self.index.get_indexer(df.index)
+        return df[self.search(query, mode)[positions]]
@@ -0,0 +1,229 @@
+"""Snapshot store of processed inventories and diffs between uploads.
+
+A snapshot keeps one row per asset, keyed by its asset tag (or serial
+number when the sheet has no tag column), with the tracked fields stored
+under their logical names so renamed headers still line up, and a 64-bit
+hash of each row. Two snapshots are compared with a hash join on the key;
+only rows whose hash differs are compared field by field, and only those
+rows and the new ones need validating again. Snapshots are Feather files
+listed in a JSON index, grouped in series (one per asset type by default);
+the trend rollups of a series' snapshots (see ``itam.trends``) are kept in
+one more Feather file beside them.
+The store is opt-in: it is only used when ``ITAM_SNAPSHOT_DIR`` is set.
+"""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .columnar import feather, pa, write_atomic
+from .trends import ROLLUP_COLUMNS
+
+SNAPSHOT_DIR_ENV = "ITAM_SNAPSHOT_DIR"
+SNAPSHOT_INDEX = "snapshots.json"
+ROLLUP_FILE = "rollups.feather"
+# Fields tried in order for the asset key
+KEY_FIELDS = ("asset_tag", "serial")
+TRACKED_FIELDS = ("asset_tag", "serial", "model", "type", "user", "email", "department", "location",
+                  "place", "site", "state", "status", "programme", "warranty_expiry",
+                  "year_of_purchase", "purchase_date")
+# Kinds of change reported, by the fields that make them up
+CHANGE_KINDS = (
+    ("Reassigned", ("user", "email", "department")),
+    ("Relocated", ("location", "place", "site")),
+    ("Warranty Changed", ("warranty_expiry",)),
+    ("Status Changed", ("state", "status")),
+)
+KEY_COLUMN = "_key"
+HASH_COLUMN = "_row_hash"
+ROW_COLUMN = "_row"
+
+def field_text(series):
+    """Column as an array of stripped text, missing values as empty strings"""
+    # Formatted once per distinct value rather than once per row
+    codes, uniques = pd.factorize(series)
+    text = np.array([str(value).strip() for value in np.asarray(uniques, dtype=object)] + [""], dtype=object)
+    return text[codes]
+
+def asset_keys(df, schema):
+    """Upper-cased asset tag (or serial) of every row, numbered when repeated; None for blank keys"""
+    key_col = next((schema[name] for name in KEY_FIELDS if schema[name]), None)
+    if key_col is None:
+        return None
+    keys = pd.Series(field_text(df[key_col])).str.upper()
+    # Repeated keys become KEY, KEY#2, KEY#3... so every key is unique
+    occurrence = keys.groupby(keys, sort=False).cumcount().to_numpy()
+    keys = keys.where(occurrence == 0, keys + "#" + (occurrence + 1).astype(str))
+    return keys.where(keys != "")
+
+def row_hashes(frame, fields):
+    """64-bit hash of each row over the given fields"""
+    return pd.util.hash_pandas_object(frame[list(fields)], index=False).to_numpy()
+
+def snapshot_frame(df, schema):
+    """Key, tracked fields and row hash of every keyed row, or None without a key column.
+
+    The frame is indexed by row position in df; rows with a blank key are
+    left out.
+    """
+    keys = asset_keys(df, schema)
+    if keys is None:
+        return None
+    fields = {name: field_text(df[schema[name]]) for name in TRACKED_FIELDS if schema[name]}
+    frame = pd.DataFrame({KEY_COLUMN: keys.to_numpy(), **fields})
+    frame[HASH_COLUMN] = row_hashes(frame, fields)
+    return frame[frame[KEY_COLUMN].notna().to_numpy()]
+
+@dataclass
+class SnapshotDiff:
+    """What changed between an older and a newer snapshot"""
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    changes: pd.DataFrame
+    changed_rows: np.ndarray
+    unchanged: int = 0
+    kinds: dict = field(default_factory=dict)
+
+    @property
+    def changed(self):
+        """Number of assets with at least one changed field"""
+        return self.changes["Asset"].nunique() if len(self.changes) else 0
+
+def change_kind(field_name):
+    """Kind of change a field belongs to"""
+    for kind, fields in CHANGE_KINDS:
+        if field_name in fields:
+            return kind
+    return "Other"
+
+def diff_snapshots(old, new):
+    """Assets added, removed and changed from old to new, joined on their keys.
+
+    ``changed_rows`` holds the row positions, in the dataset new was taken
+    from, of assets that are new or changed.
+    """
+    fields = [col for col in new.columns if col in old.columns and col not in (KEY_COLUMN, HASH_COLUMN)]
+    old_hash, new_hash = old[HASH_COLUMN].to_numpy(), new[HASH_COLUMN].to_numpy()
+    if list(old.columns) != list(new.columns):
+        # Hashes only agree over the same fields
+        old_hash, new_hash = row_hashes(old, fields), row_hashes(new, fields)
+
+    match = pd.Index(old[KEY_COLUMN]).get_indexer(new[KEY_COLUMN])
+    in_old = match >= 0
+    kept = np.zeros(len(old), dtype=bool)
+    kept[match[in_old]] = True
+
+    matched = np.flatnonzero(in_old)
+    differs = old_hash[match[matched]] != new_hash[matched]
+    changed_new = matched[differs]
+    changed_old = match[changed_new]
+
+    keys = new[KEY_COLUMN].to_numpy()[changed_new]
+    records = []
+    for name in fields:
+        before = old[name].to_numpy()[changed_old]
+        after = new[name].to_numpy()[changed_new]
+        mask = before != after
+        if mask.any():
+            records.append(pd.DataFrame({"Asset": keys[mask], "Field": name, "Kind": change_kind(name),
+                                         "Before": before[mask], "After": after[mask]}))
+    changes = (pd.concat(records, ignore_index=True) if records
+               else pd.DataFrame(columns=["Asset", "Field", "Kind", "Before", "After"]))
+
+    kinds = {kind: int(count) for kind, count in changes.groupby("Kind", sort=False)["Asset"].nunique().items()}
+    changed_rows = np.sort(np.concatenate([new.index.to_numpy()[~in_old], new.index.to_numpy()[changed_new]]))
+    return SnapshotDiff(added=new[~in_old], removed=old[~kept], changes=changes, changed_rows=changed_rows,
+                        unchanged=int(len(matched) - len(changed_new)), kinds=kinds)
+
+class SnapshotStore:
+    """Directory of snapshot Feather files and an index of them per series"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Store configured by ITAM_SNAPSHOT_DIR, or None if unset or pyarrow is missing"""
+        directory = os.environ.get(SNAPSHOT_DIR_ENV)
+        if not directory or feather is None:
+            return None
+        return cls(directory)
+
+    def read_index(self):
+        """Snapshots recorded per series, oldest first"""
+        try:
+            with open(self.directory / SNAPSHOT_INDEX, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def snapshots(self, series):
+        """Index entries of one series, oldest first"""
+        return self.read_index().get(series, [])
+
+    def _series_dir(self, series):
+        return self.directory / hashlib.blake2b(series.encode("utf-8"), digest_size=8).hexdigest()
+
+    def _snapshot_file(self, series, snapshot_id):
+        return self._series_dir(series) / f"{snapshot_id}.feather"
+
+    def save(self, series, frame, digest, source, rollups=None):
+        """Record a snapshot unless this digest and source are already in the series; returns its entry.
+
+        ``rollups`` (from ``itam.trends.inventory_rollups``) are appended to
+        the series' rollup table under the new snapshot's id and date.
+        """
+        with self._lock:
+            index = self.read_index()
+            entries = index.setdefault(series, [])
+            for entry in entries:
+                if entry["digest"] == digest and entry["source"] == source:
+                    return entry
+
+            taken = pd.Timestamp.now()
+            entry = {
+                "id": f"{taken.strftime('%Y%m%dT%H%M%S')}-{digest[:8]}",
+                "digest": digest,
+                "source": source,
+                "taken": taken.isoformat(timespec="seconds"),
+                "rows": len(frame),
+            }
+            table = pa.Table.from_pandas(frame.rename_axis(ROW_COLUMN).reset_index(), preserve_index=False)
+            write_atomic(self._snapshot_file(series, entry["id"]),
+                         lambda tmp: feather.write_feather(table, tmp, compression="uncompressed"))
+            if rollups is not None:
+                self._append_rollups(series, rollups.assign(Snapshot=entry["id"], Taken=entry["taken"]))
+            entries.append(entry)
+
+            def write(path):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(index, f, indent=1)
+            write_atomic(self.directory / SNAPSHOT_INDEX, write)
+            return entry
+
+    def _append_rollups(self, series, rollups):
+        stored = self.rollups(series)
+        rollups = rollups[ROLLUP_COLUMNS]
+        if len(stored):
+            rollups = pd.concat([stored, rollups], ignore_index=True)
+        table = pa.Table.from_pandas(rollups, preserve_index=False)
+        write_atomic(self._series_dir(series) / ROLLUP_FILE,
+                     lambda tmp: feather.write_feather(table, tmp, compression="uncompressed"))
+
+    def rollups(self, series):
+        """Trend rollups of every snapshot of a series, oldest first"""
+        try:
+            return feather.read_table(self._series_dir(series) / ROLLUP_FILE).to_pandas()
+        except (OSError, pa.ArrowInvalid):
+            return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    def load(self, series, snapshot_id):
+        """Snapshot frame of an index entry, indexed by row position"""
+        frame = feather.read_table(self._snapshot_file(series, snapshot_id)).to_pandas()
+        return frame.set_index(ROW_COLUMN).rename_axis(None)
@@ -0,0 +1,74 @@
+"""Historical trends over stored snapshots, served from precomputed rollups.
+
+When a snapshot is recorded, its enriched inventory is reduced to a small
+rollup table: the number of assets and their age totals per warranty
+status, lifecycle band, model and department. The rollups of every snapshot
+of a series are kept together in the snapshot store, so trend views only
+pivot a few hundred rows per snapshot over the snapshot dates; a year of
+weekly snapshots is charted without reading a workbook or a snapshot frame.
+"""
+import numpy as np
+import pandas as pd
+
+# Rollups as (name, enriched column or schema field); fields are resolved per dataset
+ROLLUPS = (("warranty", "Warranty Status"), ("age_band", "Age Category"), ("model", "model"),
+           ("department", "department"))
+TOTAL_ROLLUP = "total"
+ROLLUP_COLUMNS = ["Snapshot", "Taken", "Rollup", "Group", "Assets", "Age Sum", "Aged Assets"]
+TREND_PERIODS = {"Snapshot": None, "Month": "M"}
+OTHER_GROUP = "Other"
+
+def rollup_column(df, schema, source):
+    """Column of df a rollup groups by, or None if the dataset has none"""
+    col = schema[source] if source in schema.fields else source
+    return col if col and col in df.columns else None
+
+def inventory_rollups(df, schema):
+    """Assets, age total and assets of known age per group of every rollup, plus a total row"""
+    age = df["Asset Age"].to_numpy(dtype="float64", na_value=0) if "Asset Age" in df.columns else np.zeros(len(df))
+    aged = age > 0
+    values = pd.DataFrame({"Assets": np.ones(len(df), dtype="int64"), "Age Sum": np.where(aged, age, 0.0),
+                           "Aged Assets": aged.astype("int64")})
+
+    frames = [pd.DataFrame({"Rollup": [TOTAL_ROLLUP], "Group": ["All"], "Assets": [len(df)],
+                            "Age Sum": [values["Age Sum"].sum()], "Aged Assets": [int(aged.sum())]})]
+    for rollup, source in ROLLUPS:
+        col = rollup_column(df, schema, source)
+        if col is None:
+            continue
+        groups = values.groupby(df[col].to_numpy(), sort=False, dropna=True).sum()
+        frames.append(pd.DataFrame({"Rollup": rollup, "Group": groups.index.astype(str),
+                                    **{name: groups[name].to_numpy() for name in groups.columns}}))
+    return pd.concat(frames, ignore_index=True)
+
+def rollup_trend(rollups, rollup, value="Assets", period=None, top=None):
+    """Snapshot date x group table of one rollup.
+
+    ``value`` is "Assets" or "Average Age". With ``period`` ("M" for month)
+    the last snapshot of every period stands for it; with ``top`` only the
+    groups largest in the latest snapshot are kept, the rest summed into
+    ``OTHER_GROUP`` (asset counts only).
+    """
+    rows = rollups[rollups["Rollup"] == rollup]
+    if rows.empty:
+        return pd.DataFrame()
+    rows = rows.assign(Taken=pd.to_datetime(rows["Taken"]))
+
+    def pivot(column):
+        table = rows.pivot_table(index="Taken", columns="Group", values=column, aggfunc="sum",
+                                 fill_value=0, sort=False)
+        table = table.sort_index().rename_axis(columns=None)
+        if period:
+            table = table.groupby(table.index.to_period(period)).last()
+            table.index = table.index.to_timestamp().rename("Taken")
+        return table
+
+    counts = pivot("Assets").astype("int64")
+    table = pivot("Age Sum") / pivot("Aged Assets").replace(0, np.nan) if value == "Average Age" else counts
+    if top and table.shape[1] > top:
+        latest = counts.iloc[-1].sort_values(ascending=False, kind="stable")
+        kept, rest = list(latest.index[:top]), latest.index[top:]
+        table = table[kept]
+        if value != "Average Age":
+            table = table.assign(**{OTHER_GROUP: counts[rest].sum(axis=1)})
+    return table
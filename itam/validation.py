@@ -0,0 +1,231 @@
+"""Data quality checks on a loaded inventory.
+
+Every check works on integer key codes from ``pd.factorize`` (one hash pass
+per column), so duplicate groups, counts and ordering come from ``bincount``
+over the codes instead of repeated ``duplicated``/``unique``/``sort_values``
+passes over the frame. Issues keep the flagged row positions; the report
+slices the frame only when an issue's rows are displayed.
+"""
+import numpy as np
+import pandas as pd
+
+from .columns import resolve_schema
+from .dates import unparseable_date_rows
+from .fuzzy import (
+    NEAR_DUPLICATE_MAX_DISTANCE,
+    NEAR_DUPLICATE_MIN_LENGTH,
+    NEAR_DUPLICATE_WINDOW,
+    near_duplicate_pairs,
+    pair_groups,
+)
+
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+
+class ValidationReport(list):
+    """List of issues that also knows how to show each issue's rows"""
+
+    def __init__(self, df, issues=()):
+        super().__init__(issues)
+        self.df = df
+
+    def data(self, issue):
+        """Flagged rows of an issue, limited to its display columns"""
+        columns = self.df.columns.get_indexer(issue["columns"])
+        return self.df.iloc[issue["rows"], columns]
+
+def key_codes(values):
+    """Factorized codes and uniques of a column; missing values get code -1"""
+    return pd.factorize(values, sort=False)
+
+def per_row(table, codes, missing=0):
+    """Look up a per-code table for every row; code -1 reads ``missing``"""
+    return np.append(table, missing)[codes]
+
+def normalized_keys(uniques):
+    """Upper-cased form of each distinct key with all whitespace removed"""
+    return np.array(["".join(str(key).split()).upper() for key in uniques], dtype=object)
+
+def sorted_rows(rows, codes, uniques):
+    """Row positions ordered by key value, falling back to first appearance"""
+    group_codes = np.unique(codes[rows])
+    try:
+        order = np.argsort(np.asarray(uniques)[group_codes], kind="stable")
+    except TypeError:
+        order = np.arange(len(group_codes))
+    rank = np.empty(len(uniques), dtype=np.int64)
+    rank[group_codes[order]] = np.arange(len(group_codes))
+    return rows[np.argsort(rank[codes[rows]], kind="stable")]
+
+def duplicate_issues(df, col, label, short_label, display_cols, near_duplicates, keep=None):
+    """Exact, case/whitespace-variant and near duplicates of one identifier column.
+
+    Keys are compared across the whole frame; with ``keep`` (a boolean row
+    mask) only the kept rows are reported, and counts cover their groups.
+    """
+    issues = []
+    codes, uniques = key_codes(df[col])
+
+    def kept(rows, group_of_row):
+        if keep is None:
+            return rows, None
+        rows = rows[keep[rows]]
+        return rows, len(np.unique(group_of_row[rows]))
+
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    rows, duplicate_count = kept(np.flatnonzero(per_row(counts, codes) > 1), codes)
+    if len(rows):
+        if duplicate_count is None:
+            duplicate_count = int((counts > 1).sum())
+        issues.append({
+            "type": f"Duplicate {label}s",
+            "count": duplicate_count,
+            "details": f"Found {duplicate_count} duplicate {label.lower()}s",
+            "severity": "high",
+            "rows": sorted_rows(rows, codes, uniques),
+            "columns": display_cols,
+        })
+
+    # Distinct keys that collide once case and spacing are ignored. Only keys
+    # that normalization changes can collide, so most sheets stop at the compare.
+    keys = normalized_keys(uniques)
+    changed = np.flatnonzero(keys != np.asarray(pd.Index(uniques).astype(str), dtype=object))
+    rows = np.empty(0, dtype=np.int64)
+    if len(changed):
+        involved = np.flatnonzero(pd.Index(keys).isin(keys[changed]) & (keys != ""))
+        key_of_unique = np.full(len(uniques), -1, dtype=np.int64)
+        key_of_unique[involved] = pd.factorize(keys[involved])[0]
+        variants = np.bincount(key_of_unique[involved], minlength=len(involved))
+        rows, variant_count = kept(np.flatnonzero(per_row(per_row(variants, key_of_unique), codes) > 1),
+                                   per_row(key_of_unique, codes, missing=-1))
+    if len(rows):
+        if variant_count is None:
+            variant_count = int((variants > 1).sum())
+        rows = rows[np.argsort(keys[codes[rows]], kind="stable")]
+        issues.append({
+            "type": f"Inconsistent {label}s",
+            "count": variant_count,
+            "details": f"Found {variant_count} {label.lower()}s that differ only by case or spacing",
+            "severity": "medium",
+            "rows": rows,
+            "columns": display_cols,
+        })
+
+    # Distinct keys a few edits apart, e.g. a mistyped character
+    distinct_of_unique, distinct = pd.factorize(keys)
+    pairs = near_duplicate_pairs(distinct, **near_duplicates)
+    if len(pairs):
+        groups = pair_groups(pairs, len(distinct))
+        group_of_row = per_row(groups[distinct_of_unique], codes, missing=-1)
+        rows, group_count = kept(np.flatnonzero(group_of_row >= 0), group_of_row)
+        if len(rows):
+            rows = rows[np.argsort(keys[codes[rows]], kind="stable")]
+            rows = rows[np.argsort(group_of_row[rows], kind="stable")]
+            if group_count is None:
+                group_count = int(groups.max()) + 1
+            max_distance = near_duplicates["max_distance"]
+            issues.append({
+                "type": f"Possible Duplicate {short_label}s",
+                "count": group_count,
+                "details": f"Found {group_count} groups of {label.lower()}s within "
+                           f"{max_distance} character edit{'s' if max_distance > 1 else ''} of each other "
+                           f"(each is compared with its neighbours in sorted order, so a typo in the middle "
+                           f"of a long {label.lower()} can go unnoticed)",
+                "severity": "medium",
+                "rows": rows,
+                "columns": display_cols,
+            })
+    return issues
+
+def validate_data(df, asset_type, model_col, schema=None,
+                  max_distance=NEAR_DUPLICATE_MAX_DISTANCE, min_length=NEAR_DUPLICATE_MIN_LENGTH,
+                  window=NEAR_DUPLICATE_WINDOW, skip_numbered=True, rows=None):
+    """Validate data and return list of issues.
+
+    ``max_distance``, ``min_length``, ``window`` and ``skip_numbered`` tune
+    near-duplicate detection of tags and serials (see near_duplicate_pairs);
+    ``max_distance=0`` turns it off. With ``rows`` (row positions) only
+    issues on those rows are reported: the per-row checks look at them
+    alone, while tags and serials are still compared against the whole
+    frame. Issue rows are positions in df.
+    """
+    issues = ValidationReport(df)
+    near_duplicates = {"max_distance": max_distance, "min_length": min_length, "window": window,
+                       "skip_numbered": skip_numbered}
+    keep = None
+    checked = df
+    if rows is not None:
+        rows = np.asarray(rows, dtype=np.int64)
+        keep = np.zeros(len(df), dtype=bool)
+        keep[rows] = True
+        checked = df.iloc[rows]
+
+    def frame_rows(positions):
+        return positions if rows is None else rows[positions]
+
+    schema = schema or resolve_schema(df.columns, asset_type)
+    asset_tag_col = schema["asset_tag"]
+    serial_col = schema["serial"]
+    user_col = schema["user"]
+    email_col = schema["email"]
+    dept_col = schema["department"]
+
+    # Check duplicates
+    if asset_tag_col:
+        display_cols = [c for c in [asset_tag_col, model_col, serial_col, user_col] if c]
+        issues.extend(duplicate_issues(df, asset_tag_col, "Asset Tag", "Asset Tag", display_cols,
+                                       near_duplicates, keep))
+
+    if serial_col:
+        display_cols = [c for c in [serial_col, model_col, asset_tag_col, user_col] if c]
+        issues.extend(duplicate_issues(df, serial_col, "Serial Number", "Serial", display_cols,
+                                       near_duplicates, keep))
+
+    # Check missing data
+    if user_col:
+        users = checked[user_col]
+        missing_users = frame_rows(np.flatnonzero((users.isna() | (users == "")).to_numpy()))
+        if len(missing_users):
+            display_cols = [c for c in [asset_tag_col, model_col, serial_col, dept_col] if c]
+            issues.append({
+                "type": "Missing User Assignment",
+                "count": len(missing_users),
+                "details": f"{len(missing_users)} assets without assigned users",
+                "severity": "medium",
+                "rows": missing_users,
+                "columns": display_cols,
+            })
+
+    # Check invalid emails, matching each distinct address once
+    if email_col:
+        codes, uniques = key_codes(checked[email_col])
+        valid = pd.Index(uniques).astype(str).str.match(EMAIL_PATTERN)
+        invalid_emails = frame_rows(np.flatnonzero(~per_row(np.asarray(valid, dtype=bool), codes, missing=True)))
+        if len(invalid_emails):
+            display_cols = [c for c in [user_col, email_col, asset_tag_col, model_col] if c]
+            issues.append({
+                "type": "Invalid Email Format",
+                "count": len(invalid_emails),
+                "details": f"{len(invalid_emails)} invalid email addresses",
+                "severity": "low",
+                "rows": invalid_emails,
+                "columns": display_cols,
+            })
+
+    # Check date cells that are neither dates, Excel serials nor text in a known format
+    for field, label in (("warranty_expiry", "Warranty Expiry Dates"), ("purchase_date", "Purchase Dates")):
+        date_col = schema[field]
+        if not date_col:
+            continue
+        bad_dates = frame_rows(unparseable_date_rows(checked[date_col]))
+        if len(bad_dates):
+            display_cols = [c for c in [asset_tag_col, model_col, serial_col, date_col] if c]
+            issues.append({
+                "type": f"Unparseable {label}",
+                "count": len(bad_dates),
+                "details": f"{len(bad_dates)} cells in '{date_col}' are not recognisable dates",
+                "severity": "medium",
+                "rows": bad_dates,
+                "columns": display_cols,
+            })
+
+    return issues
@@ -0,0 +1,35 @@
+"""Batch reports"""
+import json
+
+import pandas as pd
+
+import itam
+from itam.batch import SUMMARY_FILE, issue_count, report_file_name, run_batch
+
+def test_report_names_do_not_collide():
+    names = {
+        report_file_name("inv/a/inv.xlsx", "Assets", root="inv"),
+        report_file_name("inv/b/inv.xlsx", "Assets", root="inv"),
+        report_file_name("inv/a/inv.xlsx", "Assets 2024", root="inv"),
+        report_file_name("inv/a/inv.xlsx", "Assets-2024", root="inv"),
+    }
+    assert len(names) == 4
+    assert all(name.startswith(("a__inv__", "b__inv__")) for name in names)
+
+def test_run_batch_writes_reports_and_summary(tmp_path):
+    source = tmp_path / "inv"
+    source.mkdir()
+    (source / "workstations.xlsx").write_bytes(itam.create_sample_workstation_file().getvalue())
+    (source / "broken.xlsx").write_bytes(b"not a workbook")
+    output = tmp_path / "reports"
+    summary = run_batch(sorted(source.glob("*.xlsx")), output, expired_models=["HP ProBook 450"],
+                        max_workers=1, root=source)
+    assert summary == json.loads((output / SUMMARY_FILE).read_text(encoding="utf-8"))
+    assert summary["workbooks"] == 1
+    assert [failed["path"] for failed in summary["failed"]] == [str(source / "broken.xlsx")]
+    [sheet] = summary["sheets"]
+    assert (sheet["asset_type"], sheet["rows"]) == ("Workstation", 5)
+    assert issue_count(summary, "low") == sum(len(s["issues"]) for s in summary["sheets"])
+    report = pd.read_excel(sheet["report"], sheet_name=None)
+    assert report["Replacement"]["Model"].tolist() == ["HP ProBook 450"]
+    assert "Validation Issues" in report
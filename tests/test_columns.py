@@ -0,0 +1,38 @@
+"""Header matching and schema resolution"""
+import logging
+
+import pandas as pd
+import pytest
+
+import itam
+
+@pytest.mark.parametrize("header, field", [
+    ("Serail No", "serial"),
+    ("Warrenty Exp", "warranty_expiry"),
+    ("Aset Tag", "asset_tag"),
+    ("Depatment", "department"),
+])
+def test_misspelled_headers_resolve_fuzzily(header, field):
+    schema = itam.resolve_schema(["Model", header], "Workstation")
+    assert schema[field] == header
+    assert schema.fuzzy == {field: header}
+
+@pytest.mark.parametrize("header, field", [
+    ("Purchased", "purchase_date"),
+    ("Stat", "state"),
+    ("Emial", "email"),
+])
+def test_unrelated_headers_stay_unresolved(header, field):
+    schema = itam.resolve_schema(["Model", header], "Workstation")
+    assert schema[field] is None
+    assert schema.fuzzy == {}
+
+def test_fuzzy_fields_are_logged(caplog):
+    with caplog.at_level(logging.INFO, logger="itam.columns"):
+        itam.resolve_schema(["Model", "Warrenty Expiry Date", "Location"], "Workstation")
+    assert "warranty_expiry='Warrenty Expiry Date'" in caplog.text
+
+def test_find_column_is_exact_unless_fuzzy_requested():
+    df = pd.DataFrame(columns=["Serail No", "Model"])
+    assert itam.find_column(df, ["serial number", "serial no"]) is None
+    assert itam.find_column(df, ["serial number", "serial no"], fuzzy=True) == "Serail No"
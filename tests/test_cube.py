@@ -0,0 +1,38 @@
+"""Group counts of the aggregate cube against pandas"""
+import numpy as np
+import pandas as pd
+
+import itam
+
+def inventory():
+    year = pd.Timestamp.now().year
+    df = pd.DataFrame({
+        "Model": ["Latitude", "Latitude", "ThinkPad", "EliteBook", "ThinkPad", None],
+        "Department": ["IT", "HR", "IT", "IT", "Finance", "HR"],
+        "Year of Purchase": [year - 1, year - 4, year - 6, None, year - 2, year - 3],
+    })
+    return itam.calculate_asset_age(df)
+
+def test_counts_match_value_counts():
+    df = inventory()
+    cube = itam.AggregateCube(df, ["Model", "Department"])
+    rows = np.array([0, 2, 3, 4])
+    assert cube.total(rows) == 4
+    assert cube.counts("Model").to_dict() == df["Model"].value_counts().to_dict()
+    assert cube.counts("Department", rows).to_dict() == df["Department"].iloc[rows].value_counts().to_dict()
+
+def test_value_rows_and_crosstab():
+    df = inventory()
+    cube = itam.AggregateCube(df, ["Model", "Department"])
+    assert cube.value_rows("Model", "ThinkPad").tolist() == [2, 4]
+    assert cube.value_rows("Model", "ThinkPad", np.array([0, 1, 2])).tolist() == [2]
+    expected = df.groupby(["Department", "Model"]).size().unstack(fill_value=0)
+    pd.testing.assert_frame_equal(cube.crosstab("Department", "Model"), expected, check_dtype=False,
+                                  check_names=False)
+
+def test_age_summary_matches_aggregate():
+    df = inventory()
+    cube = itam.AggregateCube(df, ["Model"])
+    summary, expected = cube.age_summary(), itam.asset_age_summary(df)
+    assert summary["average_age"] == expected["average_age"]
+    assert summary["counts"].sum() == len(df)
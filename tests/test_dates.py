@@ -0,0 +1,36 @@
+"""Date parsing checks"""
+import pandas as pd
+import pytest
+
+import itam
+
+@pytest.mark.parametrize("text, expected", [
+    ("2025-12-31", "2025-12-31"),
+    ("31/12/2025", "2025-12-31"),
+    ("2025-12-31T00:00:00", "2025-12-31"),
+    ("31/12/2025 00:00:00", "2025-12-31"),
+    ("2025.12.31", "2025-12-31"),
+    ("Dec 31 2025", "2025-12-31"),
+    ("31-Dec-25", "2025-12-31"),
+    ("12/31/2025 10:00", "2025-12-31 10:00"),
+])
+def test_date_formats(text, expected):
+    series = pd.Series([text] * 3, dtype=object)
+    assert (itam.parse_dates(series) == pd.Timestamp(expected)).all()
+    assert len(itam.unparseable_date_rows(series)) == 0
+
+def test_excel_serials_and_missing_markers():
+    series = pd.Series([45657, "45657", "n/a", None], dtype=object)
+    parsed = itam.parse_dates(series)
+    assert (parsed[:2] == pd.Timestamp("2024-12-31")).all()
+    assert parsed[2:].isna().all()
+    assert len(itam.unparseable_date_rows(series)) == 0
+
+def test_day_and_month_order_inferred_from_column():
+    # 13/01 can only be day-first, so 02/01 is read day-first too
+    parsed = itam.parse_dates(pd.Series(["13/01/2025", "02/01/2025"], dtype=object))
+    assert parsed.tolist() == [pd.Timestamp("2025-01-13"), pd.Timestamp("2025-01-02")]
+
+def test_unparseable_rows_reported():
+    series = pd.Series(["2025-12-31", "not a date", "2025-01-01", "not a date"], dtype=object)
+    assert itam.unparseable_date_rows(series).tolist() == [1, 3]
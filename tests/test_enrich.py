@@ -0,0 +1,28 @@
+"""Asset age and lifecycle columns"""
+import pandas as pd
+
+import itam
+
+def test_asset_age_is_whole_years_from_purchase_date():
+    today = pd.Timestamp.now().normalize()
+    df = pd.DataFrame({
+        "Asset Tag": ["WS001", "WS002", "WS003"],
+        "Purchase Date": [today - pd.DateOffset(years=2, months=6), today - pd.DateOffset(months=3), None],
+    })
+    aged = itam.calculate_asset_age(df)
+    assert aged["Asset Age"].dtype == "Int64"
+    assert aged["Asset Age"].tolist() == [2, 0, 0]
+    assert aged["Age Category"].tolist() == ["Active (1-3 years)", "New (0-1 year)", "New (0-1 year)"]
+
+def test_asset_age_from_purchase_year():
+    year = pd.Timestamp.now().year
+    df = pd.DataFrame({"Asset Tag": ["WS001", "WS002"], "Year of Purchase": [year - 4, None]})
+    aged = itam.calculate_asset_age(df)
+    assert aged["Asset Age"].dtype == "Int64"
+    assert aged["Asset Age"].tolist() == [4, 0]
+
+def test_age_summary_skips_unknown_ages():
+    year = pd.Timestamp.now().year
+    df = itam.calculate_asset_age(pd.DataFrame({"Year of Purchase": [year - 2, year - 4, None]}))
+    compacted, _ = itam.compact_frame(df)
+    assert itam.asset_age_summary(compacted)["average_age"] == 3
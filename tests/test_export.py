@@ -0,0 +1,24 @@
+"""Excel exports"""
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+import itam
+
+def test_export_workbook_writes_every_segment_in_chunks():
+    assets = pd.DataFrame({"Asset Tag": [f"WS{n:03d}" for n in range(25)], "Age": [n % 4 for n in range(25)]})
+    assets.loc[3, "Age"] = np.nan
+    output = itam.export_workbook([("Assets", assets), ("Replacement", assets.head(2))], chunk_rows=10)
+    sheets = pd.read_excel(output, sheet_name=None)
+    assert list(sheets) == ["Assets", "Replacement"]
+    pd.testing.assert_frame_equal(sheets["Assets"], assets, check_dtype=False)
+    assert len(sheets["Replacement"]) == 2
+
+def test_export_cache_builds_each_view_once():
+    cache = itam.ExportCache()
+    df = pd.DataFrame({"Asset Tag": ["WS001"]})
+    first = cache.get("dataset", ("filters",), "filtered", df)
+    assert cache.get("dataset", ("filters",), "filtered", df) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert pd.read_excel(BytesIO(first))["Asset Tag"].tolist() == ["WS001"]
@@ -0,0 +1,53 @@
+"""Sidebar filters, replacement marking and search on row positions"""
+import numpy as np
+import pandas as pd
+
+import itam
+
+def inventory():
+    return pd.DataFrame({
+        "Model": ["Latitude", "Latitude", "ThinkPad", "EliteBook", "ThinkPad"],
+        "Department": ["IT", "HR", "IT", "IT", "Finance"],
+        "Username": ["alice smith", "bob jones", "carol smith", "dan brown", "erin smithers"],
+    })
+
+def test_filter_rows_match_apply_filters():
+    df = inventory()
+    index = itam.FilterIndex(df, ["Model", "Department"])
+    search = itam.SearchIndex(df)
+    filters = {"Department": ["IT"], "Model": []}
+    rows = itam.filter_rows(filters, index, "smith", search)
+    filtered, _ = itam.apply_filters(df, filters, search_query="smith", search_index=search)
+    assert rows.tolist() == [0, 2]
+    assert df.take(rows).equals(filtered)
+
+def test_filter_rows_is_none_when_nothing_is_left_out():
+    df = inventory()
+    assert itam.filter_rows({"Model": []}, itam.FilterIndex(df, ["Model"])) is None
+
+def test_filter_rows_reuses_resolved_column_rows():
+    df = inventory()
+    index = itam.FilterIndex(df, ["Model"])
+    rows = index.rows({"Model": ["ThinkPad"]})
+    assert itam.filter_rows({"Model": ["ThinkPad"]}, index, rows=rows).tolist() == [2, 4]
+
+def test_prefix_search_matches_word_starts_only():
+    df = inventory()
+    index = itam.FilterIndex(df, ["Model"])
+    search = itam.SearchIndex(df)
+    assert itam.filter_rows({}, index, "mith", search).tolist() == [0, 2, 4]
+    assert itam.filter_rows({}, index, "smith", search, "prefix").tolist() == [0, 2, 4]
+    assert len(itam.filter_rows({}, index, "mith", search, "prefix")) == 0
+
+def test_marked_rows_ignore_the_search():
+    df = inventory()
+    index = itam.FilterIndex(df, ["Model", "Department"])
+    rows = index.rows({"Department": ["IT"]})
+    assert itam.marked_rows(index, rows, ["ThinkPad", "EliteBook"], "Model").tolist() == [2, 3]
+    assert itam.marked_rows(index, rows, [], "Model") is None
+
+def test_marked_rows_on_unindexed_model_column():
+    df = inventory()
+    index = itam.FilterIndex(df, ["Department"])
+    rows = np.arange(len(df))
+    assert itam.marked_rows(index, rows, ["Latitude"], "Model").tolist() == [0, 1]
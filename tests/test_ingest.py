@@ -0,0 +1,36 @@
+"""Combining sheets of several workbooks"""
+from io import BytesIO
+
+import pandas as pd
+
+import itam
+
+def workbook(sheets):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        for name, (df, title_rows) in sheets.items():
+            if title_rows:
+                pd.DataFrame([["Inventory report"]] + [[None]] * (title_rows - 1)).to_excel(
+                    writer, index=False, header=False, sheet_name=name)
+            df.to_excel(writer, index=False, sheet_name=name, startrow=title_rows)
+    return output.getvalue()
+
+def test_sheets_are_aligned_by_field_and_tagged_with_their_source():
+    south = itam.sample_workstation_data().head(2)
+    north = south.rename(columns={"Model": "Model Name", "Serial Number": "Serial No"})
+    notes = pd.DataFrame({"Note": ["hello"]})
+    sources = [
+        ("south.xlsx", workbook({"Assets": (south, 0)}), "Assets"),
+        ("north.xlsx", workbook({"WS": (north, 2), "Notes": (notes, 0)}), "WS"),
+        ("north.xlsx", workbook({"WS": (north, 2), "Notes": (notes, 0)}), "Notes"),
+    ]
+    combined = itam.ingest_workbooks(sources, max_workers=1)
+    assert list(combined.frames) == ["Workstation"]
+    df = combined.frames["Workstation"]
+    assert df.columns[0] == itam.SOURCE_COLUMN
+    assert "Model Name" not in df.columns and "Serial No" not in df.columns
+    assert df["Model"].tolist() == south["Model"].tolist() * 2
+    assert df[itam.SOURCE_COLUMN].tolist() == ["south.xlsx / Assets"] * 2 + ["north.xlsx / WS"] * 2
+    assert [sheet.header_row for sheet in combined.sheets] == [0, 2]
+    assert [(sheet.source, sheet.error) for sheet in combined.skipped] == [
+        ("north.xlsx / Notes", "no model or product column")]
@@ -0,0 +1,49 @@
+"""Streaming sheet loader checks"""
+import re
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+
+import itam
+
+def stale_dimension_workbook(df):
+    """Workbook bytes of df whose sheet claims a smaller <dimension> than it holds"""
+    written = BytesIO()
+    df.to_excel(written, index=False, sheet_name="Assets")
+    source = zipfile.ZipFile(BytesIO(written.getvalue()))
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename.startswith("xl/worksheets/sheet"):
+                data, count = re.subn(rb'<dimension ref="[^"]*" ?/>', b'<dimension ref="A1:B2"/>', data)
+                assert count == 1
+            target.writestr(item, data)
+    return output.getvalue()
+
+def test_stale_dimension_tag():
+    df = pd.DataFrame({
+        "Model": ["HP 840", "Dell 7490", "HP 840", "Lenovo X1", "Dell 7490"],
+        "Asset Tag": ["AT100001", "AT100002", "AT100003", "AT100004", "AT100005"],
+        "Serial Number": ["SN100001", "SN100002", "SN100003", "SN100004", "SN100005"],
+        "User": ["Ali", "Siti", "Ahmad", "Mei", "Raj"],
+    })
+    file_bytes = stale_dimension_workbook(df)
+    expected = pd.read_excel(BytesIO(file_bytes))
+    loaded = itam.WorkbookCache().stream_sheet(file_bytes, itam.hash_file_bytes(file_bytes), "Assets", 0).result()
+    assert loaded.shape == expected.shape == (5, 4)
+    pd.testing.assert_frame_equal(loaded.reset_index(drop=True), expected, check_dtype=False)
+
+def test_cache_counts_one_lookup_per_sheet_load():
+    file_bytes = itam.create_sample_workstation_file().getvalue()
+    digest = itam.hash_file_bytes(file_bytes)
+    cache = itam.WorkbookCache()
+    sheet_name = cache.sheet_names(file_bytes, digest)[0]
+    first = cache.stream_sheet(file_bytes, digest, sheet_name).result()
+    assert (cache.hits, cache.misses) == (0, 1)
+    again = cache.stream_sheet(file_bytes, digest, sheet_name).result()
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert again.equals(first)
+    assert cache.detect_header_row(file_bytes, digest, sheet_name) == cache.known_header_row(digest, sheet_name)
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,27 @@
+"""Paged, sorted table views"""
+import numpy as np
+import pandas as pd
+
+import itam
+
+def test_pages_follow_the_sort_order_within_the_view():
+    df = pd.DataFrame({"Asset Tag": [f"WS{n:03d}" for n in range(10)], "Cost": [5, 3, 9, 1, 7, 2, 8, 0, 6, 4]})
+    pager = itam.TablePager(df)
+    rows = np.array([1, 2, 3, 5, 8])
+    page, total = pager.page(rows, page=0, page_size=2, sort_by="Cost")
+    assert total == 5
+    assert page["Cost"].tolist() == [1, 2]
+    page, _ = pager.page(rows, page=2, page_size=2, sort_by="Cost", ascending=False)
+    assert page["Cost"].tolist() == [1]
+
+def test_page_projects_columns_and_keeps_view_order():
+    df = pd.DataFrame({"A": range(5), "B": list("abcde")})
+    page, total = itam.TablePager(df).page(np.array([4, 0]), columns=["B"])
+    assert total == 2
+    assert list(page.columns) == ["B"]
+    assert page["B"].tolist() == ["e", "a"]
+
+def test_page_count():
+    assert itam.page_count(0, 25) == 1
+    assert itam.page_count(50, 25) == 2
+    assert itam.page_count(51, 25) == 3
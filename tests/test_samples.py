@@ -0,0 +1,18 @@
+"""Regression checks on the bundled sample templates"""
+import numpy as np
+import pytest
+
+import itam
+
+@pytest.mark.parametrize("make_sample, asset_type", [
+    (itam.create_sample_workstation_file, "Workstation"),
+    (itam.create_sample_mobile_file, "Mobile"),
+])
+def test_sample_templates_load(make_sample, asset_type):
+    inventory = itam.load_inventory(make_sample())
+    assert inventory.asset_type == asset_type
+    assert len(inventory.df) > 0
+
+def test_near_duplicates_without_eligible_keys():
+    pairs = itam.near_duplicate_pairs(np.array(["WS001", "WS002", "MB001"], dtype=object))
+    assert pairs.shape == (0, 2)
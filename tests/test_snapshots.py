@@ -0,0 +1,40 @@
+"""Snapshot diffs and the snapshot store"""
+import pandas as pd
+import pytest
+
+import itam
+
+pytest.importorskip("pyarrow")
+
+def inventory(users, tags=("WS001", "WS002", "WS003")):
+    return pd.DataFrame({
+        "Asset Tag": list(tags),
+        "Model": ["Latitude"] * len(tags),
+        "Serial Number": [f"SN{tag}" for tag in tags],
+        "User": list(users),
+    })
+
+def snapshot(df):
+    return itam.snapshot_frame(df, itam.resolve_schema(df.columns, "Workstation"))
+
+def test_diff_reports_added_removed_and_changed_assets():
+    old = snapshot(inventory(["ali", "siti", "raj"]))
+    new = snapshot(inventory(["ali", "mei", "tan"], tags=("WS001", "WS002", "WS004")))
+    diff = itam.diff_snapshots(old, new)
+    assert diff.added["_key"].tolist() == ["WS004"]
+    assert diff.removed["_key"].tolist() == ["WS003"]
+    assert diff.changes[["Asset", "Field", "Before", "After"]].values.tolist() == [["WS002", "user", "siti", "mei"]]
+    assert diff.changed == 1 and diff.unchanged == 1
+    assert diff.changed_rows.tolist() == [1, 2]
+
+def test_repeated_keys_stay_distinct():
+    frame = snapshot(inventory(["ali", "siti"], tags=("WS001", "ws001")))
+    assert frame["_key"].tolist() == ["WS001", "WS001#2"]
+
+def test_store_round_trip_and_dedupes_uploads(tmp_path):
+    store = itam.SnapshotStore(tmp_path)
+    frame = snapshot(inventory(["ali", "siti", "raj"]))
+    entry = store.save("Workstation", frame, "digest-1", "inv.xlsx")
+    assert store.save("Workstation", frame, "digest-1", "inv.xlsx") == entry
+    assert [e["id"] for e in store.snapshots("Workstation")] == [entry["id"]]
+    pd.testing.assert_frame_equal(store.load("Workstation", entry["id"]), frame, check_dtype=False)
@@ -0,0 +1,64 @@
+"""Data-quality checks of validate_data"""
+import numpy as np
+import pandas as pd
+
+import itam
+
+def inventory(serials, tags, users=None):
+    return pd.DataFrame({
+        "Asset Tag": tags,
+        "Model": ["Latitude 5420"] * len(tags),
+        "Serial Number": serials,
+        "Username": users or ["alice"] * len(tags),
+    })
+
+def issue_types(issues):
+    return {issue["type"]: issue for issue in issues}
+
+def test_duplicate_serials_reported():
+    df = inventory(["SN-A", "SN-B", "SN-A"], ["WS001", "WS002", "WS003"])
+    issues = issue_types(itam.validate_data(df, "Workstation", "Model", max_distance=0))
+    assert issues["Duplicate Serial Numbers"]["count"] == 1
+    assert list(issues["Duplicate Serial Numbers"]["rows"]) == [0, 2]
+
+def test_changed_row_duplicating_unchanged_row_is_reported():
+    df = inventory(["SN-A", "SN-B", "SN-C", "SN-A"], ["WS001", "WS002", "WS003", "WS002"], ["alice", "", "", "dan"])
+    issues = issue_types(itam.validate_data(df, "Workstation", "Model", max_distance=0, rows=np.array([3])))
+    assert list(issues["Duplicate Serial Numbers"]["rows"]) == [3]
+    assert list(issues["Duplicate Asset Tags"]["rows"]) == [3]
+    # Unchanged rows' own problems stay out of the report
+    assert "Missing User Assignment" not in issues
+
+def test_changed_rows_report_their_own_issues_in_frame_positions():
+    df = inventory(["SN-A", "SN-B", "SN-C"], ["WS001", "WS002", "WS003"], ["alice", "bob", ""])
+    issues = itam.validate_data(df, "Workstation", "Model", max_distance=0, rows=np.array([1, 2]))
+    assert [(issue["type"], list(issue["rows"])) for issue in issues] == [("Missing User Assignment", [2])]
+
+def test_single_digit_typo_is_a_possible_duplicate():
+    pairs = itam.near_duplicate_pairs(np.array(["SN12345678", "SN12345679", "XK99887766"], dtype=object))
+    assert pairs.tolist() == [[0, 1]]
+
+def test_numbered_sequence_is_not_a_possible_duplicate():
+    tags = np.array([f"WS{number:04d}" for number in range(1, 40)], dtype=object)
+    assert len(itam.near_duplicate_pairs(tags)) == 0
+    assert len(itam.near_duplicate_pairs(tags, skip_numbered=False)) > 0
+
+def test_validate_data_passes_near_duplicate_options():
+    df = inventory(["SN-0001", "SN-0002", "SN-0003"], ["WS001", "WS002", "WS003"])
+    assert "Possible Duplicate Serials" not in issue_types(itam.validate_data(df, "Workstation", "Model"))
+    issues = issue_types(itam.validate_data(df, "Workstation", "Model", skip_numbered=False))
+    assert issues["Possible Duplicate Serials"]["count"] == 1
+
+def test_case_and_whitespace_variants_are_inconsistent_keys():
+    df = inventory(["sn-a 1", "SN-A1", "SN-B"], ["WS001", "WS002", "WS003"])
+    issues = issue_types(itam.validate_data(df, "Workstation", "Model", max_distance=0))
+    assert "Duplicate Serial Numbers" not in issues
+    assert issues["Inconsistent Serial Numbers"]["count"] == 1
+    assert sorted(issues["Inconsistent Serial Numbers"]["rows"].tolist()) == [0, 1]
+
+def test_report_data_shows_flagged_rows():
+    df = inventory(["SN-A", "SN-B", "SN-A"], ["WS001", "WS002", "WS003"])
+    report = itam.validate_data(df, "Workstation", "Model", max_distance=0)
+    shown = report.data(issue_types(report)["Duplicate Serial Numbers"])
+    assert shown["Asset Tag"].tolist() == ["WS001", "WS003"]
+    assert shown.columns[0] == "Serial Number"